@@ -0,0 +1,113 @@
+"""Synthetic catalogs shaped like large production ones: entries spread over
+namespaces and layers, a mix of dataset types with load and save arguments,
+and many dataset factory patterns."""
+
+from __future__ import annotations
+
+import random
+
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+NAMESPACES = [
+    "france",
+    "spain",
+    "italy",
+    "germany",
+    "poland",
+    "sweden",
+    "norway",
+    "japan",
+    "brazil",
+    "canada",
+]
+LAYERS = ["raw", "intermediate", "primary", "feature", "model_input", "reporting"]
+
+try:
+    _Dumper = yaml.CSafeDumper
+except AttributeError:  # pragma: no cover
+    _Dumper = yaml.SafeDumper
+
+
+def entry_name(index: int) -> str:
+    namespace = NAMESPACES[index % len(NAMESPACES)]
+    layer = LAYERS[index // len(NAMESPACES) % len(LAYERS)]
+    return f"{namespace}.{layer}.dataset_{index}"
+
+
+def _entry(index: int) -> dict[str, Any]:
+    name = entry_name(index)
+    kind = index % 4
+    if kind == 0:
+        return {
+            "type": "pandas.CSVDataset",
+            "filepath": f"data/{name}.csv",
+            "load_args": {"sep": ",", "encoding": "utf-8"},
+            "save_args": {"index": False},
+        }
+    if kind == 1:
+        return {
+            "type": "pandas.ParquetDataset",
+            "filepath": f"data/{name}.parquet",
+            "load_args": {"columns": ["id", "value", "updated_at"]},
+        }
+    if kind == 2:
+        return {"type": "json.JSONDataset", "filepath": f"data/{name}.json"}
+    return {
+        "type": "pickle.PickleDataset",
+        "filepath": f"data/{name}.pkl",
+        "backend": "pickle",
+        "versioned": True,
+    }
+
+
+def pattern_name(index: int) -> str:
+    namespace = NAMESPACES[index % len(NAMESPACES)]
+    layer = LAYERS[index // len(NAMESPACES) % len(LAYERS)]
+    return f"{namespace}.{layer}.{{name}}_p{index}"
+
+
+def _pattern(index: int) -> dict[str, Any]:
+    return {
+        "type": "pandas.CSVDataset",
+        "filepath": f"data/{{name}}_p{index}.csv",
+        "load_args": {"sep": ";"},
+    }
+
+
+def synthetic_catalog(size: int, patterns: int = 100) -> dict[str, dict[str, Any]]:
+    """Return a catalog config of ``size`` entries and ``patterns`` dataset
+    factory patterns, without a catch-all pattern so that misses stay misses."""
+    catalog = {entry_name(index): _entry(index) for index in range(size)}
+    catalog.update({pattern_name(index): _pattern(index) for index in range(patterns)})
+    return catalog
+
+
+def write_catalog(catalog: dict[str, dict[str, Any]], conf_path: Path) -> Path:
+    """Write ``catalog`` as the ``catalog.yml`` of the ``base`` environment of
+    ``conf_path``."""
+    path = conf_path / "base" / "catalog.yml"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w") as file:
+        yaml.dump(catalog, file, Dumper=_Dumper, sort_keys=False)
+    return path
+
+
+def lookup_names(
+    size: int, patterns: int, count: int = 200, seed: int = 0
+) -> dict[str, list[str]]:
+    """Names to look up in a catalog built by ``synthetic_catalog``: explicit
+    entries, names resolved by a pattern and misspelled names matching
+    nothing."""
+    rng = random.Random(seed)
+    explicit = [entry_name(rng.randrange(size)) for _ in range(count)]
+    resolved = [
+        pattern_name(rng.randrange(patterns)).format(name=f"table_{index}")
+        for index in range(count)
+    ]
+    # Dropping the last letter of ``dataset`` keeps the names close to known
+    # ones, and they don't end like any pattern
+    missing = [name.replace("dataset_", "datase_") for name in explicit]
+    return {"explicit": explicit, "pattern": resolved, "missing": missing}
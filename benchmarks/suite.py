@@ -0,0 +1,357 @@
+"""Offline benchmarks of the catalog load and lookup hot paths.
+
+Each size gets a synthetic catalog, see ``catalogs.py``, which is loaded the
+way the server does, then looked up in process and through the endpoints of
+the server template, called with a ``TestClient``. Results are written as
+JSON so that runs of different versions can be compared::
+
+    python -m benchmarks --sizes 100 1000 10000 100000
+    python -m benchmarks --sizes 1000 --compare benchmarks/results/0.1.1.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import importlib
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+from kedro.io.core import DatasetNotFoundError
+
+import universal_catalog
+from universal_catalog.cli.plugin import TEMPLATE_PATH
+from universal_catalog.core import CatalogValidator, UniversalCatalog, load_catalog
+from universal_catalog.core.snapshot import write_snapshot
+from universal_catalog.core.universal_catalog import snapshot_file
+
+from .catalogs import lookup_names, synthetic_catalog, write_catalog
+
+DEFAULT_SIZES = (100, 1_000, 10_000, 100_000)
+DEFAULT_PATTERNS = 100
+RESULTS_PATH = Path(__file__).parent / "results"
+# Slowdown past which a comparison reports a regression
+DEFAULT_THRESHOLD = 0.2
+
+_SERVER_PACKAGE = next(TEMPLATE_PATH.glob("*/*/main.py")).parent
+
+
+def measure(
+    function: Callable[[], Any],
+    min_time: float = 0.2,
+    min_runs: int = 5,
+    max_runs: int = 10_000,
+) -> dict[str, float]:
+    """Call ``function`` at least ``min_runs`` times and until ``min_time``
+    seconds are spent, after one warm-up call, and summarize the durations
+    of the calls in seconds."""
+    function()
+    durations = []
+    start = time.perf_counter()
+    while len(durations) < max_runs and (
+        len(durations) < min_runs or time.perf_counter() - start < min_time
+    ):
+        call_start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - call_start)
+    durations.sort()
+    return {
+        "runs": len(durations),
+        "min": durations[0],
+        "median": statistics.median(durations),
+        "p95": durations[min(len(durations) - 1, int(len(durations) * 0.95))],
+    }
+
+
+def measure_once(function: Callable[[], Any], runs: int = 1) -> dict[str, float]:
+    """Summarize ``runs`` calls of a slow ``function``, without warm-up."""
+    durations = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+    durations.sort()
+    return {
+        "runs": runs,
+        "min": durations[0],
+        "median": statistics.median(durations),
+        "p95": durations[-1],
+    }
+
+
+def _cycle(names: list[str]) -> Callable[[], str]:
+    position = -1
+
+    def next_name() -> str:
+        nonlocal position
+        position = (position + 1) % len(names)
+        return names[position]
+
+    return next_name
+
+
+def _lookup(catalog: UniversalCatalog, names: list[str], **kwargs) -> Callable:
+    next_name = _cycle(names)
+
+    def lookup() -> None:
+        try:
+            catalog.get_entry(next_name(), **kwargs)
+        except DatasetNotFoundError:
+            pass
+
+    return lookup
+
+
+def bench_catalog(
+    size: int, patterns: int, workdir: Path, min_time: float
+) -> dict[str, dict[str, float]]:
+    """Benchmark loading and looking up a catalog of ``size`` entries."""
+    config_path = {"path": workdir / "conf"}
+    config = synthetic_catalog(size, patterns)
+    write_catalog(config, config_path["path"])
+    names = lookup_names(size, patterns)
+    results = {}
+
+    catalogs = []
+
+    def load() -> None:
+        catalogs.append(load_catalog(config_path, use_snapshot=False))
+
+    results["load_catalog"] = measure_once(load)
+    catalog = catalogs.pop()
+    results["from_config"] = measure_once(
+        lambda: UniversalCatalog.from_config(config, validator=CatalogValidator())
+    )
+    results["from_config.unchanged"] = measure_once(
+        lambda: UniversalCatalog.from_config(config, previous=catalog)
+    )
+    snapshot_path = write_snapshot(catalog, snapshot_file(config_path))
+    results["load_catalog.snapshot"] = measure_once(
+        lambda: load_catalog(config_path), runs=3
+    )
+    mapped = load_catalog(config_path)
+
+    for label, target in (("", catalog), (".snapshot", mapped)):
+        results[f"get_entry.explicit{label}"] = measure(
+            _lookup(target, names["explicit"]), min_time
+        )
+        results[f"get_entry.pattern{label}"] = measure(
+            _lookup(target, names["pattern"]), min_time
+        )
+    # Resolved names and misses are cached, catalogs mapped again measure the
+    # first lookup of each name
+    results["get_entry.pattern.uncached"] = measure(
+        _lookup(UniversalCatalog.from_snapshot(snapshot_path), names["pattern"]),
+        min_time,
+        max_runs=len(names["pattern"]) - 1,
+    )
+    results["get_entry.missing"] = measure(
+        _lookup(UniversalCatalog.from_snapshot(snapshot_path), names["missing"]),
+        min_time,
+        max_runs=len(names["missing"]) - 1,
+    )
+    results["config_string"] = measure(catalog.config_string, min_time)
+    results["config_string.snapshot"] = measure(mapped.config_string, min_time)
+    return results
+
+
+@contextlib.contextmanager
+def _server_app(workdir: Path) -> Iterator[Any]:
+    """Import the server template serving the catalog of ``workdir``."""
+    package = workdir / "server"
+    shutil.copytree(_SERVER_PACKAGE, package)
+    shutil.copytree(workdir / "conf", package / "conf", dirs_exist_ok=True)
+    cwd = os.getcwd()
+    os.chdir(workdir)
+    sys.path.insert(0, str(package))
+    for module in ("main", "settings"):
+        sys.modules.pop(module, None)
+    try:
+        yield importlib.import_module("main").app
+    finally:
+        sys.path.remove(str(package))
+        for module in ("main", "settings"):
+            sys.modules.pop(module, None)
+        os.chdir(cwd)
+
+
+def bench_endpoints(
+    size: int, patterns: int, workdir: Path, min_time: float
+) -> dict[str, dict[str, float]]:
+    """Benchmark the endpoints of the server template, called in process,
+    once ``bench_catalog`` wrote the catalog of ``workdir``."""
+    from fastapi.testclient import TestClient
+
+    names = lookup_names(size, patterns)
+    binary = {"Accept": "application/msgpack", "Accept-Encoding": "zstd"}
+    results = {}
+    with _server_app(workdir) as app, TestClient(
+        app, raise_server_exceptions=False
+    ) as client:
+
+        def post_each(path: str, names: list[str]) -> Callable[[], Any]:
+            next_name = _cycle(names)
+            return lambda: client.post(path, json={"name": next_name()})
+
+        requests = {
+            "root": lambda: client.get("/"),
+            "version": lambda: client.get("/version/"),
+            "dataset.explicit": post_each("/dataset/", names["explicit"]),
+            "dataset.pattern": post_each("/dataset/", names["pattern"]),
+            "dataset.missing": post_each("/dataset/", names["missing"]),
+            "datasets.batch": lambda: client.post(
+                "/datasets/", json={"names": names["explicit"][:100]}
+            ),
+            "catalog": lambda: client.post("/catalog/"),
+            "catalog.binary": lambda: client.post("/catalog/", headers=binary),
+            "catalog.namespace": lambda: client.post(
+                "/catalog/", params={"namespace": "france"}
+            ),
+            "catalog.page": lambda: client.post("/catalog/", params={"limit": 100}),
+            "catalog.changes": lambda: client.get(
+                "/catalog/changes/", params={"since": "unknown"}
+            ),
+        }
+        for name, request in requests.items():
+            results[f"endpoint.{name}"] = measure(request, min_time)
+    return results
+
+
+def run(
+    sizes: list[int], patterns: int = DEFAULT_PATTERNS, min_time: float = 0.2
+) -> dict[str, Any]:
+    """Run the benchmarks for each catalog size and return their results,
+    along with what they ran on."""
+    report: dict[str, Any] = {"metadata": _metadata(sizes, patterns), "results": {}}
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            workdir = Path(directory)
+            results = bench_catalog(size, patterns, workdir, min_time)
+            results.update(bench_endpoints(size, patterns, workdir, min_time))
+        report["results"][str(size)] = results
+        print(format_results(size, results), flush=True)
+    return report
+
+
+def compare(
+    report: dict[str, Any],
+    baseline: dict[str, Any],
+    threshold: float = DEFAULT_THRESHOLD,
+) -> tuple[str, list[str]]:
+    """Compare the median durations of ``report`` to those of ``baseline``.
+
+    Returns: tuple[str, list[str]]
+        A table of the ratios between the two, and the benchmarks more than
+        ``threshold`` slower than in ``baseline``.
+    """
+    lines = [f"{'benchmark':<40} {'baseline':>12} {'current':>12} {'ratio':>8}"]
+    regressions = []
+    for size, results in report["results"].items():
+        for name, stats in results.items():
+            previous = baseline["results"].get(size, {}).get(name)
+            if previous is None:
+                continue
+            ratio = stats["median"] / previous["median"]
+            label = f"{size}/{name}"
+            flag = ""
+            if ratio > 1 + threshold:
+                regressions.append(label)
+                flag = "  <- slower"
+            lines.append(
+                f"{label:<40} {_format(previous['median']):>12} "
+                f"{_format(stats['median']):>12} {ratio:>7.2f}x{flag}"
+            )
+    return "\n".join(lines), regressions
+
+
+def format_results(size: int, results: dict[str, dict[str, float]]) -> str:
+    lines = [f"\n{size} entries", f"{'benchmark':<32} {'median':>12} {'p95':>12}"]
+    for name, stats in results.items():
+        lines.append(
+            f"{name:<32} {_format(stats['median']):>12} {_format(stats['p95']):>12}"
+        )
+    return "\n".join(lines)
+
+
+def _format(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f}{unit}"
+    return f"{seconds / 1e-9:.0f}ns"
+
+
+def _metadata(sizes: list[int], patterns: int) -> dict[str, Any]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "version": universal_catalog.__version__,
+        "commit": commit,
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "sizes": sizes,
+        "patterns": patterns,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--patterns", type=int, default=DEFAULT_PATTERNS)
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=0.2,
+        help="Seconds spent measuring each fast path.",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        help="File the results are written to, defaults to "
+        "benchmarks/results/<version>-<commit>.json.",
+    )
+    parser.add_argument(
+        "--compare", type=Path, help="Results of a previous run to compare to."
+    )
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args(argv)
+
+    report = run(args.sizes, args.patterns, args.min_time)
+    metadata = report["metadata"]
+    output = args.output or RESULTS_PATH / "-".join(
+        filter(None, [metadata["version"], metadata["commit"]])
+    )
+    output = output.with_suffix(".json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2) + "\n")
+    print(f"\nResults written to {output}")
+
+    if args.compare is not None:
+        table, regressions = compare(
+            report, json.loads(args.compare.read_text()), args.threshold
+        )
+        print(f"\n{table}")
+        if regressions:
+            print(f"\n{len(regressions)} benchmarks are slower than the baseline")
+            return 1
+    return 0
@@ -0,0 +1,154 @@
+import json
+
+import pytest
+import requests
+
+from click.testing import CliRunner
+
+from universal_catalog.cli.loadtest import (
+    LoadTestReport,
+    name_weights,
+    parse_mix,
+    run_loadtest,
+)
+from universal_catalog.cli.plugin import loadtest
+
+URL = "http://localhost:5000"
+
+CATALOG = {
+    "cars": {"type": "pandas.CSVDataset", "filepath": "cars.csv"},
+    "boats": {"type": "pandas.CSVDataset", "filepath": "boats.csv"},
+    "{name}_csv": {"type": "pandas.CSVDataset", "filepath": "{name}.csv"},
+}
+
+
+@pytest.fixture
+def server(requests_mock):
+    def dataset(request, context):
+        name = request.json()["name"]
+        if name not in CATALOG:
+            context.status_code = 404
+            return {"detail": f"Dataset '{name}' not found in the catalog"}
+        return CATALOG[name]
+
+    requests_mock.post(URL + "/catalog/", json=CATALOG)
+    requests_mock.post(URL + "/dataset/", json=dataset)
+    return requests_mock
+
+
+def test_parse_mix():
+    assert parse_mix("dataset=8, catalog=1,miss=0.5") == {
+        "dataset": 8,
+        "catalog": 1,
+        "miss": 0.5,
+    }
+    with pytest.raises(ValueError, match="Unknown request kind 'datasets'"):
+        parse_mix("datasets=1")
+    with pytest.raises(ValueError, match="Invalid weight 'x' for 'miss'"):
+        parse_mix("miss=x")
+    with pytest.raises(ValueError, match="Invalid weight '-1' for 'miss'"):
+        parse_mix("miss=-1")
+    with pytest.raises(ValueError, match="At least one request kind"):
+        parse_mix("miss=0")
+
+
+def test_name_weights():
+    assert name_weights(["a", "b"], "uniform") == [1.0, 1.0]
+    assert sorted(name_weights(["a", "b", "c", "d"], "zipf")) == [
+        0.25,
+        1 / 3,
+        0.5,
+        1.0,
+    ]
+    with pytest.raises(ValueError, match="Unknown distribution 'pareto'"):
+        name_weights(["a"], "pareto")
+
+
+def test_run_loadtest(server):
+    report = run_loadtest(URL, ["cars", "boats"], concurrency=3, total=60, seed=1)
+    assert report.requests == 60
+    assert report.throughput > 0
+    assert sum(report.statuses["miss"].values()) == len(report.latencies["miss"])
+    assert set(report.statuses["dataset"]) == {"200"}
+    assert set(report.statuses["miss"]) == {"404"}
+    summary = report.to_dict()
+    assert summary["requests"] == 60
+    assert set(summary["latency"]) == {"p50", "p95", "p99"}
+    assert summary["kinds"]["catalog"]["statuses"] == {
+        "200": len(report.latencies["catalog"])
+    }
+
+
+def test_run_loadtest_for_a_duration(server):
+    report = run_loadtest(
+        URL, ["cars"], concurrency=2, duration=0.1, mix={"dataset": 1}
+    )
+    assert report.duration >= 0.1
+    assert set(report.latencies) == {"dataset"}
+    with pytest.raises(ValueError, match="No dataset names"):
+        run_loadtest(URL, [])
+
+
+def test_connection_errors_are_reported(requests_mock):
+    requests_mock.post(URL + "/dataset/", exc=requests.exceptions.ConnectionError)
+    report = run_loadtest(URL, ["cars"], concurrency=1, total=3, mix={"dataset": 1})
+    assert report.statuses["dataset"] == {"ConnectionError": 3}
+
+
+def test_timeouts_are_reported(requests_mock):
+    mock = requests_mock.post(URL + "/dataset/", exc=requests.exceptions.ReadTimeout)
+    report = run_loadtest(
+        URL, ["cars"], concurrency=1, total=3, mix={"dataset": 1}, timeout=0.5
+    )
+    assert report.statuses["dataset"] == {"ReadTimeout": 3}
+    assert mock.last_request.timeout == 0.5
+
+
+def test_report_without_requests():
+    report = LoadTestReport(concurrency=1)
+    assert report.throughput == 0.0
+    assert report.percentiles("dataset") == {"p50": 0.0, "p95": 0.0, "p99": 0.0}
+    assert report.summary().startswith("0 requests")
+
+
+def test_loadtest_command(server, tmp_path):
+    output = tmp_path / "report.json"
+    result = CliRunner().invoke(
+        loadtest, [URL, "-c", "2", "-n", "20", "--seed", "3", "-o", str(output)]
+    )
+    assert result.exit_code == 0, result.output
+    assert "20 requests" in result.output
+    requested = {
+        request.json()["name"]
+        for request in server.request_history
+        if request.path == "/dataset/"
+    }
+    assert "{name}_csv" not in requested
+    assert json.loads(output.read_text())["requests"] == 20
+
+
+def test_loadtest_replays_names(server, tmp_path):
+    names = tmp_path / "names.txt"
+    names.write_text("cars\ncars\n\nboats\n")
+    result = CliRunner().invoke(
+        loadtest, [URL, "-n", "10", "--mix", "dataset=1", "--names-file", str(names)]
+    )
+    assert result.exit_code == 0, result.output
+    assert not any(request.path == "/catalog/" for request in server.request_history)
+
+
+def test_loadtest_errors(requests_mock, tmp_path):
+    result = CliRunner().invoke(loadtest, [URL, "--mix", "nope=1"])
+    assert result.exit_code != 0
+    assert "Unknown request kind" in result.output
+
+    requests_mock.post(URL + "/catalog/", status_code=500)
+    result = CliRunner().invoke(loadtest, [URL, "-n", "1"])
+    assert result.exit_code != 0
+    assert "Failed to fetch the catalog" in result.output
+
+    empty = tmp_path / "names.txt"
+    empty.write_text("\n")
+    result = CliRunner().invoke(loadtest, [URL, "--names-file", str(empty)])
+    assert result.exit_code != 0
+    assert "No dataset names" in result.output
@@ -5,7 +5,7 @@ from click.testing import CliRunner
 
 import shutil
 
-from universal_catalog.cli.plugin import init, TEMPLATE_PATH
+from universal_catalog.cli.plugin import compile_catalog, init, TEMPLATE_PATH
 
 
 @pytest.fixture
@@ -49,3 +49,30 @@ def test_bad_name_interactive():
 def _clean_up_project(project_dir):
     if project_dir.is_dir():
         shutil.rmtree(str(project_dir), ignore_errors=True)
+
+
+def test_compile(tmp_path):
+    conf = tmp_path / "conf"
+    (conf / "base").mkdir(parents=True)
+    (conf / "base" / "catalog.yml").write_text(
+        "companies:\n  type: pandas.CSVDataset\n  filepath: companies.csv\n"
+    )
+    runner = CliRunner()
+    result = runner.invoke(compile_catalog, [str(conf)])
+    assert result.exit_code == 0, result.output
+    assert "Validated 1 of 1 entries" in result.output
+    assert (conf / "base" / "catalog.snapshot").is_file()
+
+    output = tmp_path / "out" / "catalog.snapshot"
+    result = runner.invoke(compile_catalog, [str(conf), "-o", str(output), "-w", "2"])
+    assert result.exit_code == 0, result.output
+    assert output.is_file()
+
+
+def test_compile_invalid_catalog(tmp_path):
+    (tmp_path / "base").mkdir()
+    (tmp_path / "base" / "catalog.yml").write_text("companies:\n  type: Nope\n")
+    result = CliRunner().invoke(compile_catalog, [str(tmp_path)])
+    assert result.exit_code != 0
+    assert "Failed to compile the catalog" in result.output
+    assert not (tmp_path / "base" / "catalog.snapshot").exists()
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import json
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from socketserver import ThreadingMixIn, UnixStreamServer
+
+import pytest
+
+from universal_catalog.core.datasets.cache import configure_cache
+from universal_catalog.core.datasets.replicas import reset_replicas
+from universal_catalog.core.datasets.resolution import configure_resolution
+from universal_catalog.core.datasets.session import (
+    configure_client,
+    reset_client,
+    unix_socket_url,
+)
+from universal_catalog.core.datasets.timing import configure_timing, reset_timings
+
+
+@pytest.fixture(autouse=True)
+def fast_client():
+    configure_client(backoff_factor=0, backoff_jitter=0)
+    yield
+    reset_client()
+    configure_cache(enabled=False)
+    configure_resolution()
+    reset_replicas()
+    configure_timing(False)
+    reset_timings()
+
+
+class _UnixHTTPServer(ThreadingMixIn, UnixStreamServer):
+    def get_request(self):
+        # ``BaseHTTPRequestHandler`` expects an address made of a host and port
+        request, _ = super().get_request()
+        return request, ("local", 0)
+
+
+class _LocalServer:
+    """Minimal keep-alive HTTP server answering every request with the
+    next queued ``(status, body, delay)`` triple, or the last one when the
+    queue is exhausted."""
+
+    def __init__(self, socket_path=None):
+        self.responses = [(200, {}, 0.0)]
+        self.hits = 0
+        self.requests = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _respond(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length) if length else b""
+                server.requests.append((self.command, self.path, body))
+                index = min(server.hits, len(server.responses) - 1)
+                server.hits += 1
+                status, payload, delay = server.responses[index]
+                if delay:
+                    time.sleep(delay)
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = _respond
+            do_POST = _respond
+
+            def log_message(self, *args):
+                pass
+
+        if socket_path is None:
+            self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+            self.url = f"http://127.0.0.1:{self._httpd.server_address[1]}"
+        else:
+            self._httpd = _UnixHTTPServer(str(socket_path), Handler)
+            self.url = unix_socket_url(socket_path)
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+
+    def close(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+@pytest.fixture
+def local_server():
+    server = _LocalServer()
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def other_server():
+    server = _LocalServer()
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def unix_server(tmp_path):
+    server = _LocalServer(tmp_path / "catalog.sock")
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def dead_url():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}"
@@ -0,0 +1,255 @@
+import time
+
+import pytest
+
+from universal_catalog import RemoteCatalog, UniversalCatalogDataset
+from universal_catalog.core.datasets import cache
+from universal_catalog.core.datasets.cache import (
+    EntryCache,
+    configure_cache,
+    get_cache,
+)
+from universal_catalog.core.datasets.prefetch import fetch_entries
+from universal_catalog.core.datasets.remote_catalog import _fetch_catalog
+from universal_catalog.core.datasets.resolution import configure_resolution
+
+from .test_universal_catalog_dataset import TEST_URL, TEST_METHOD
+
+URL = TEST_URL.rstrip("/")
+
+
+@pytest.fixture
+def entry(tmp_path):
+    return {"type": "pandas.CSVDataset", "filepath": (tmp_path / "a.csv").as_posix()}
+
+
+@pytest.fixture
+def enabled_cache(tmp_path):
+    # Only exercise the on-disk cache, not the in-process one in front of it
+    configure_resolution(enabled=False)
+    configure_cache(path=tmp_path / "cache.sqlite", ttl=60)
+    return get_cache()
+
+
+@pytest.fixture
+def server(requests_mock, entry):
+    requests_mock.register_uri("GET", URL + "/version/", json={"version": "v1"})
+    requests_mock.register_uri("GET", TEST_URL + "/dataset/companies", json=entry)
+    requests_mock.register_uri("GET", TEST_URL + "/catalog/", json={"companies": entry})
+    return requests_mock
+
+
+def _dataset_calls(requests_mock):
+    return [
+        r
+        for r in requests_mock.request_history
+        if not r.path.endswith(("/version/", "/changes/"))
+    ]
+
+
+def test_cache_disabled_by_default():
+    assert get_cache() is None
+    assert cache.lookup(URL, cache.ENTRY, ["a"]) == {}
+    cache.store(URL, cache.ENTRY, {"a": {}})
+
+
+def test_unknown_setting():
+    with pytest.raises(ValueError, match="Unknown cache settings"):
+        configure_cache(size=1)
+
+
+def test_default_cache_path(monkeypatch, tmp_path):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    assert EntryCache().path == tmp_path / "universal_catalog" / "entries.sqlite"
+
+
+def test_fresh_entries_skip_network(server, enabled_cache, entry):
+    UniversalCatalogDataset(url=TEST_URL, source_name="companies")._describe()
+    assert len(_dataset_calls(server)) == 1
+
+    server.reset_mock()
+    cache._versions.clear()
+    UniversalCatalogDataset(url=TEST_URL, source_name="companies")._describe()
+    assert server.call_count == 0
+
+
+def test_stale_entries_are_revalidated(server, enabled_cache):
+    UniversalCatalogDataset(url=TEST_URL, source_name="companies")._describe()
+    enabled_cache.ttl = 0
+    cache._versions.clear()
+    server.reset_mock()
+
+    UniversalCatalogDataset(url=TEST_URL, source_name="companies")._describe()
+    assert [r.path for r in server.request_history] == ["/version/"]
+
+
+def test_stale_entries_are_refetched_on_new_version(server, enabled_cache):
+    UniversalCatalogDataset(url=TEST_URL, source_name="companies")._describe()
+    enabled_cache.ttl = 0
+    cache._versions.clear()
+    server.register_uri("GET", URL + "/version/", json={"version": "v2"})
+    server.reset_mock()
+
+    UniversalCatalogDataset(url=TEST_URL, source_name="companies")._describe()
+    assert len(_dataset_calls(server)) == 1
+
+
+def test_server_without_version(requests_mock, enabled_cache, entry):
+    requests_mock.register_uri("GET", URL + "/version/", status_code=404)
+    requests_mock.register_uri("GET", TEST_URL + "/dataset/companies", json=entry)
+    UniversalCatalogDataset(url=TEST_URL, source_name="companies")._describe()
+    enabled_cache.ttl = 0
+    UniversalCatalogDataset(url=TEST_URL, source_name="companies")._describe()
+    assert len(_dataset_calls(requests_mock)) == 2
+
+
+def test_remote_catalog_cache(server, enabled_cache):
+    credentials = dict(remote_catalog=dict(url=TEST_URL))
+    RemoteCatalog.from_config(catalog=None, credentials=credentials)
+    server.reset_mock()
+    remote_catalog = RemoteCatalog.from_config(catalog=None, credentials=credentials)
+    assert "companies" in remote_catalog._datasets
+    assert server.call_count == 0
+
+
+def test_fetch_entries_uses_cache(server, enabled_cache, entry):
+    server.register_uri(
+        TEST_METHOD, TEST_URL + "/datasets/", json={"a": entry, "b": None}
+    )
+    fetch_entries(TEST_URL, ["a", "b"])
+    server.reset_mock()
+    server.register_uri(TEST_METHOD, TEST_URL + "/datasets/", json={"b": None})
+    assert fetch_entries(TEST_URL, ["a", "b"]) == {"a": entry, "b": None}
+    assert server.request_history[-1].json() == {"names": ["b"]}
+
+
+def test_eviction(tmp_path):
+    entry_cache = EntryCache(tmp_path / "cache.sqlite", max_bytes=50)
+    entry_cache.put(URL, cache.ENTRY, {"a": {"filepath": "a" * 20}}, "v1")
+    time.sleep(0.01)
+    entry_cache.put(URL, cache.ENTRY, {"b": {"filepath": "b" * 20}}, "v1")
+    assert set(entry_cache.get(URL, cache.ENTRY, ["a", "b"])) == {"b"}
+
+
+def test_clear(tmp_path):
+    entry_cache = EntryCache(tmp_path / "cache.sqlite")
+    entry_cache.put(URL, cache.ENTRY, {"a": {}}, "v1")
+    entry_cache.clear()
+    assert entry_cache.get(URL, cache.ENTRY, ["a"]) == {}
+
+
+def test_remote_catalog_delta_sync(server, enabled_cache, entry):
+    credentials = dict(remote_catalog=dict(url=TEST_URL, prefix="c"))
+    RemoteCatalog.from_config(catalog=None, credentials=credentials)
+    enabled_cache.ttl = 0
+    cache._versions.clear()
+    server.register_uri("GET", URL + "/version/", json={"version": "v2"})
+    changes = server.register_uri(
+        "GET",
+        TEST_URL + "/catalog/changes/",
+        json={
+            "version": "v2",
+            "since": "v1",
+            "full": False,
+            "changed": {"cars": entry},
+            "removed": ["companies"],
+        },
+    )
+    server.reset_mock()
+
+    remote_catalog = RemoteCatalog.from_config(catalog=None, credentials=credentials)
+    assert set(remote_catalog._datasets) == {"cars"}
+    assert changes.last_request.qs == {"since": ["v1"], "prefix": ["c"]}
+    assert not _dataset_calls(server)
+    assert cache.snapshot(URL, cache.CATALOG, "prefix=c") == ({"cars": entry}, "v2")
+
+
+def test_remote_catalog_full_sync(server, enabled_cache, entry):
+    credentials = dict(remote_catalog=dict(url=TEST_URL))
+    RemoteCatalog.from_config(catalog=None, credentials=credentials)
+    enabled_cache.ttl = 0
+    cache._versions.clear()
+    server.register_uri("GET", URL + "/version/", json={"version": "v2"})
+    server.register_uri(
+        "GET",
+        TEST_URL + "/catalog/changes/",
+        json={
+            "version": "v2",
+            "since": "v1",
+            "full": True,
+            "changed": {"cars": entry},
+            "removed": [],
+        },
+    )
+    remote_catalog = RemoteCatalog.from_config(catalog=None, credentials=credentials)
+    assert set(remote_catalog._datasets) == {"cars"}
+
+
+def test_remote_catalog_sync_with_old_server(server, enabled_cache):
+    credentials = dict(remote_catalog=dict(url=TEST_URL))
+    RemoteCatalog.from_config(catalog=None, credentials=credentials)
+    enabled_cache.ttl = 0
+    cache._versions.clear()
+    server.register_uri("GET", URL + "/version/", json={"version": "v2"})
+    server.register_uri("GET", TEST_URL + "/catalog/changes/", status_code=404)
+    server.reset_mock()
+
+    remote_catalog = RemoteCatalog.from_config(catalog=None, credentials=credentials)
+    assert "companies" in remote_catalog._datasets
+    assert len(_dataset_calls(server)) == 1
+
+
+def test_snapshot_disabled():
+    assert cache.snapshot(URL, cache.CATALOG, "") is None
+
+
+@pytest.fixture
+def caching_proxy(requests_mock, entry):
+    """Server at catalog version ``origin["version"]`` behind a proxy that keeps
+    the responses of pinned URLs for good, as their ``Cache-Control`` allows."""
+    origin = {"version": "v1", "entry": entry}
+    kept = {}
+
+    def respond(request, context):
+        pinned = request.qs.get("version", [None])[0]
+        if (request.path, pinned) in kept:
+            body, version = kept[request.path, pinned]
+        else:
+            version = origin["version"]
+            body = origin["entry"]
+            if request.path.endswith("/catalog/"):
+                body = {"companies": body}
+            if pinned == version:
+                kept[request.path, pinned] = body, version
+        context.headers["X-Catalog-Version"] = version
+        return body
+
+    requests_mock.register_uri("GET", TEST_URL + "/dataset/companies", json=respond)
+    requests_mock.register_uri("GET", TEST_URL + "/catalog/", json=respond)
+    return origin
+
+
+def test_pins_lapse_behind_a_caching_proxy(caching_proxy, requests_mock, entry):
+    configure_resolution(enabled=False)
+
+    def resolve():
+        dataset = UniversalCatalogDataset(url=TEST_URL, source_name="companies")
+        return dataset._resolve(), _fetch_catalog(TEST_URL, {})["companies"]
+
+    assert resolve() == (entry, entry)
+    _, confirmed_at = cache._versions[URL]
+    # Now that the version is known, the proxy keeps the pinned responses
+    assert resolve() == (entry, entry)
+    assert requests_mock.last_request.qs == {"version": ["v1"]}
+
+    caching_proxy["version"] = "v2"
+    caching_proxy["entry"] = {**entry, "filepath": "b.csv"}
+    # Until the pin lapses the proxy answers with the old version, which does
+    # not make the pin last any longer
+    assert resolve() == (entry, entry)
+    assert cache._versions[URL] == ("v1", confirmed_at)
+
+    cache._versions[URL] = ("v1", time.time() - cache.PIN_TTL)
+    assert resolve() == (caching_proxy["entry"], caching_proxy["entry"])
+    assert requests_mock.request_history[-2].qs == {}
+    assert requests_mock.last_request.qs == {"version": ["v2"]}
@@ -0,0 +1,109 @@
+import asyncio
+import time
+
+import pytest
+import requests
+from kedro.io import DataCatalog, MemoryDataset
+
+from universal_catalog import UniversalCatalogDataset
+from universal_catalog.core.datasets.prefetch import (
+    afetch_entries,
+    fetch_entries,
+    prefetch_datasets,
+)
+
+from .test_universal_catalog_dataset import TEST_URL, TEST_METHOD
+
+BATCH_URL = TEST_URL + "/datasets/"
+
+
+@pytest.fixture
+def entry(tmp_path):
+    return {"type": "pandas.CSVDataset", "filepath": (tmp_path / "a.csv").as_posix()}
+
+
+@pytest.fixture
+def catalog():
+    return DataCatalog(
+        datasets={
+            "cars": UniversalCatalogDataset(url=TEST_URL, source_name="cars"),
+            "boats": UniversalCatalogDataset(url=TEST_URL, source_name="boats"),
+            "missing": UniversalCatalogDataset(url=TEST_URL, source_name="missing"),
+            "memory": MemoryDataset(),
+        }
+    )
+
+
+@pytest.fixture
+def batch_server(requests_mock, entry):
+    def respond(request, context):
+        return {
+            name: None if name == "c" else entry for name in request.json()["names"]
+        }
+
+    return requests_mock.register_uri(TEST_METHOD, BATCH_URL, json=respond)
+
+
+def test_fetch_entries_batches(batch_server, entry):
+    entries = fetch_entries(TEST_URL, ["a", "b", "a", "c"], batch_size=2)
+    assert entries == {"a": entry, "b": entry, "c": None}
+    assert batch_server.call_count == 2
+    batches = sorted(
+        request.json()["names"] for request in batch_server.request_history
+    )
+    assert batches == [["a", "b"], ["c"]]
+
+
+def test_batches_are_sent_concurrently(local_server, entry):
+    names = [f"cars_{index}" for index in range(8)]
+    local_server.responses = [(200, dict.fromkeys(names, entry), 0.2)]
+    start = time.perf_counter()
+    entries = fetch_entries(local_server.url, names, batch_size=2)
+    assert time.perf_counter() - start < 0.2 * 4 / 2
+    assert entries == dict.fromkeys(names, entry)
+    assert local_server.hits == 4
+
+
+def test_resolved_entries_are_not_fetched(batch_server, requests_mock, entry):
+    requests_mock.register_uri("GET", TEST_URL + "/dataset/a", json=entry)
+    UniversalCatalogDataset(url=TEST_URL, source_name="a")._describe()
+    assert fetch_entries(TEST_URL, ["a"]) == {"a": entry}
+    assert fetch_entries(TEST_URL, ["a", "b"]) == {"a": entry, "b": entry}
+    assert [request.json() for request in batch_server.request_history] == [
+        {"names": ["b"]}
+    ]
+
+
+def test_afetch_entries(batch_server, entry):
+    async def main():
+        return await asyncio.gather(
+            afetch_entries(TEST_URL, ["a", "b", "c"], batch_size=1),
+            afetch_entries(TEST_URL, []),
+        )
+
+    assert asyncio.run(main()) == [{"a": entry, "b": entry, "c": None}, {}]
+    assert batch_server.call_count == 3
+
+
+def test_prefetch_datasets(requests_mock, catalog, entry):
+    requests_mock.register_uri(
+        TEST_METHOD,
+        BATCH_URL,
+        json={"cars": entry, "boats": entry, "missing": None},
+    )
+    assert prefetch_datasets(catalog) == 2
+    assert requests_mock.call_count == 1
+    assert catalog._datasets["cars"]._dataset is not None
+    assert catalog._datasets["missing"]._dataset is None
+
+    # Already materialized datasets are not requested again
+    prefetch_datasets(catalog)
+    assert requests_mock.request_history[-1].json() == {"names": ["missing"]}
+
+
+def test_prefetch_datasets_server_error(requests_mock, catalog):
+    requests_mock.register_uri(
+        TEST_METHOD, BATCH_URL, status_code=requests.codes.not_found
+    )
+    assert prefetch_datasets(catalog) == 0
+    assert catalog._datasets["cars"]._dataset is None
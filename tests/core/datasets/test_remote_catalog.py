@@ -1,10 +1,22 @@
+import pickle
+import threading
+import time
+
+import pandas as pd
 import pytest
 
-from .test_universal_catalog_dataset import TEST_URL, TEST_METHOD
+from kedro.io import MemoryDataset
+from kedro.io.core import AbstractDataset, DatasetAlreadyExistsError
+from kedro.pipeline import Pipeline, node
+from kedro.runner import SequentialRunner
+
+from .test_universal_catalog_dataset import TEST_URL
 
 from kedro.io.data_catalog import DataCatalog
 from kedro.io.core import DatasetError
 from universal_catalog import RemoteCatalog
+from universal_catalog.core.datasets.remote_catalog import _fetch_catalog
+from universal_catalog.core.universal_catalog import UniversalCatalog
 
 
 @pytest.fixture
@@ -54,17 +66,199 @@ def test_missing_url(missing_url):
 
 
 def test_load_remote_catalog(requests_mock, catalog_json, credentials):
-    requests_mock.register_uri(TEST_METHOD, TEST_URL + "/catalog/", text=catalog_json)
+    requests_mock.register_uri("GET", TEST_URL + "/catalog/", text=catalog_json)
     remote_catalog = RemoteCatalog.from_config(catalog=None, credentials=credentials)
     assert isinstance(remote_catalog, DataCatalog)
     assert "companies" in remote_catalog._datasets
 
 
 def test_update(requests_mock, catalog_json, credentials, update_catalog_dict):
-    requests_mock.register_uri(TEST_METHOD, TEST_URL + "/catalog/", text=catalog_json)
+    requests_mock.register_uri("GET", TEST_URL + "/catalog/", text=catalog_json)
     remote_catalog = RemoteCatalog.from_config(
         catalog=update_catalog_dict, credentials=credentials
     )
     assert isinstance(remote_catalog, DataCatalog)
     assert "companies" in remote_catalog._datasets
     assert "cars" in remote_catalog._datasets
+
+
+def test_load_filtered_remote_catalog(requests_mock, credentials):
+    ndjson = (
+        '{"name": "spain.cars", "config": {"type": "pandas.CSVDataset", '
+        '"filepath": "cars.csv"}}\n'
+    )
+    mock = requests_mock.register_uri(
+        "GET",
+        TEST_URL + "/catalog/",
+        text=ndjson,
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    credentials["remote_catalog"]["namespace"] = "spain"
+    remote_catalog = RemoteCatalog.from_config(catalog=None, credentials=credentials)
+    assert "spain.cars" in remote_catalog._datasets
+    assert mock.last_request.qs == {"namespace": ["spain"]}
+    assert mock.last_request.headers["Accept"] == "application/x-ndjson"
+
+
+def test_remote_catalog_is_pinned_to_known_version(
+    requests_mock, catalog_json, credentials
+):
+    mock = requests_mock.register_uri(
+        "GET",
+        TEST_URL + "/catalog/",
+        text=catalog_json,
+        headers={"X-Catalog-Version": "v1"},
+    )
+    RemoteCatalog.from_config(catalog=None, credentials=credentials)
+    RemoteCatalog.from_config(catalog=None, credentials=credentials)
+    assert mock.last_request.qs == {"version": ["v1"]}
+
+
+def test_load_remote_catalog_from_old_server(requests_mock, catalog_json, credentials):
+    requests_mock.register_uri("GET", TEST_URL + "/catalog/", status_code=405)
+    requests_mock.register_uri("POST", TEST_URL + "/catalog/", text=catalog_json)
+    remote_catalog = RemoteCatalog.from_config(catalog=None, credentials=credentials)
+    assert "companies" in remote_catalog._datasets
+
+
+def test_filter_remote_catalog_from_old_server(
+    requests_mock, catalog_json, credentials
+):
+    requests_mock.register_uri("GET", TEST_URL + "/catalog/", text=catalog_json)
+    credentials["remote_catalog"]["prefix"] = "cars"
+    remote_catalog = RemoteCatalog.from_config(catalog=None, credentials=credentials)
+    assert "companies" not in remote_catalog._datasets
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [{"prefix": "france."}, {"namespace": "spain"}, {"glob": "*.cars"}, {}],
+)
+def test_old_and_new_servers_filter_alike(requests_mock, filters):
+    entry = {"type": "pandas.CSVDataset", "filepath": "data.csv"}
+    server = UniversalCatalog.from_config(
+        {
+            "france.cars": entry,
+            "france.boats": entry,
+            "spain.cars": entry,
+            "france.{name}_csv": {**entry, "filepath": "{name}.csv"},
+            "{namespace}.{name}_pq": {**entry, "filepath": "{name}.pq"},
+            "{default}": {**entry, "filepath": "{default}.csv"},
+        }
+    )
+    names, _ = server.select(**filters)
+    requests_mock.register_uri(
+        "GET",
+        TEST_URL + "/catalog/",
+        content=b"".join(server.iter_ndjson(names)),
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    new = _fetch_catalog(TEST_URL, filters)
+    requests_mock.register_uri(
+        "GET", TEST_URL + "/catalog/", content=server.catalog_json()
+    )
+    old = _fetch_catalog(TEST_URL, filters)
+    assert old == new
+    assert any("{" in name for name in new)
+
+
+@pytest.fixture
+def lazy_catalog(requests_mock, credentials, tmp_path, monkeypatch):
+    entries = {
+        name: {"type": "pandas.CSVDataset", "filepath": str(tmp_path / f"{name}.csv")}
+        for name in ["cars", "boats", "planes"]
+    }
+    entries["{name}_json"] = {"type": "json.JSONDataset", "filepath": "{name}.json"}
+    requests_mock.register_uri("GET", TEST_URL + "/catalog/", json=entries)
+    instantiated = []
+    from_config = AbstractDataset.from_config
+
+    def spy(name, *args, **kwargs):
+        instantiated.append(name)
+        return from_config(name, *args, **kwargs)
+
+    monkeypatch.setattr(AbstractDataset, "from_config", spy)
+    credentials["remote_catalog"]["lazy"] = True
+    catalog = RemoteCatalog.from_config(
+        catalog={"trains": {"type": "pandas.CSVDataset", "filepath": "trains.csv"}},
+        credentials=credentials,
+    )
+    return catalog, instantiated
+
+
+def test_lazy_remote_catalog(lazy_catalog):
+    catalog, instantiated = lazy_catalog
+    assert isinstance(catalog, RemoteCatalog)
+    assert instantiated == ["trains"]
+    assert catalog.list() == ["trains", "cars", "boats", "planes"]
+    assert catalog.list("^b") == ["boats"]
+    assert catalog.list(" ") == []
+    with pytest.raises(SyntaxError):
+        catalog.list("[")
+    assert "cars" in catalog
+    assert "ships_json" in catalog
+    assert instantiated == ["trains"]
+
+    assert catalog._get_dataset("cars") is catalog._get_dataset("cars")
+    assert instantiated == ["trains", "cars"]
+
+
+def test_lazy_remote_catalog_shallow_copy(lazy_catalog):
+    catalog, instantiated = lazy_catalog
+    copied = catalog.shallow_copy()
+    assert isinstance(copied, RemoteCatalog)
+    assert copied.list() == catalog.list()
+    assert copied._get_dataset("boats") is catalog._get_dataset("boats")
+    assert instantiated == ["trains", "boats"]
+
+    restored = pickle.loads(pickle.dumps(copied))
+    assert "boats" in restored._datasets
+    assert restored._get_dataset("planes")
+
+
+def test_lazy_remote_catalog_concurrent_first_use(lazy_catalog, monkeypatch):
+    catalog, instantiated = lazy_catalog
+    from_config = AbstractDataset.from_config
+
+    def slow_from_config(*args, **kwargs):
+        time.sleep(0.05)
+        return from_config(*args, **kwargs)
+
+    monkeypatch.setattr(AbstractDataset, "from_config", slow_from_config)
+    barrier = threading.Barrier(4)
+    datasets, errors = [], []
+
+    def use():
+        barrier.wait()
+        try:
+            datasets.append(catalog._get_dataset("cars"))
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=use) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert len(datasets) == 4
+    assert all(dataset is datasets[0] for dataset in datasets)
+    assert instantiated.count("cars") == 1
+
+
+def test_lazy_remote_catalog_add(lazy_catalog):
+    catalog, _ = lazy_catalog
+    with pytest.raises(DatasetAlreadyExistsError):
+        catalog.add("cars", MemoryDataset())
+    catalog.add("cars", MemoryDataset(1), replace=True)
+    assert catalog.load("cars") == 1
+
+
+def test_lazy_remote_catalog_run(lazy_catalog):
+    catalog, instantiated = lazy_catalog
+    cars = catalog._lazy_datasets._configs["cars"]
+    pd.DataFrame({"a": [1]}).to_csv(cars["filepath"])
+    pipeline = Pipeline([node(lambda cars: cars, "cars", "boats")])
+    SequentialRunner().run(pipeline, catalog)
+    assert sorted(instantiated) == ["boats", "cars", "trains"]
+    assert catalog.load("boats").shape == (1, 2)
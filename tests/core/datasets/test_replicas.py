@@ -0,0 +1,190 @@
+import time
+
+import pytest
+import requests
+
+from kedro.io.core import DatasetError
+
+from universal_catalog import RemoteCatalog, UniversalCatalogDataset
+from universal_catalog.core.datasets import replicas
+from universal_catalog.core.datasets.prefetch import fetch_entries
+from universal_catalog.core.datasets.session import configure_client
+from universal_catalog.core.datasets.replicas import (
+    configure_replicas,
+    get_replica_stats,
+    replica_key,
+    replica_urls,
+)
+
+
+@pytest.fixture
+def in_order(monkeypatch):
+    """Try replicas in the order they are listed."""
+    monkeypatch.setattr(
+        replicas.random, "sample", lambda population, k: list(population)[:k]
+    )
+
+
+def test_replica_key():
+    assert replica_urls("http://a") == ["http://a"]
+    assert replica_key("http://a/") == "http://a/"
+    assert replica_key(["http://a/"]) == "http://a/"
+    assert replica_key(["http://b/", "http://a"]) == "http://a,http://b"
+    with pytest.raises(DatasetError, match="At least one server url"):
+        replica_urls([])
+
+
+def test_unknown_setting():
+    with pytest.raises(ValueError, match="Unknown replica settings: size"):
+        configure_replicas(size=1)
+
+
+@pytest.mark.usefixtures("in_order")
+def test_failover(local_server, dead_url):
+    local_server.responses = [(200, {"a": 1}, 0.0)]
+    response = replicas.request([dead_url, local_server.url], "/dataset/", {})
+    assert response.json() == {"a": 1}
+    stats = get_replica_stats()
+    assert stats[dead_url]["failures"] == 1
+    assert stats[local_server.url]["requests"] == 1
+    assert stats[local_server.url]["latency"] > 0
+
+
+@pytest.mark.usefixtures("in_order")
+def test_ejection(local_server, dead_url, caplog):
+    configure_replicas(eject_seconds=0.2)
+    urls = [dead_url, local_server.url]
+    for _ in range(3):
+        replicas.request(urls, "/dataset/", {})
+    assert "Ejecting replica" in caplog.text
+    assert get_replica_stats()[dead_url]["ejected"]
+
+    replicas.request(urls, "/dataset/", {})
+    assert get_replica_stats()[dead_url]["requests"] == 3
+
+    time.sleep(0.2)
+    replicas.request(urls, "/dataset/", {})
+    assert get_replica_stats()[dead_url]["failures"] == 4
+
+
+@pytest.mark.usefixtures("in_order")
+def test_client_errors_are_not_retried(local_server, other_server):
+    local_server.responses = [(404, {}, 0.0)]
+    with pytest.raises(DatasetError, match="Failed to fetch data"):
+        replicas.request([local_server.url, other_server.url], "/dataset/", {})
+    assert other_server.hits == 0
+    assert get_replica_stats()[local_server.url]["failures"] == 0
+
+
+@pytest.mark.usefixtures("in_order")
+def test_failover_is_not_retried(local_server, dead_url):
+    # Single servers back off between retries, replicas fail over at once
+    configure_client(backoff_factor=1)
+    local_server.responses = [(503, {}, 0.0), (200, {"a": 1}, 0.0)]
+    start = time.monotonic()
+    response = replicas.request(
+        [dead_url, local_server.url, local_server.url + "/"], "/dataset/", {}
+    )
+    assert time.monotonic() - start < 0.5
+    assert response.json() == {"a": 1}
+    assert local_server.hits == 2
+    assert get_replica_stats()[dead_url]["failures"] == 1
+
+
+def test_every_replica_failing(dead_url):
+    with pytest.raises(DatasetError, match="Failed to connect"):
+        replicas.request([dead_url, dead_url + "/"], "/dataset/", {})
+
+
+def test_faster_replica_is_preferred(local_server, other_server):
+    for _ in range(3):
+        replicas._record_success("key", local_server.url, 0.5)
+        replicas._record_success("key", other_server.url, 0.01)
+    for _ in range(5):
+        replicas.request([local_server.url, other_server.url], "/dataset/", {})
+    assert local_server.hits == 0
+    assert other_server.hits == 5
+
+
+@pytest.mark.usefixtures("in_order")
+def test_hedged_request(local_server, other_server):
+    configure_replicas(hedge=True, hedge_initial_delay=0.05)
+    local_server.responses = [(200, {"slow": True}, 0.5)]
+    other_server.responses = [(200, {"slow": False}, 0.0)]
+    start = time.monotonic()
+    response = replicas.request([local_server.url, other_server.url], "/dataset/", {})
+    assert response.json() == {"slow": False}
+    assert time.monotonic() - start < 0.4
+    assert local_server.hits == other_server.hits == 1
+
+
+@pytest.mark.usefixtures("in_order")
+def test_hedged_failover(local_server, dead_url):
+    configure_replicas(hedge=True)
+    local_server.responses = [(200, {"a": 1}, 0.0)]
+    response = replicas.request([dead_url, local_server.url], "/dataset/", {})
+    assert response.json() == {"a": 1}
+
+    with pytest.raises(DatasetError, match="Failed to connect"):
+        replicas.request([dead_url, dead_url + "/"], "/dataset/", {})
+
+    local_server.responses = [(404, {}, 0.0)]
+    with pytest.raises(DatasetError, match="Failed to fetch data"):
+        replicas.request([local_server.url, dead_url], "/dataset/", {})
+
+
+def test_hedge_delay():
+    configure_replicas(hedge_initial_delay=0.3, hedge_min_delay=0.05)
+    assert replicas._hedge_delay("key") == 0.3
+    for i in range(100):
+        replicas._record_success("key", "http://a", i / 1000)
+    assert replicas._hedge_delay("key") == 0.095
+    configure_replicas(hedge_quantile=0.01)
+    assert replicas._hedge_delay("key") == 0.05
+
+
+def test_retryable():
+    def error(status):
+        response = requests.Response()
+        response.status_code = status
+        exc = requests.exceptions.HTTPError(response=response)
+        try:
+            raise DatasetError("Failed to fetch data") from exc
+        except DatasetError as dataset_error:
+            return dataset_error
+
+    assert replicas._retryable(error(503))
+    assert replicas._retryable(error(429))
+    assert not replicas._retryable(error(404))
+    assert not replicas._retryable(DatasetError("no cause"))
+
+
+def test_new_executor_after_fork(monkeypatch):
+    executor = replicas._get_executor()
+    assert replicas._get_executor() is executor
+    monkeypatch.setattr(replicas.os, "getpid", lambda: -1)
+    assert replicas._get_executor() is not executor
+
+
+@pytest.mark.usefixtures("in_order")
+def test_dataset_with_replicas(local_server, dead_url, tmp_path):
+    entry = {"type": "pandas.CSVDataset", "filepath": (tmp_path / "a.csv").as_posix()}
+    local_server.responses = [(200, entry, 0.0)]
+    dataset = UniversalCatalogDataset(
+        url=[dead_url, local_server.url], source_name="companies"
+    )
+    assert dataset._describe()["filepath"].as_posix() == entry["filepath"]
+
+    fetch_entries([dead_url, local_server.url], ["shuttles"])
+    assert local_server.requests[-1][1] == "/datasets/"
+
+
+@pytest.mark.usefixtures("in_order")
+def test_remote_catalog_with_replicas(local_server, dead_url, tmp_path):
+    entry = {"type": "pandas.CSVDataset", "filepath": (tmp_path / "a.csv").as_posix()}
+    local_server.responses = [(200, {"companies": entry}, 0.0)]
+    catalog = RemoteCatalog.from_config(
+        catalog={},
+        credentials={"remote_catalog": {"url": [dead_url, local_server.url + "/"]}},
+    )
+    assert catalog.list() == ["companies"]
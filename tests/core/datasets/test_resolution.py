@@ -0,0 +1,170 @@
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from universal_catalog import UniversalCatalogDataset
+from universal_catalog.core.datasets import resolution
+from universal_catalog.core.datasets.prefetch import fetch_entries
+from universal_catalog.core.datasets.resolution import (
+    ResolutionCache,
+    configure_resolution,
+    get_resolution_cache,
+)
+
+URL = "http://localhost:5000"
+
+
+class _Fetch:
+    """Fetch function returning ``1``, ``2``, ... once ``release`` is set."""
+
+    def __init__(self, error=None):
+        self.calls = 0
+        self.error = error
+        self.release = threading.Event()
+        self.release.set()
+
+    def __call__(self):
+        self.calls += 1
+        self.release.wait(5)
+        if self.error is not None:
+            raise self.error
+        return {"calls": self.calls}
+
+
+def _wait_for_refresh(cache):
+    deadline = time.monotonic() + 5
+    while cache._inflight and time.monotonic() < deadline:
+        time.sleep(0.001)
+
+
+def _resolve_concurrently(cache, fetch, n=8):
+    fetch.release.clear()
+    with ThreadPoolExecutor(n) as executor:
+        futures = [
+            executor.submit(cache.resolve, URL, "companies", fetch) for _ in range(n)
+        ]
+        while cache.stats["misses"] + cache.stats["coalesced"] < n:
+            time.sleep(0.001)
+        fetch.release.set()
+        return [future.exception() or future.result() for future in futures]
+
+
+def test_concurrent_resolutions_are_coalesced():
+    cache = ResolutionCache()
+    fetch = _Fetch()
+    results = _resolve_concurrently(cache, fetch)
+    assert fetch.calls == 1
+    assert results == [{"calls": 1}] * 8
+    assert cache.stats["coalesced"] == 7
+    assert cache.resolve(URL + "/", "companies", fetch) == {"calls": 1}
+    assert cache.stats["hits"] == 1
+
+
+def test_errors_are_shared_and_not_cached():
+    cache = ResolutionCache()
+    fetch = _Fetch(error=ValueError("boom"))
+    results = _resolve_concurrently(cache, fetch)
+    assert fetch.calls == 1
+    assert all(isinstance(result, ValueError) for result in results)
+
+    fetch.error = None
+    assert cache.resolve(URL, "companies", fetch) == {"calls": 2}
+
+
+def test_stale_while_revalidate():
+    cache = ResolutionCache(ttl=0, stale_ttl=60)
+    fetch = _Fetch()
+    assert cache.resolve(URL, "companies", fetch) == {"calls": 1}
+
+    fetch.release.clear()
+    assert cache.resolve(URL, "companies", fetch) == {"calls": 1}
+    assert cache.resolve(URL, "companies", fetch) == {"calls": 1}
+    fetch.release.set()
+    _wait_for_refresh(cache)
+    assert fetch.calls == 2
+    assert cache.resolve(URL, "companies", fetch) == {"calls": 2}
+    assert cache.stats["stale"] == 3
+
+
+def test_failed_refresh_keeps_entry(caplog):
+    cache = ResolutionCache(ttl=0, stale_ttl=60)
+    fetch = _Fetch()
+    cache.resolve(URL, "companies", fetch)
+    fetch.error = ValueError("boom")
+    assert cache.resolve(URL, "companies", fetch) == {"calls": 1}
+    _wait_for_refresh(cache)
+    assert "Failed to refresh 'companies'" in caplog.text
+    assert cache.resolve(URL, "companies", fetch) == {"calls": 1}
+
+
+def test_expired_entries_are_fetched_again():
+    cache = ResolutionCache(ttl=0, stale_ttl=0)
+    fetch = _Fetch()
+    cache.resolve(URL, "companies", fetch)
+    assert cache.resolve(URL, "companies", fetch) == {"calls": 2}
+
+
+def test_prime_and_clear():
+    cache = ResolutionCache()
+    cache.prime(URL + "/", {"companies": {"a": 1}})
+    fetch = _Fetch()
+    assert cache.resolve(URL, "companies", fetch) == {"a": 1}
+    cache.clear()
+    assert cache.resolve(URL, "companies", fetch) == {"calls": 1}
+
+
+def test_configure_resolution():
+    configure_resolution(ttl=1)
+    assert get_resolution_cache().ttl == 1
+    configure_resolution(enabled=False)
+    assert get_resolution_cache() is None
+    fetch = _Fetch()
+    resolution.resolve(URL, "companies", fetch)
+    resolution.resolve(URL, "companies", fetch)
+    resolution.prime(URL, {"companies": {}})
+    assert fetch.calls == 2
+    with pytest.raises(ValueError, match="Unknown resolution settings"):
+        configure_resolution(size=1)
+
+
+def test_new_cache_after_fork(monkeypatch):
+    cache = get_resolution_cache()
+    assert get_resolution_cache() is cache
+    monkeypatch.setattr(resolution.os, "getpid", lambda: -1)
+    assert get_resolution_cache() is not cache
+
+
+def test_datasets_share_resolutions(local_server, tmp_path):
+    entry = {"type": "pandas.CSVDataset", "filepath": (tmp_path / "a.csv").as_posix()}
+    local_server.responses = [(200, entry, 0.2)]
+    datasets = [
+        UniversalCatalogDataset(url=local_server.url, source_name="companies")
+        for _ in range(4)
+    ]
+    with ThreadPoolExecutor(4) as executor:
+        list(executor.map(lambda dataset: dataset._describe(), datasets))
+    assert local_server.hits == 1
+
+
+def test_prefetched_entries_are_shared(requests_mock, tmp_path):
+    entry = {"type": "pandas.CSVDataset", "filepath": (tmp_path / "a.csv").as_posix()}
+    requests_mock.register_uri("POST", URL + "/datasets/", json={"companies": entry})
+    fetch_entries(URL, ["companies"])
+    UniversalCatalogDataset(url=URL, source_name="companies")._describe()
+    assert requests_mock.call_count == 1
+
+
+def test_peek():
+    cache = ResolutionCache(ttl=0, stale_ttl=60)
+    assert cache.peek(URL, "companies") is None
+    cache.prime(URL, {"companies": {"a": 1}})
+    assert cache.peek(URL + "/", "companies") == {"a": 1}
+    cache.stale_ttl = 0
+    assert cache.peek(URL, "companies") is None
+    assert cache.stats == {"hits": 0, "stale": 0, "misses": 0, "coalesced": 0}
+
+    configure_resolution(enabled=False)
+    assert resolution.peek(URL, "companies") is None
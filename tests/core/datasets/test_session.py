@@ -0,0 +1,113 @@
+import pandas as pd
+import pytest
+from kedro.io.core import DatasetError
+
+from universal_catalog.core.datasets.session import (
+    DEFAULT_CLIENT_SETTINGS,
+    configure_client,
+    get_client_settings,
+    get_executor,
+    get_pool_stats,
+    get_session,
+    get_timeout,
+    reset_client,
+    unix_socket_url,
+)
+from universal_catalog.core.datasets.universal_catalog_dataset import (
+    UniversalCatalogDataset,
+)
+from universal_catalog.core.datasets.remote_catalog import RemoteCatalog
+from universal_catalog.core.datasets.utils import _execute_request
+
+
+def test_session_is_shared():
+    assert get_session() is get_session()
+    assert get_session(retries=False) is get_session(retries=False)
+    assert get_session(retries=False) is not get_session()
+    assert get_session(retries=False).adapters["http://"].max_retries.total == 0
+
+
+def test_configure_client_rebuilds_session():
+    session = get_session()
+    configure_client(pool_maxsize=4, connect_timeout=1, read_timeout=2)
+    assert get_session() is not session
+    assert get_timeout() == (1, 2)
+    assert get_client_settings()["pool_maxsize"] == 4
+
+
+def test_executor_follows_pool_size():
+    assert get_executor() is get_executor()
+    configure_client(pool_maxsize=4)
+    assert get_executor()._max_workers == 4
+
+
+def test_configure_client_unknown_setting():
+    with pytest.raises(ValueError, match="Unknown client settings"):
+        configure_client(pool_size=4)
+
+
+def test_reset_client():
+    configure_client(read_timeout=1)
+    reset_client()
+    assert get_client_settings() == DEFAULT_CLIENT_SETTINGS
+
+
+def test_connection_reuse(local_server):
+    for _ in range(5):
+        _execute_request(local_server.url + "/dataset/", {"name": "companies"})
+    stats = get_pool_stats()
+    (pool,) = stats["pools"].values()
+    assert pool["num_requests"] == 5
+    assert pool["num_connections"] == 1
+    assert pool["idle_connections"] == 1
+
+
+def test_read_timeout(local_server):
+    configure_client(read_timeout=0.05, max_retries=0)
+    local_server.responses = [(200, {}, 0.5)]
+    with pytest.raises(DatasetError):
+        _execute_request(local_server.url + "/dataset/", {"name": "companies"})
+
+
+def test_retry_on_unavailable(local_server):
+    local_server.responses = [(503, {}, 0.0), (503, {}, 0.0), (200, {"a": 1}, 0.0)]
+    response = _execute_request(local_server.url + "/dataset/", {"name": "companies"})
+    assert response.json() == {"a": 1}
+    assert local_server.hits == 3
+
+
+def test_retries_exhausted(local_server):
+    configure_client(max_retries=1)
+    local_server.responses = [(503, {}, 0.0)]
+    with pytest.raises(DatasetError, match="Failed to fetch data"):
+        _execute_request(local_server.url + "/dataset/", {"name": "companies"})
+    assert local_server.hits == 2
+
+
+def test_unix_socket_url():
+    assert unix_socket_url("/run/catalog.sock") == "http+unix://%2Frun%2Fcatalog.sock"
+
+
+def test_unix_socket_connection_reuse(unix_server, tmp_path):
+    for _ in range(3):
+        _execute_request(unix_server.url + "/dataset/", {"name": "companies"})
+    stats = get_pool_stats()
+    pool = stats["pools"][str(tmp_path / "catalog.sock")]
+    assert pool["num_requests"] == 3
+    assert pool["num_connections"] == 1
+
+
+def test_datasets_over_unix_socket(unix_server, tmp_path):
+    filepath = (tmp_path / "cars.csv").as_posix()
+    pd.DataFrame({"a": [1, 2]}).to_csv(filepath, index=False)
+    entry = {"type": "pandas.CSVDataset", "filepath": filepath}
+    unix_server.responses = [(200, entry, 0.0)]
+    dataset = UniversalCatalogDataset(url=unix_server.url, source_name="cars")
+    assert dataset.load()["a"].tolist() == [1, 2]
+    assert unix_server.requests[0][:2] == ("GET", "/dataset/cars")
+
+    unix_server.responses = [(200, {"cars": entry}, 0.0)]
+    catalog = RemoteCatalog.from_config(
+        {}, {"remote_catalog": {"url": unix_server.url}}
+    )
+    assert catalog.load("cars")["a"].tolist() == [1, 2]
@@ -0,0 +1,105 @@
+import json
+import logging
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+from kedro.io import DataCatalog
+
+from universal_catalog.core.datasets.cache import configure_cache
+from universal_catalog.core.datasets.prefetch import prefetch_datasets
+from universal_catalog.core.datasets.resolution import configure_resolution
+from universal_catalog.core.datasets.timing import (
+    configure_timing,
+    get_timings,
+    record,
+    timing_summary,
+)
+from universal_catalog.core.datasets.universal_catalog_dataset import (
+    UniversalCatalogDataset,
+)
+
+from .test_universal_catalog_dataset import TEST_METHOD, TEST_URL
+
+
+@pytest.fixture
+def entry(tmp_path):
+    return {"type": "pandas.CSVDataset", "filepath": (tmp_path / "a.csv").as_posix()}
+
+
+def test_timing_is_disabled_by_default(requests_mock, entry):
+    requests_mock.register_uri("GET", TEST_URL + "/dataset/cars", json=entry)
+    UniversalCatalogDataset(url=TEST_URL, source_name="cars").save(pd.DataFrame())
+    assert get_timings() == {}
+
+
+def test_phases_are_timed(requests_mock, entry, caplog):
+    configure_timing()
+    caplog.set_level(logging.DEBUG, logger="universal_catalog.core.datasets.timing")
+    requests_mock.register_uri("GET", TEST_URL + "/dataset/cars", json=entry)
+    dataset = UniversalCatalogDataset(url=TEST_URL, source_name="cars")
+    dataset.save(pd.DataFrame({"a": [1]}))
+    dataset.load()
+    dataset.load()
+    # Resolved again by another dataset, from the resolution cache
+    UniversalCatalogDataset(url=TEST_URL, source_name="cars")._describe()
+
+    timings = get_timings()["cars"]
+    assert timings["calls"] == {"fetch": 2, "from_config": 2, "load": 2, "save": 1}
+    assert timings["sources"] == {"server": 1, "memory": 1}
+    assert timings["bytes_received"] == len(json.dumps(entry))
+    assert timings["total"] == pytest.approx(sum(timings["durations"].values()))
+
+    record = next(r for r in caplog.records if getattr(r, "phase", None) == "load")
+    assert record.dataset == "cars"
+    assert record.duration > 0
+
+
+def test_waits_on_another_fetch_are_shared(local_server, entry):
+    configure_timing()
+    local_server.responses = [(200, entry, 0.2)]
+    datasets = [
+        UniversalCatalogDataset(url=local_server.url, source_name="cars")
+        for _ in range(4)
+    ]
+    with ThreadPoolExecutor(4) as executor:
+        list(executor.map(lambda dataset: dataset._describe(), datasets))
+    assert local_server.hits == 1
+    assert get_timings()["cars"]["sources"] == {"server": 1, "shared": 3}
+
+
+def test_entries_from_disk_and_prefetch(requests_mock, entry, tmp_path):
+    configure_timing()
+    configure_cache(path=tmp_path / "entries.sqlite", ttl=60)
+    requests_mock.register_uri(
+        TEST_METHOD, TEST_URL + "/datasets/", json={"boats": entry}
+    )
+    requests_mock.register_uri("GET", TEST_URL + "/dataset/cars", json=entry)
+    requests_mock.register_uri("GET", TEST_URL + "version/", json={"version": "v1"})
+    UniversalCatalogDataset(url=TEST_URL, source_name="cars")._describe()
+    # A new process would only find the entry in the on-disk cache
+    configure_resolution()
+    UniversalCatalogDataset(url=TEST_URL, source_name="cars")._describe()
+    catalog = DataCatalog(
+        datasets={"boats": UniversalCatalogDataset(url=TEST_URL, source_name="boats")}
+    )
+    prefetch_datasets(catalog)
+
+    timings = get_timings()
+    assert timings["cars"]["sources"] == {"server": 1, "disk": 1}
+    assert timings["boats"]["sources"] == {"prefetch": 1}
+    assert timings["boats"]["calls"]["from_config"] == 1
+
+
+def test_timing_summary():
+    assert timing_summary() == "No remote dataset was timed"
+    configure_timing()
+    record("fast", "load", 0.1)
+    record("slow", "load", 2.0)
+    record("slowest", "fetch", 3.0)
+    summary = timing_summary(limit=2).splitlines()
+    assert summary[0] == "Slowest remote datasets (2 of 3):"
+    assert summary[2].startswith("slowest ")
+    assert summary[3].startswith("slow ")
+    assert len(summary) == 4
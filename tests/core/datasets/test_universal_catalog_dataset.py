@@ -1,12 +1,20 @@
+import pickle
+
 from pathlib import PurePosixPath
 
+import msgpack
 import pytest
 import requests
 import pandas as pd
 from pandas.testing import assert_frame_equal
 
+from kedro.io import DataCatalog, MemoryDataset
 from kedro.io.core import DatasetError
+from kedro.pipeline import Pipeline, node
+from kedro.runner import ParallelRunner
 
+from universal_catalog.core.datasets.prefetch import prefetch_datasets
+from universal_catalog.core.datasets.resolution import configure_resolution
 from universal_catalog.core.datasets.universal_catalog_dataset import (
     UniversalCatalogDataset,
 )
@@ -16,6 +24,9 @@ TEST_METHOD = "POST"
 
 BAD_TEST_URL = "http://localhost:5001/"
 
+# Entries are asked for with the cacheable ``GET /dataset/{name}``
+ENTRY_URL = TEST_URL + "/dataset/companies"
+
 
 @pytest.fixture
 def filepath_csv(tmp_path):
@@ -49,18 +60,14 @@ def test_universal_catalog_dataset(dataset):
 def test_materialize_and_describe(
     requests_mock, dataset, catalog_context, filepath_csv
 ):
-    requests_mock.register_uri(
-        TEST_METHOD, TEST_URL + "/dataset/", text=catalog_context
-    )
+    requests_mock.register_uri("GET", ENTRY_URL, text=catalog_context)
     assert dataset._describe().get("filepath") == PurePosixPath(filepath_csv)
 
 
 def test_save_and_load(
     requests_mock, dataset, catalog_context, filepath_csv, dummy_dataframe
 ):
-    requests_mock.register_uri(
-        TEST_METHOD, TEST_URL + "/dataset/", text=catalog_context
-    )
+    requests_mock.register_uri("GET", ENTRY_URL, text=catalog_context)
     dataset.save(data=dummy_dataframe)
     loaded = dataset.load()
     assert_frame_equal(loaded, dummy_dataframe)
@@ -68,8 +75,8 @@ def test_save_and_load(
 
 def test_http_error(requests_mock, dataset):
     requests_mock.register_uri(
-        TEST_METHOD,
-        TEST_URL + "/dataset/",
+        "GET",
+        ENTRY_URL,
         text="Failed to fetch data",
         status_code=requests.codes.not_found,
     )
@@ -80,3 +87,96 @@ def test_http_error(requests_mock, dataset):
 def test_os_error(dataset):
     with pytest.raises(DatasetError):
         UniversalCatalogDataset(url=BAD_TEST_URL, source_name="companies")._describe()
+
+
+def test_materialize_from_msgpack(requests_mock, dataset, filepath_csv):
+    mock = requests_mock.register_uri(
+        "GET",
+        ENTRY_URL,
+        content=msgpack.packb({"type": "pandas.CSVDataset", "filepath": filepath_csv}),
+        headers={"Content-Type": "application/msgpack"},
+    )
+    assert dataset._describe().get("filepath") == PurePosixPath(filepath_csv)
+    assert mock.last_request.headers["Accept"].startswith("application/msgpack")
+    assert mock.last_request.qs == {}
+
+
+def test_entry_url_is_pinned_to_known_version(requests_mock, catalog_context):
+    mock = requests_mock.register_uri(
+        "GET",
+        TEST_URL + "/dataset/spain.cars%2Fraw",
+        text=catalog_context,
+        headers={"X-Catalog-Version": "v1"},
+    )
+    UniversalCatalogDataset(url=TEST_URL, source_name="spain.cars/raw")._describe()
+    assert mock.last_request.qs == {}
+
+    configure_resolution()
+    UniversalCatalogDataset(url=TEST_URL, source_name="spain.cars/raw")._describe()
+    assert mock.last_request.qs == {"version": ["v1"]}
+
+
+def test_entry_from_old_server(requests_mock, catalog_context, filepath_csv):
+    requests_mock.register_uri(
+        "GET", ENTRY_URL, status_code=404, json={"detail": "Not Found"}
+    )
+    old_route = requests_mock.register_uri(
+        TEST_METHOD, TEST_URL + "/dataset/", text=catalog_context
+    )
+    dataset = UniversalCatalogDataset(url=TEST_URL, source_name="companies")
+    assert dataset._describe().get("filepath") == PurePosixPath(filepath_csv)
+    assert old_route.last_request.json() == {"name": "companies"}
+
+
+def test_missing_entry_is_not_asked_again(requests_mock):
+    detail = {"detail": "Dataset 'companies' not found in the catalog"}
+    requests_mock.register_uri("GET", ENTRY_URL, status_code=404, json=detail)
+    with pytest.raises(DatasetError):
+        UniversalCatalogDataset(url=TEST_URL, source_name="companies")._describe()
+    assert requests_mock.call_count == 1
+
+
+def test_pickle_keeps_resolved_entry(requests_mock, dataset, catalog_context):
+    requests_mock.register_uri("GET", ENTRY_URL, text=catalog_context)
+    dataset._describe()
+    state = dataset.__getstate__()
+    assert state["_dataset"] is None
+    assert state["_config"]["type"] == "pandas.CSVDataset"
+
+    # As in a worker process, with nothing resolved yet
+    configure_resolution()
+    restored = pickle.loads(pickle.dumps(dataset))
+    assert restored._describe() == dataset._describe()
+    assert requests_mock.call_count == 1
+
+
+def test_pickle_takes_entry_from_resolution_cache(requests_mock, catalog_context):
+    requests_mock.register_uri("GET", ENTRY_URL, text=catalog_context)
+    UniversalCatalogDataset(url=TEST_URL, source_name="companies")._describe()
+    unresolved = UniversalCatalogDataset(url=TEST_URL, source_name="companies")
+    restored = pickle.loads(pickle.dumps(unresolved))
+    assert restored._config is not None
+
+    configure_resolution(enabled=False)
+    unresolved = UniversalCatalogDataset(url=TEST_URL, source_name="companies")
+    assert pickle.loads(pickle.dumps(unresolved))._config is None
+
+
+def test_parallel_runner_does_not_resolve_again(local_server, tmp_path):
+    filepath = (tmp_path / "cars.csv").as_posix()
+    pd.DataFrame({"a": [1, 2]}).to_csv(filepath, index=False)
+    entry = {"type": "pandas.CSVDataset", "filepath": filepath}
+    local_server.responses = [(200, {"cars": entry}, 0.0)]
+    catalog = DataCatalog(
+        {
+            "cars": UniversalCatalogDataset(url=local_server.url, source_name="cars"),
+            "out": MemoryDataset(),
+        }
+    )
+    prefetch_datasets(catalog)
+    pipeline = Pipeline(
+        [node(len, "cars", "n1"), node(len, "cars", "n2"), node(len, "cars", "n3")]
+    )
+    outputs = ParallelRunner(max_workers=2).run(pipeline, catalog)
+    assert outputs == {"n1": 2, "n2": 2, "n3": 2}
+    assert local_server.hits == 1
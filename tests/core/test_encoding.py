@@ -0,0 +1,60 @@
+import gzip
+import json
+
+from pathlib import PurePosixPath
+
+import pytest
+import zstandard
+
+from universal_catalog.core.encoding import (
+    JSON,
+    MSGPACK,
+    available_encodings,
+    available_media_types,
+    compress,
+    compress_stream,
+    dumps_json,
+    dumps_msgpack,
+    loads_json,
+    loads_msgpack,
+)
+
+_DECOMPRESS = {
+    "gzip": gzip.decompress,
+    "zstd": lambda data: zstandard.ZstdDecompressor().decompressobj().decompress(data),
+}
+
+
+def test_round_trip():
+    obj = {"a": [1, 2.5, None, True], "b": {"c": "é"}}
+    assert isinstance(dumps_json(obj), bytes)
+    assert loads_json(dumps_json(obj)) == obj
+
+
+def test_unknown_types_as_strings():
+    assert loads_json(dumps_json({"a": PurePosixPath("x/y")})) == {"a": "x/y"}
+
+
+def test_non_string_keys():
+    obj = {"load_args": {"dtype": {0: "str", 1.5: "int", True: None, None: 1}}}
+    expected = json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode()
+    assert dumps_json(obj) == expected
+
+
+def test_msgpack_round_trip():
+    obj = {"a": [1, 2.5, None, True], "b": {"c": "é"}}
+    assert loads_msgpack(dumps_msgpack(obj)) == obj
+
+
+@pytest.mark.parametrize("encoding", available_encodings())
+def test_compress(encoding):
+    data = b"catalog entry " * 100
+    decompress = _DECOMPRESS[encoding]
+    assert decompress(compress(data, encoding)) == data
+    stream = b"".join(compress_stream([data[:50], b"", data[50:]], encoding))
+    assert decompress(stream) == data
+
+
+def test_available_formats():
+    assert available_media_types() == (MSGPACK, JSON)
+    assert available_encodings() == ("zstd", "gzip")
@@ -0,0 +1,54 @@
+import pytest
+
+from universal_catalog.core.filters import (
+    catalog_filters,
+    literal_prefix,
+    name_matches,
+    pattern_may_match,
+)
+
+
+def test_catalog_filters():
+    assert catalog_filters() == {}
+    filters = catalog_filters(prefix="a", namespace="b")
+    assert filters == {"prefix": "a", "namespace": "b"}
+
+
+@pytest.mark.parametrize(
+    "name,filters,expected",
+    [
+        ("france.companies", {}, True),
+        ("france.companies", {"prefix": "fr"}, True),
+        ("france.companies", {"prefix": "co"}, False),
+        ("france.companies", {"namespace": "france"}, True),
+        ("francE.companies", {"namespace": "france"}, False),
+        ("franceville", {"namespace": "france"}, False),
+        ("france.companies", {"glob": "*.comp*"}, True),
+        ("france.companies", {"glob": "*.cars"}, False),
+        ("france.companies", {"prefix": "fr", "glob": "*.cars"}, False),
+    ],
+)
+def test_name_matches(name, filters, expected):
+    assert name_matches(name, **filters) is expected
+
+
+def test_literal_prefix():
+    assert literal_prefix() == ""
+    assert literal_prefix(prefix="fr") == "fr"
+    assert literal_prefix(namespace="france") == "france."
+    assert literal_prefix(glob="france.c*s") == "france.c"
+    assert literal_prefix(prefix="f", glob="[fg]rance.*") == "f"
+
+
+@pytest.mark.parametrize(
+    "pattern,filters,expected",
+    [
+        ("{name}_csv", {"prefix": "cars"}, True),
+        ("france.{name}", {"namespace": "france"}, True),
+        ("france.{name}", {"prefix": "france.co"}, True),
+        ("france.{name}", {"namespace": "spain"}, False),
+        ("{namespace}.{name}", {"glob": "*_csv"}, True),
+    ],
+)
+def test_pattern_may_match(pattern, filters, expected):
+    assert pattern_may_match(pattern, **filters) is expected
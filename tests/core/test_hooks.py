@@ -0,0 +1,43 @@
+import logging
+
+from kedro.io import DataCatalog
+
+from universal_catalog import (
+    PrefetchHooks,
+    TimingHooks,
+    UniversalCatalogDataset,
+    configure_timing,
+    get_timings,
+)
+
+from .datasets.test_universal_catalog_dataset import TEST_URL, TEST_METHOD
+
+
+def test_prefetch_hooks(requests_mock, tmp_path):
+    entry = {"type": "pandas.CSVDataset", "filepath": (tmp_path / "a.csv").as_posix()}
+    requests_mock.register_uri(
+        TEST_METHOD, TEST_URL + "/datasets/", json={"cars": entry}
+    )
+    catalog = DataCatalog(
+        datasets={"cars": UniversalCatalogDataset(url=TEST_URL, source_name="cars")}
+    )
+    PrefetchHooks().after_catalog_created(catalog)
+    assert catalog._datasets["cars"]._dataset is not None
+
+
+def test_timing_hooks(requests_mock, tmp_path, caplog):
+    entry = {"type": "pandas.CSVDataset", "filepath": (tmp_path / "a.csv").as_posix()}
+    requests_mock.register_uri("GET", TEST_URL + "/dataset/cars", json=entry)
+    hooks = TimingHooks(limit=5)
+    hooks.after_context_created()
+    try:
+        UniversalCatalogDataset(url=TEST_URL, source_name="cars")._describe()
+        caplog.set_level(logging.INFO)
+        hooks.after_pipeline_run()
+        assert "Slowest remote datasets (1 of 1)" in caplog.text
+        assert get_timings()["cars"]["calls"]["fetch"] == 1
+
+        hooks.after_context_created()
+        assert get_timings() == {}
+    finally:
+        configure_timing(False)
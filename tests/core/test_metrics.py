@@ -0,0 +1,161 @@
+import pytest
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+from kedro.io.core import DatasetNotFoundError
+
+from universal_catalog.core.metrics import (
+    Counter,
+    Histogram,
+    MetricsMiddleware,
+    _metrics,
+    configure_metrics,
+    render_metrics,
+    reset_metrics,
+)
+from universal_catalog.core.reload import CatalogReloader
+from universal_catalog.core.universal_catalog import UniversalCatalog
+
+CATALOG = {
+    "companies": {"type": "pandas.CSVDataset", "filepath": "companies.csv"},
+    "{name}_csv": {"type": "pandas.CSVDataset", "filepath": "data/{name}.csv"},
+}
+
+
+@pytest.fixture(autouse=True)
+def metrics():
+    reset_metrics()
+    yield
+    reset_metrics()
+
+
+@pytest.fixture
+def custom_metrics():
+    registered = len(_metrics)
+    yield
+    del _metrics[registered:]
+
+
+def _value(name, **labels):
+    """Return the value of a sample of the rendered metrics."""
+    prefix = name
+    if labels:
+        prefix += "{" + ",".join(f'{k}="{v}"' for k, v in labels.items()) + "}"
+    for line in render_metrics().splitlines():
+        if line.startswith(prefix + " "):
+            return float(line.rsplit(" ", 1)[1])
+    return None
+
+
+def test_render_metrics(custom_metrics):
+    counter = Counter("test_events_total", "Events.", ("kind",))
+    counter.labels('a"b').inc()
+    counter.labels('a"b').inc(2)
+    histogram = Histogram("test_seconds", "Durations.", buckets=(0.1, 1))
+    histogram.observe(0.05)
+    histogram.observe(0.5)
+    histogram.observe(5)
+
+    text = render_metrics({"worker": "1"})
+    assert "# TYPE test_events_total counter" in text
+    assert 'test_events_total{kind="a\\"b",worker="1"} 3' in text
+    assert 'test_seconds_bucket{worker="1",le="0.1"} 1' in text
+    assert 'test_seconds_bucket{worker="1",le="1"} 2' in text
+    assert 'test_seconds_bucket{worker="1",le="+Inf"} 3' in text
+    assert 'test_seconds_sum{worker="1"} 5.55' in text
+    assert 'test_seconds_count{worker="1"} 3' in text
+    assert text.endswith("\n")
+
+    with pytest.raises(ValueError, match="expects labels kind"):
+        counter.labels()
+
+
+def test_lookup_metrics():
+    catalog = UniversalCatalog.from_config(CATALOG)
+    catalog.get_entry("companies")
+    catalog.entry_json("companies")
+    catalog.entry_json("cars_csv")
+    catalog.entry_version("cars_csv")
+    catalog.get_entry("cars_csv")
+    with pytest.raises(DatasetNotFoundError):
+        catalog.get_entry("companie")
+
+    assert _value("universal_catalog_lookups_total", result="explicit") == 2
+    assert _value("universal_catalog_lookups_total", result="pattern") == 2
+    assert _value("universal_catalog_lookups_total", result="not_found") == 1
+    assert _value("universal_catalog_resolution_cache_total", result="miss") == 2
+    assert _value("universal_catalog_resolution_cache_total", result="hit") == 1
+    assert _value("universal_catalog_suggestion_duration_seconds_count") == 1
+
+
+def test_lookup_metrics_disabled():
+    catalog = UniversalCatalog.from_config(CATALOG)
+    configure_metrics(False)
+    try:
+        catalog.entry_json("companies")
+        catalog.get_entry("cars_csv")
+        with pytest.raises(DatasetNotFoundError):
+            catalog.get_entry("companie")
+    finally:
+        configure_metrics()
+
+    assert _value("universal_catalog_lookups_total", result="explicit") == 0
+    assert _value("universal_catalog_lookups_total", result="pattern") == 0
+    assert _value("universal_catalog_lookups_total", result="not_found") == 0
+    assert _value("universal_catalog_resolution_cache_total", result="miss") == 0
+    assert _value("universal_catalog_suggestion_duration_seconds_count") == 0
+
+
+def test_reload_metrics(tmp_path):
+    (tmp_path / "base").mkdir()
+    catalog_file = tmp_path / "base" / "catalog.yml"
+    catalog_file.write_text("companies:\n  type: pandas.CSVDataset\n  filepath: a\n")
+    reloader = CatalogReloader({"path": tmp_path})
+    assert _value("universal_catalog_entries") == 1
+    assert _value("universal_catalog_load_duration_seconds", phase="total") > 0
+
+    assert reloader.reload()
+    catalog_file.write_text("companies: [")
+    assert not reloader.reload()
+    assert _value("universal_catalog_reloads_total", result="success") == 1
+    assert _value("universal_catalog_reloads_total", result="failure") == 1
+    assert _value("universal_catalog_reload_duration_seconds_count") == 1
+
+
+def test_metrics_middleware():
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+
+    @app.exception_handler(DatasetNotFoundError)
+    async def not_found(request: Request, exc: DatasetNotFoundError):
+        return JSONResponse(status_code=404, content={"detail": str(exc)})
+
+    @app.get("/items/{name}")
+    async def get_item(name: str):
+        if name == "missing":
+            raise DatasetNotFoundError(name)
+        return {"name": name}
+
+    client = TestClient(app)
+    client.get("/items/a")
+    client.get("/items/b")
+    client.get("/items/missing")
+    client.get("/nowhere")
+
+    endpoint = {"method": "GET", "endpoint": "/items/{name}"}
+    assert _value("universal_catalog_requests_total", **endpoint, status=200) == 2
+    assert _value("universal_catalog_requests_total", **endpoint, status=404) == 1
+    assert (
+        _value(
+            "universal_catalog_requests_total",
+            method="GET",
+            endpoint="other",
+            status=404,
+        )
+        == 1
+    )
+    assert _value("universal_catalog_request_duration_seconds_count", **endpoint) == 3
+    # Two ``{"name":"a"}`` bodies and the error detail
+    size = _value("universal_catalog_response_size_bytes_sum", **endpoint)
+    assert size == 2 * len(b'{"name":"a"}') + len(b'{"detail":"missing"}')
@@ -0,0 +1,82 @@
+import pytest
+from kedro.io.core import DatasetError
+from kedro.io.data_catalog import DataCatalog
+from parse import parse
+
+from universal_catalog.core.patterns import PatternIndex, resolve_config
+
+PATTERNS = DataCatalog._sort_patterns(
+    dict.fromkeys(
+        [
+            "{namespace}.{dataset}",
+            "{namespace}.companies",
+            "france.{dataset}",
+            "France.{layer}_{dataset}",
+            "{dataset}_csv",
+            "raw_{name}",
+            "raw_{name}_csv",
+            "{{literal}}_{name}",
+            "é_{name}",
+            "{default}",
+        ]
+    )
+)
+
+NAMES = [
+    "france.companies",
+    "FRANCE.raw_shuttles",
+    "italy.companies",
+    "italy.boats",
+    "raw_cars",
+    "RAW_cars_csv",
+    "boats_csv",
+    "{literal}_cars",
+    "É_cars",
+    "é_cars",
+    "cars",
+    "",
+]
+
+
+@pytest.fixture
+def index():
+    return PatternIndex(PATTERNS)
+
+
+def test_len(index):
+    assert len(index) == len(PATTERNS)
+
+
+@pytest.mark.parametrize("name", NAMES)
+def test_same_match_as_data_catalog(index, name):
+    match = index.match(name)
+    expected = DataCatalog._match_pattern(PATTERNS, name)
+    assert (match[0] if match else None) == expected
+
+
+def test_no_match():
+    assert PatternIndex(["raw_{name}"]).match("cars") is None
+
+
+def test_resolve_config():
+    config = {
+        "type": "pandas.CSVDataset",
+        "filepath": "data/{namespace}/{dataset}.csv",
+        "load_args": {"usecols": ["{dataset}", 1]},
+        "versioned": True,
+    }
+    pattern = "{namespace}.{dataset}"
+    resolved = resolve_config(config, pattern, parse(pattern, "france.companies"))
+    assert resolved == {
+        "type": "pandas.CSVDataset",
+        "filepath": "data/france/companies.csv",
+        "load_args": {"usecols": ["companies", 1]},
+        "versioned": True,
+    }
+    assert config["filepath"] == "data/{namespace}/{dataset}.csv"
+
+
+def test_resolve_config_unknown_key():
+    pattern = "{namespace}.{dataset}"
+    with pytest.raises(DatasetError, match="Unable to resolve"):
+        resolve_config("{layer}", pattern, parse(pattern, "france.companies"))
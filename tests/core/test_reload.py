@@ -0,0 +1,135 @@
+import json
+import os
+
+import pytest
+
+from universal_catalog.core.reload import CatalogReloader, SnapshotReloader
+from universal_catalog.core.validation import CatalogValidator
+
+CATALOG_CONTEXT = """
+companies:
+  type: pandas.CSVDataset
+  filepath: data/01_raw/companies.csv
+"""
+
+UPDATED_CATALOG_CONTEXT = (
+    CATALOG_CONTEXT
+    + """
+shuttles:
+  type: pandas.CSVDataset
+  filepath: data/01_raw/shuttles.csv
+"""
+)
+
+
+@pytest.fixture
+def catalog_file(tmp_path):
+    tmp_dir = tmp_path / "base"
+    tmp_dir.mkdir()
+    catalog_file = tmp_dir / "catalog.yml"
+    catalog_file.write_text(CATALOG_CONTEXT)
+    return catalog_file
+
+
+@pytest.fixture
+def reloader(tmp_path, catalog_file):
+    reloader = CatalogReloader({"path": tmp_path}, interval=0.01)
+    yield reloader
+    reloader.stop()
+
+
+def _write(path, text):
+    stat = path.stat()
+    path.write_text(text)
+    # Make sure the change is seen on file systems with coarse timestamps
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_check_without_change(reloader):
+    catalog = reloader.catalog
+    assert not reloader.check()
+    assert reloader.catalog is catalog
+
+
+def test_check_with_change(reloader, catalog_file):
+    catalog = reloader.catalog
+    _write(catalog_file, UPDATED_CATALOG_CONTEXT)
+    assert reloader.check()
+    assert reloader.catalog is not catalog
+    assert reloader.catalog.get_entry("shuttles")
+    assert reloader.last_reload_duration is not None
+
+
+def test_failed_reload_keeps_catalog(reloader, catalog_file):
+    catalog = reloader.catalog
+    _write(catalog_file, "shuttles:\n  type: NotADataset\n")
+    assert not reloader.check()
+    assert reloader.catalog is catalog
+    assert reloader.last_error is not None
+    # The broken file is not loaded again until it changes
+    assert not reloader.check()
+
+
+def test_missing_file_keeps_catalog(reloader, catalog_file):
+    catalog = reloader.catalog
+    catalog_file.unlink()
+    assert not reloader.check()
+    assert reloader.catalog is catalog
+
+
+def test_watch(reloader, catalog_file):
+    reloader.start()
+    reloader.start()
+    _write(catalog_file, UPDATED_CATALOG_CONTEXT)
+    for _ in range(500):
+        if "shuttles" in reloader.catalog.get_catalog():
+            break
+        reloader._stop.wait(0.01)
+    assert "shuttles" in reloader.catalog.get_catalog()
+
+
+def test_validator(tmp_path, catalog_file):
+    validator = CatalogValidator(cache_path=tmp_path / "validation.json")
+    reloader = CatalogReloader({"path": tmp_path}, validator=validator)
+    assert reloader.catalog.validation_report is validator.last_report
+    assert (tmp_path / "validation.json").is_file()
+
+
+def test_changes_json(reloader, catalog_file):
+    version = reloader.catalog.version
+    assert json.loads(reloader.changes_json(version))["changed"] == {}
+
+    _write(catalog_file, UPDATED_CATALOG_CONTEXT)
+    assert reloader.check()
+    changes = json.loads(reloader.changes_json(version))
+    assert list(changes["changed"]) == ["shuttles"]
+    assert changes["version"] == reloader.catalog.version
+    assert json.loads(reloader.changes_json("unknown"))["full"]
+
+
+def test_history_is_bounded(tmp_path, catalog_file):
+    reloader = CatalogReloader({"path": tmp_path}, history_size=1)
+    version = reloader.catalog.version
+    _write(catalog_file, UPDATED_CATALOG_CONTEXT)
+    assert reloader.check()
+    assert json.loads(reloader.changes_json(version))["full"]
+
+
+def test_snapshot_reloader(tmp_path, catalog_file):
+    snapshot_path = tmp_path / "catalog.snapshot"
+    primary = CatalogReloader({"path": tmp_path}, snapshot_path=snapshot_path)
+    worker = SnapshotReloader(snapshot_path)
+    # Both are set up by the same constructor
+    assert vars(worker).keys() == vars(primary).keys()
+    assert worker.catalog.version == primary.catalog.version
+    assert worker.catalog.catalog_json() == primary.catalog.catalog_json()
+    assert not worker.check()
+
+    version = worker.catalog.version
+    _write(catalog_file, UPDATED_CATALOG_CONTEXT)
+    assert primary.check()
+    stat = snapshot_path.stat()
+    os.utime(snapshot_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert worker.check()
+    assert worker.catalog.version == primary.catalog.version
+    assert list(json.loads(worker.changes_json(version))["changed"]) == ["shuttles"]
@@ -1,6 +1,28 @@
 import pytest
+import gzip
+import json
+import socket
 
-from universal_catalog.core.serving import load_server_settings
+from typing import Optional
+
+import msgpack
+import zstandard
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from universal_catalog.core.serving import (
+    IMMUTABLE,
+    cache_control_header,
+    catalog_response,
+    encoded_response,
+    etag_response,
+    load_server_settings,
+    negotiate_encoding,
+    negotiate_media_type,
+    remove_stale_socket,
+)
+from universal_catalog.core.universal_catalog import UniversalCatalog
 
 
 SETTINGS_CONTEXT = """
@@ -22,3 +44,252 @@ def test_load_server_settings(tmp_settings):
     server_settings = load_server_settings(tmp_settings)
     assert server_settings["host"] == "127.0.0.1"
     assert server_settings["port"] == 8000
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+
+    @app.get("/json")
+    async def json_route(request: Request):
+        return etag_response(request, "abc", {"a": 1}, catalog_version="v1")
+
+    @app.get("/large")
+    async def large_route(request: Request):
+        return etag_response(request, "large", {"a": "b" * 1000})
+
+    @app.get("/text")
+    async def text_route(request: Request):
+        return etag_response(request, "abc", "a: 1\n", media_type="text/plain")
+
+    return TestClient(app)
+
+
+def test_etag_response(client):
+    response = client.get("/json")
+    assert response.status_code == 200
+    assert response.json() == {"a": 1}
+    assert response.headers["etag"] == '"abc"'
+    assert response.headers["x-catalog-version"] == "v1"
+
+    response = client.get("/text")
+    assert response.text == "a: 1\n"
+    assert "x-catalog-version" not in response.headers
+
+
+@pytest.mark.parametrize("if_none_match", ['"abc"', 'W/"abc"', '"xyz", "abc"', "*"])
+def test_etag_response_not_modified(client, if_none_match):
+    response = client.get("/json", headers={"If-None-Match": if_none_match})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == '"abc"'
+
+
+def test_etag_response_modified(client):
+    response = client.get("/json", headers={"If-None-Match": '"xyz"'})
+    assert response.status_code == 200
+
+
+@pytest.fixture
+def catalog_client():
+    entry = {"type": "pandas.CSVDataset", "filepath": "data.csv"}
+    catalog = UniversalCatalog.from_config(
+        {name: entry for name in ["france.cars", "spain.cars", "spain.companies"]}
+    )
+    app = FastAPI()
+
+    @app.get("/catalog/")
+    async def catalog_route(
+        request: Request,
+        namespace: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: Optional[int] = None,
+        version: Optional[str] = None,
+    ):
+        return catalog_response(
+            request,
+            catalog,
+            namespace=namespace,
+            cursor=cursor,
+            limit=limit,
+            cache_control=cache_control_header(catalog.version, version),
+        )
+
+    return TestClient(app)
+
+
+def test_catalog_response(catalog_client):
+    response = catalog_client.get("/catalog/")
+    assert list(response.json()) == ["france.cars", "spain.cars", "spain.companies"]
+    assert "x-next-cursor" not in response.headers
+
+    response = catalog_client.get("/catalog/", params={"namespace": "spain"})
+    assert list(response.json()) == ["spain.cars", "spain.companies"]
+    etag = response.headers["etag"]
+    response = catalog_client.get(
+        "/catalog/", params={"namespace": "spain"}, headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 304
+
+
+def test_cache_control_header():
+    assert cache_control_header("v1", None, max_age=10) == "public, max-age=10"
+    assert cache_control_header("v1", "v1") == IMMUTABLE
+    assert cache_control_header("v1", "v0") == "no-cache"
+
+
+def test_catalog_response_cache_control(catalog_client):
+    response = catalog_client.get("/catalog/")
+    assert response.headers["cache-control"] == "public, max-age=5"
+    assert response.headers["vary"] == "Accept, Accept-Encoding"
+    version = response.headers["x-catalog-version"]
+
+    response = catalog_client.get("/catalog/", params={"version": version})
+    assert response.headers["cache-control"] == IMMUTABLE
+    etag = response.headers["etag"]
+    response = catalog_client.get(
+        "/catalog/", params={"version": version}, headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 304
+    assert response.headers["cache-control"] == IMMUTABLE
+
+    response = catalog_client.get(
+        "/catalog/", params={"version": "old", "namespace": "spain"}
+    )
+    assert list(response.json()) == ["spain.cars", "spain.companies"]
+    assert response.headers["cache-control"] == "no-cache"
+
+
+def test_catalog_response_pages(catalog_client):
+    response = catalog_client.get("/catalog/", params={"limit": 2})
+    assert list(response.json()) == ["france.cars", "spain.cars"]
+    cursor = response.headers["x-next-cursor"]
+    response = catalog_client.get("/catalog/", params={"limit": 2, "cursor": cursor})
+    assert list(response.json()) == ["spain.companies"]
+    assert "x-next-cursor" not in response.headers
+
+
+def test_catalog_response_ndjson(catalog_client):
+    response = catalog_client.get(
+        "/catalog/",
+        params={"namespace": "spain"},
+        headers={"Accept": "application/x-ndjson"},
+    )
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["name"] for line in lines] == ["spain.cars", "spain.companies"]
+    assert lines[0]["config"]["filepath"] == "data.csv"
+
+
+def _request(**headers):
+    scope = {
+        "type": "http",
+        "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+    }
+    return Request(scope)
+
+
+@pytest.mark.parametrize(
+    "accept,expected",
+    [
+        (None, "application/json"),
+        ("application/json", "application/json"),
+        ("application/msgpack", "application/msgpack"),
+        ("application/msgpack, application/json", "application/msgpack"),
+        ("application/msgpack;q=0.5, application/json", "application/json"),
+        ("application/msgpack;q=bad, */*", "application/json"),
+    ],
+)
+def test_negotiate_media_type(accept, expected):
+    headers = {"Accept": accept} if accept else {}
+    assert negotiate_media_type(_request(**headers), "application/json") == expected
+    assert negotiate_media_type(_request(**headers), "text/plain") == "text/plain"
+
+
+@pytest.mark.parametrize(
+    "accept_encoding,expected",
+    [
+        (None, None),
+        ("identity", None),
+        ("gzip, deflate", "gzip"),
+        ("gzip, zstd", "zstd"),
+        ("gzip, zstd;q=0.5", "gzip"),
+        ("*", "zstd"),
+        ("gzip;q=0, ,", None),
+    ],
+)
+def test_negotiate_encoding(accept_encoding, expected):
+    headers = {"Accept-Encoding": accept_encoding} if accept_encoding else {}
+    assert negotiate_encoding(_request(**headers)) == expected
+
+
+@pytest.mark.parametrize(
+    "encoding,decompress",
+    [
+        ("gzip", gzip.decompress),
+        ("zstd", lambda data: zstandard.ZstdDecompressor().decompress(data)),
+    ],
+)
+def test_etag_response_compressed(client, encoding, decompress):
+    stream = client.stream("GET", "/large", headers={"Accept-Encoding": encoding})
+    with stream as response:
+        body = b"".join(response.iter_raw())
+    assert response.headers["content-encoding"] == encoding
+    assert response.headers["etag"] == f'"large-{encoding}"'
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert json.loads(decompress(body)) == {"a": "b" * 1000}
+
+    response = client.get(
+        "/large",
+        headers={"Accept-Encoding": encoding, "If-None-Match": f'"large-{encoding}"'},
+    )
+    assert response.status_code == 304
+
+
+def test_etag_response_msgpack(client):
+    headers = {"Accept": "application/msgpack", "Accept-Encoding": "identity"}
+    for _ in range(2):
+        response = client.get("/large", headers=headers)
+        assert response.headers["content-type"] == "application/msgpack"
+        assert response.headers["etag"] == '"large-msgpack"'
+        assert msgpack.unpackb(response.content) == {"a": "b" * 1000}
+
+
+def test_encoded_response_small_content():
+    response = encoded_response(_request(**{"Accept-Encoding": "gzip"}), "{}")
+    assert "content-encoding" not in response.headers
+    assert response.body == b"{}"
+
+
+def test_catalog_response_ndjson_compressed(catalog_client):
+    stream = catalog_client.stream(
+        "GET",
+        "/catalog/",
+        headers={"Accept": "application/x-ndjson", "Accept-Encoding": "gzip"},
+    )
+    with stream as response:
+        body = b"".join(response.iter_raw())
+    assert response.headers["content-encoding"] == "gzip"
+    lines = gzip.decompress(body).splitlines()
+    assert [json.loads(line)["name"] for line in lines] == [
+        "france.cars",
+        "spain.cars",
+        "spain.companies",
+    ]
+
+
+def test_remove_stale_socket(tmp_path):
+    path = tmp_path / "catalog.sock"
+    remove_stale_socket(path)
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+        server.bind(str(path))
+        server.listen()
+        with pytest.raises(OSError, match="already listening"):
+            remove_stale_socket(path)
+    remove_stale_socket(path)
+    assert not path.exists()
+
+    path.write_text("")
+    with pytest.raises(OSError, match="is not a socket"):
+        remove_stale_socket(path)
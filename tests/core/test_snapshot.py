@@ -0,0 +1,157 @@
+import json
+import os
+import stat
+
+import pytest
+
+from kedro.io.core import DatasetNotFoundError
+
+from universal_catalog.core import suggestions
+from universal_catalog.core.snapshot import (
+    SNAPSHOT_FORMAT,
+    CatalogSnapshot,
+    write_snapshot,
+)
+from universal_catalog.core.universal_catalog import UniversalCatalog
+
+ENTRY = {"type": "pandas.CSVDataset", "filepath": "data.csv"}
+
+CATALOG = {
+    "france.cars": ENTRY,
+    "france.companies": {**ENTRY, "load_args": {"sep": ";"}},
+    "spain.cars": ENTRY,
+    "france.{name}_csv": {"type": "pandas.CSVDataset", "filepath": "{name}.csv"},
+    "{default}": {"type": "pandas.ParquetDataset", "filepath": "{default}.pq"},
+}
+
+
+@pytest.fixture
+def catalog():
+    return UniversalCatalog.from_config(CATALOG)
+
+
+@pytest.fixture
+def mapped(catalog, tmp_path):
+    path = write_snapshot(catalog, tmp_path / "cache" / "catalog.snapshot")
+    return UniversalCatalog.from_snapshot(path)
+
+
+def test_snapshot_round_trip(catalog, mapped):
+    assert mapped.version == catalog.version
+    assert mapped._entry_versions == catalog._entry_versions
+    assert mapped.catalog_json() == catalog.catalog_json()
+    assert mapped.config_string() == catalog.config_string()
+    assert dict(mapped.get_catalog()) == CATALOG
+    for name in CATALOG:
+        assert mapped.entry_json(name) == catalog.entry_json(name)
+        assert mapped.entry_version(name) == catalog.entry_version(name)
+
+
+def test_snapshot_lookups(catalog, mapped):
+    assert mapped.get_entry("france.boats_csv") == {
+        "type": "pandas.CSVDataset",
+        "filepath": "boats.csv",
+    }
+    assert mapped.get_entry("planes")["filepath"] == "planes.pq"
+    assert mapped.select(namespace="france") == catalog.select(namespace="france")
+    assert mapped.entries_json(["spain.cars"]) == catalog.entries_json(["spain.cars"])
+    assert mapped.changes_json("v0", None) == catalog.changes_json("v0", None)
+
+    empty = UniversalCatalog.from_config({"spain.cars": ENTRY})
+    with pytest.raises(DatasetNotFoundError, match="did you mean"):
+        UniversalCatalog.from_snapshot(
+            write_snapshot(empty, mapped._snapshot.path)
+        ).get_entry("spain.car")
+
+
+def test_snapshot_indexes_are_mapped(tmp_path, monkeypatch):
+    names = [
+        f"{country}.{kind}_{index}"
+        for country in ("france", "spain", "été")
+        for kind in ("cars", "boats")
+        for index in range(30)
+    ]
+    catalog = UniversalCatalog.from_config(
+        {**{name: ENTRY for name in names}, **CATALOG}
+    )
+    path = write_snapshot(catalog, tmp_path / "catalog.snapshot")
+
+    def no_trigrams(name):
+        raise AssertionError("indexes are built again")
+
+    monkeypatch.setattr(suggestions, "_trigrams", no_trigrams)
+    mapped = UniversalCatalog.from_snapshot(path)
+    assert list(mapped._sorted_names) == catalog._sorted_names
+    assert mapped._pattern_names == catalog._pattern_names
+    assert mapped._pattern_index.buckets == catalog._pattern_index.buckets
+    assert mapped.select(prefix="spain.", cursor="spain.boats_3", limit=5) == (
+        catalog.select(prefix="spain.", cursor="spain.boats_3", limit=5)
+    )
+    monkeypatch.undo()
+    for word in ["spain.bots_12", "ete.cars_1", "été.cars_99", "x"]:
+        assert mapped._suggestions.suggest(word, budget=1) == (
+            catalog._suggestions.suggest(word, budget=1)
+        )
+    assert {
+        gram: list(positions)
+        for gram, positions in mapped._suggestions.postings.items()
+    } == dict(catalog._suggestions.postings)
+
+    # Snapshots can be written from a mapped catalog too
+    again = write_snapshot(mapped, tmp_path / "again.snapshot")
+    assert again.read_bytes() == path.read_bytes()
+
+
+def test_snapshot_summary(mapped):
+    summary = mapped.startup_summary()
+    assert summary.startswith("Loaded 5 catalog entries from snapshot")
+    assert mapped.load_timings["validate"] == 0.0
+
+
+def test_snapshot_is_replaced_atomically(catalog, mapped, tmp_path):
+    path = mapped._snapshot.path
+    write_snapshot(UniversalCatalog.from_config({"spain.cars": ENTRY}), path)
+    # The previous mapping is still readable once the file is replaced
+    assert json.loads(mapped.entry_json("france.companies"))["load_args"] == {
+        "sep": ";"
+    }
+    assert UniversalCatalog.from_snapshot(path).get_catalog().keys() == {"spain.cars"}
+    assert [file.name for file in path.parent.iterdir()] == ["catalog.snapshot"]
+
+
+def test_snapshot_mode_follows_umask(catalog, tmp_path):
+    mask = os.umask(0o027)
+    try:
+        path = write_snapshot(catalog, tmp_path / "catalog.snapshot")
+    finally:
+        os.umask(mask)
+    assert stat.S_IMODE(path.stat().st_mode) == 0o640
+
+
+def test_failed_write_leaves_no_file(catalog, tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        "universal_catalog.core.snapshot.os.replace",
+        lambda *args: (_ for _ in ()).throw(OSError("disk full")),
+    )
+    with pytest.raises(OSError, match="disk full"):
+        write_snapshot(catalog, tmp_path / "catalog.snapshot")
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_invalid_snapshots(catalog, tmp_path):
+    path = tmp_path / "catalog.snapshot"
+    path.write_bytes(b"UC")
+    with pytest.raises(ValueError, match="is not a catalog snapshot"):
+        CatalogSnapshot(path)
+    path.write_bytes(b"x" * 64)
+    with pytest.raises(ValueError, match="is not a catalog snapshot"):
+        CatalogSnapshot(path)
+
+    write_snapshot(catalog, path)
+    data = bytearray(path.read_bytes())
+    data[6] = 99
+    path.write_bytes(bytes(data))
+    with pytest.raises(
+        ValueError, match=f"snapshot format 99, expected {SNAPSHOT_FORMAT}"
+    ):
+        CatalogSnapshot(path)
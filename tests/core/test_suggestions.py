@@ -0,0 +1,46 @@
+import difflib
+
+import pytest
+
+from universal_catalog.core.suggestions import SuggestionIndex
+
+NAMES = [
+    "companies",
+    "companies_raw",
+    "shuttles",
+    "reviews",
+    "model_input_table",
+    "regressor",
+    "a",
+    "{name}_csv",
+]
+
+
+@pytest.fixture
+def index():
+    return SuggestionIndex(NAMES)
+
+
+@pytest.mark.parametrize(
+    "word", ["companie", "compnies", "shutles", "review", "model_input", "b", "x"]
+)
+def test_same_suggestions_as_difflib(index, word):
+    assert index.suggest(word) == difflib.get_close_matches(word, NAMES)
+
+
+def test_limits(index):
+    assert index.suggest("companie", n=1) == ["companies"]
+    assert index.suggest("companie", cutoff=0.99) == []
+
+
+def test_budget(index):
+    # Once the budget is spent only the first candidate has been scored
+    assert len(index.suggest("companie", budget=-1)) <= 1
+
+
+def test_large_catalog():
+    names = [f"layer_{i}.dataset_{i}" for i in range(20000)]
+    index = SuggestionIndex(names)
+    assert index.suggest("layer_1234.datset_1234", budget=1)[0] == (
+        "layer_1234.dataset_1234"
+    )
@@ -1,8 +1,16 @@
+import json
+import logging
+
 import pytest
 import yaml
 
-from universal_catalog.core.universal_catalog import load_catalog, UniversalCatalog
-from kedro.io.core import DatasetNotFoundError
+from universal_catalog.core.snapshot import write_snapshot
+from universal_catalog.core.universal_catalog import (
+    load_catalog,
+    snapshot_file,
+    UniversalCatalog,
+)
+from kedro.io.core import AbstractDataset, DatasetNotFoundError
 
 
 CATALOG_CONTEXT = """
@@ -50,3 +58,261 @@ def test_get_catalog(tmp_catalog: UniversalCatalog):
     catalog = tmp_catalog.get_catalog()
     catalog_dict = yaml.safe_load(CATALOG_CONTEXT)
     assert catalog_dict == catalog
+
+
+def test_get_entries(tmp_catalog: UniversalCatalog):
+    entries = tmp_catalog.get_entries(["companies", "companie"])
+    assert entries["companies"]["type"] == "pandas.CSVDataset"
+    assert entries["companie"] is None
+
+
+def test_version(tmp_catalog: UniversalCatalog):
+    assert (
+        tmp_catalog.version
+        == UniversalCatalog.from_config(yaml.safe_load(CATALOG_CONTEXT)).version
+    )
+    assert tmp_catalog.version != UniversalCatalog.from_config({}).version
+
+
+def test_entry_version(tmp_catalog: UniversalCatalog):
+    version = tmp_catalog.entry_version("companies")
+    assert version == UniversalCatalog.from_config(
+        {"companies": tmp_catalog.get_entry("companies")}
+    ).entry_version("companies")
+    with pytest.raises(DatasetNotFoundError):
+        tmp_catalog.entry_version("companie")
+
+
+def test_catalog_json(tmp_catalog: UniversalCatalog):
+    assert json.loads(tmp_catalog.catalog_json()) == yaml.safe_load(CATALOG_CONTEXT)
+
+
+def test_entry_json(tmp_catalog: UniversalCatalog):
+    entry = json.loads(tmp_catalog.entry_json("companies"))
+    assert entry == tmp_catalog.get_entry("companies")
+    with pytest.raises(DatasetNotFoundError):
+        tmp_catalog.entry_json("companie")
+
+
+def test_entries_json(tmp_catalog: UniversalCatalog):
+    entries = json.loads(tmp_catalog.entries_json(["companies", "companie"]))
+    assert entries == tmp_catalog.get_entries(["companies", "companie"])
+
+
+PATTERN_CATALOG = {
+    "companies": {"type": "pandas.CSVDataset", "filepath": "companies.csv"},
+    "{name}_csv": {"type": "pandas.CSVDataset", "filepath": "data/{name}.csv"},
+    "{default}": {"type": "pandas.ParquetDataset", "filepath": "data/{default}.pq"},
+}
+
+
+@pytest.fixture
+def pattern_catalog():
+    return UniversalCatalog.from_config(PATTERN_CATALOG, resolution_cache_size=2)
+
+
+def test_get_entry_from_pattern(pattern_catalog: UniversalCatalog):
+    entry = pattern_catalog.get_entry("cars_csv")
+    assert entry == {"type": "pandas.CSVDataset", "filepath": "data/cars.csv"}
+    assert pattern_catalog.get_entry("cars_csv") is entry
+    assert pattern_catalog.get_entry("companies") == PATTERN_CATALOG["companies"]
+
+
+def test_get_entry_from_default_pattern(pattern_catalog: UniversalCatalog, caplog):
+    entry = pattern_catalog.get_entry("boats")
+    assert entry["filepath"] == "data/boats.pq"
+    assert "override the default dataset creation for 'boats'" in caplog.text
+
+
+def test_resolution_cache_is_bounded(pattern_catalog: UniversalCatalog):
+    for name in ["a_csv", "b_csv", "c_csv"]:
+        pattern_catalog.get_entry(name)
+    assert len(pattern_catalog._resolved) == 2
+    assert pattern_catalog._resolved.get("a_csv") is None
+
+
+def test_missing_entries_are_cached(tmp_catalog: UniversalCatalog):
+    with pytest.raises(DatasetNotFoundError):
+        tmp_catalog.get_entry("companie")
+    assert tmp_catalog._resolved.get("companie", "unset") is None
+    with pytest.raises(DatasetNotFoundError):
+        tmp_catalog.get_entry("companie")
+
+
+def test_pattern_entry_json(pattern_catalog: UniversalCatalog):
+    assert json.loads(pattern_catalog.entry_json("cars_csv"))["filepath"] == (
+        "data/cars.csv"
+    )
+    assert pattern_catalog.entry_version("cars_csv")
+
+
+def test_from_config_only_validates_changes(tmp_catalog: UniversalCatalog, monkeypatch):
+    validated = []
+    from_config = AbstractDataset.from_config
+
+    def spy(name, *args, **kwargs):
+        validated.append(name)
+        return from_config(name, *args, **kwargs)
+
+    monkeypatch.setattr(AbstractDataset, "from_config", spy)
+    catalog = {
+        **tmp_catalog.get_catalog(),
+        "shuttles": {"type": "pandas.CSVDataset", "filepath": "shuttles.csv"},
+    }
+    updated = UniversalCatalog.from_config(catalog, previous=tmp_catalog)
+    assert validated == ["shuttles"]
+    assert updated.get_entry("companies")
+
+
+def test_non_string_keys():
+    catalog = UniversalCatalog.from_config(
+        yaml.safe_load(
+            """
+            companies:
+              type: pandas.CSVDataset
+              filepath: companies.csv
+              load_args:
+                dtype:
+                  0: str
+            """
+        )
+    )
+    entry = json.loads(catalog.entry_json("companies"))
+    assert entry["load_args"] == {"dtype": {"0": "str"}}
+    assert json.loads(catalog.catalog_json())["companies"] == entry
+
+
+def test_startup_summary(tmp_catalog: UniversalCatalog):
+    assert set(tmp_catalog.load_timings) == {"parse", "validate", "index", "total"}
+    summary = tmp_catalog.startup_summary()
+    assert summary.startswith("Loaded 1 catalog entries in")
+    assert "Validated 1 of 1 entries" in summary
+    assert UniversalCatalog().startup_summary() == "Loaded 0 catalog entries"
+
+
+@pytest.fixture
+def namespaced_catalog():
+    entry = {"type": "pandas.CSVDataset", "filepath": "data.csv"}
+    names = ["france.cars", "france.companies", "spain.cars", "spain.companies"]
+    config = {name: entry for name in names}
+    config["france.{name}_csv"] = {"type": "pandas.CSVDataset", "filepath": "{name}"}
+    return UniversalCatalog.from_config(config)
+
+
+def test_select(namespaced_catalog: UniversalCatalog):
+    names, cursor = namespaced_catalog.select()
+    assert names == [
+        "france.{name}_csv",
+        "france.cars",
+        "france.companies",
+        "spain.cars",
+        "spain.companies",
+    ]
+    assert cursor is None
+    assert namespaced_catalog.select(namespace="france", glob="*.c*s")[0] == [
+        "france.{name}_csv",
+        "france.cars",
+        "france.companies",
+    ]
+    assert namespaced_catalog.select(namespace="spain") == (
+        ["spain.cars", "spain.companies"],
+        None,
+    )
+    assert namespaced_catalog.select(glob="*.cars")[0] == [
+        "france.{name}_csv",
+        "france.cars",
+        "spain.cars",
+    ]
+
+
+def test_select_pages(namespaced_catalog: UniversalCatalog):
+    names, cursor = namespaced_catalog.select(limit=2)
+    assert names == ["france.{name}_csv", "france.cars", "france.companies"]
+    assert cursor == "france.companies"
+    names, cursor = namespaced_catalog.select(cursor=cursor, limit=2)
+    assert names == ["spain.cars", "spain.companies"]
+    assert cursor is None
+    with pytest.raises(ValueError):
+        namespaced_catalog.select(limit=0)
+
+
+def test_subset_json(namespaced_catalog: UniversalCatalog):
+    subset = json.loads(namespaced_catalog.subset_json(["spain.cars"]))
+    assert subset == {"spain.cars": namespaced_catalog.get_entry("spain.cars")}
+    lines = list(namespaced_catalog.iter_ndjson(["spain.cars", "spain.companies"]))
+    assert [json.loads(line)["name"] for line in lines] == [
+        "spain.cars",
+        "spain.companies",
+    ]
+    assert all(line.endswith(b"\n") for line in lines)
+
+
+def test_changes_json(namespaced_catalog: UniversalCatalog):
+    since_versions = dict(namespaced_catalog._entry_versions)
+    since_versions["spain.cars"] = "old"
+    since_versions["italy.cars"] = "old"
+    del since_versions["france.cars"]
+
+    changes = json.loads(namespaced_catalog.changes_json("v1", since_versions))
+    assert changes["version"] == namespaced_catalog.version
+    assert changes["since"] == "v1"
+    assert not changes["full"]
+    assert set(changes["changed"]) == {"france.cars", "spain.cars"}
+    assert changes["removed"] == ["italy.cars"]
+
+    changes = json.loads(
+        namespaced_catalog.changes_json("v1", since_versions, namespace="spain")
+    )
+    assert list(changes["changed"]) == ["spain.cars"]
+    assert changes["removed"] == []
+    cached = namespaced_catalog.changes_json("v1", since_versions, namespace="spain")
+    assert cached is namespaced_catalog.changes_json(
+        "v1", since_versions, namespace="spain"
+    )
+
+
+def test_changes_json_from_unknown_version(namespaced_catalog: UniversalCatalog):
+    changes = json.loads(namespaced_catalog.changes_json("v0", None, prefix="spain"))
+    assert changes["full"]
+    assert list(changes["changed"]) == ["spain.cars", "spain.companies"]
+
+
+def test_load_catalog_from_snapshot(tmp_settings, tmp_catalog, caplog):
+    caplog.set_level(logging.INFO)
+    write_snapshot(tmp_catalog, snapshot_file(tmp_settings))
+    catalog = load_catalog(tmp_settings)
+    assert catalog._snapshot is not None
+    assert catalog.version == tmp_catalog.version
+    assert catalog.source_hash == tmp_catalog.source_hash
+    assert load_catalog(tmp_settings, use_snapshot=False)._snapshot is None
+
+    (tmp_settings["path"] / "base" / "catalog.yml").write_text(
+        CATALOG_CONTEXT + "\nshuttles:\n  type: pandas.CSVDataset\n"
+        "  filepath: shuttles.csv\n"
+    )
+    catalog = load_catalog(tmp_settings)
+    assert catalog._snapshot is None
+    assert "shuttles" in catalog.get_catalog()
+    assert "is stale" in caplog.text
+
+    snapshot_file(tmp_settings).write_bytes(b"not a snapshot")
+    assert load_catalog(tmp_settings)._snapshot is None
+    assert "Ignoring the catalog snapshot" in caplog.text
+
+
+def test_load_catalog_ignores_unusable_snapshots(
+    tmp_settings, tmp_catalog, monkeypatch
+):
+    path = write_snapshot(tmp_catalog, snapshot_file(tmp_settings))
+    # Header without its fields
+    data = path.read_bytes()
+    path.write_bytes(data[:8] + (2).to_bytes(8, "little") + b"{}")
+    assert load_catalog(tmp_settings)._snapshot is None
+
+    write_snapshot(tmp_catalog, path)
+
+    def unreadable(path):
+        raise PermissionError(13, "Permission denied", str(path))
+
+    monkeypatch.setattr(UniversalCatalog, "from_snapshot", unreadable)
+    assert load_catalog(tmp_settings)._snapshot is None
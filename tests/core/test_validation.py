@@ -0,0 +1,130 @@
+import json
+
+import kedro
+import pytest
+from kedro.io.core import AbstractDataset, DatasetError, DatasetNotFoundError
+
+from universal_catalog.core.encoding import content_hash
+from universal_catalog.core.validation import CatalogValidator
+
+CATALOG = {
+    "companies": {"type": "pandas.CSVDataset", "filepath": "companies.csv"},
+    "shuttles": {"type": "pandas.ExcelDataset", "filepath": "shuttles.xlsx"},
+    "copy": {"type": "pandas.CSVDataset", "filepath": "companies.csv"},
+    "{name}_csv": {"type": "pandas.CSVDataset", "filepath": "{name}.csv"},
+}
+
+
+@pytest.fixture
+def instantiated(monkeypatch):
+    names = []
+    from_config = AbstractDataset.from_config
+
+    def spy(name, *args, **kwargs):
+        names.append(name)
+        return from_config(name, *args, **kwargs)
+
+    monkeypatch.setattr(AbstractDataset, "from_config", spy)
+    return names
+
+
+def test_validate(instantiated):
+    validator = CatalogValidator(workers=2)
+    report = validator.validate(CATALOG)
+    assert validator.last_report is report
+    assert sorted(instantiated) == ["companies", "shuttles"]
+    assert (report.entries, report.patterns) == (3, 1)
+    assert (report.validated, report.skipped) == (2, 1)
+    assert set(report.import_seconds) == {"pandas.CSVDataset", "pandas.ExcelDataset"}
+    assert report.instantiate_counts["pandas.CSVDataset"] == 1
+    assert report.slowest_types(1)[0][0] in report.import_seconds
+    assert "Validated 2 of 3 entries" in report.summary()
+    assert report.to_dict()["validated"] == 2
+
+
+def test_known_hashes(instantiated):
+    known = [content_hash(CATALOG["companies"])]
+    CatalogValidator().validate(CATALOG, known_hashes=known)
+    assert instantiated == ["shuttles"]
+
+
+def test_credentials(instantiated):
+    catalog = {
+        "companies": {
+            "type": "pandas.CSVDataset",
+            "filepath": "companies.csv",
+            "credentials": "creds",
+        }
+    }
+    with pytest.raises(DatasetError):
+        CatalogValidator().validate(catalog)
+    CatalogValidator().validate(catalog, credentials={"creds": {}})
+
+
+def test_invalid_entries():
+    catalog = {
+        "bad_type": {"type": "NotADataset"},
+        "also_bad_type": {"type": "NotADataset", "filepath": "x"},
+        "bad_args": {"type": "pandas.CSVDataset", "path": "x"},
+        "companies": CATALOG["companies"],
+    }
+    with pytest.raises(
+        DatasetError, match="Failed to validate 3 catalog entries"
+    ) as exc:
+        CatalogValidator().validate(catalog)
+    assert "'bad_args'" in str(exc.value)
+    assert "'also_bad_type'" in str(exc.value)
+
+
+def test_load_versions(instantiated):
+    CatalogValidator().validate(
+        CATALOG, load_versions={"copy": "2024-01-01T00.00.00.000Z", "x_csv": "v"}
+    )
+    assert "copy" in instantiated
+    with pytest.raises(DatasetNotFoundError, match="missing"):
+        CatalogValidator().validate(CATALOG, load_versions={"missing": "v"})
+
+
+def test_cache(tmp_path, instantiated):
+    cache_path = tmp_path / "cache" / "validation.json"
+    CatalogValidator(cache_path=cache_path).validate(CATALOG)
+    assert len(instantiated) == 2
+    report = CatalogValidator(cache_path=cache_path).validate(CATALOG)
+    assert len(instantiated) == 2
+    assert report.skipped == 3
+
+
+@pytest.mark.parametrize("package", ["kedro", "kedro_datasets"])
+def test_cache_other_package_version(tmp_path, instantiated, package):
+    import kedro_datasets
+
+    cache_path = tmp_path / "validation.json"
+    hashes = [content_hash(config) for config in CATALOG.values()]
+    versions = {
+        "kedro": kedro.__version__,
+        "kedro_datasets": kedro_datasets.__version__,
+    }
+    cache_path.write_text(
+        json.dumps({"versions": {**versions, package: "0.0.0"}, "hashes": hashes})
+    )
+    CatalogValidator(cache_path=cache_path).validate(CATALOG)
+    assert len(instantiated) == 2
+    assert json.loads(cache_path.read_text())["versions"] == versions
+
+
+def test_unreadable_cache(tmp_path, instantiated):
+    cache_path = tmp_path / "validation.json"
+    cache_path.write_text("not json")
+    CatalogValidator(cache_path=cache_path).validate(CATALOG)
+    assert len(instantiated) == 2
+
+
+def test_type_as_class():
+    from kedro_datasets.pandas import CSVDataset
+
+    report = CatalogValidator().validate(
+        {"companies": {"type": CSVDataset, "filepath": "companies.csv"}}
+    )
+    assert list(report.import_seconds) == [
+        "kedro_datasets.pandas.csv_dataset.CSVDataset"
+    ]
@@ -0,0 +1,31 @@
+import json
+
+from benchmarks import suite
+from benchmarks.catalogs import lookup_names, synthetic_catalog
+
+QUICK = ["--sizes", "20", "--patterns", "3", "--min-time", "0"]
+
+
+def test_synthetic_catalog():
+    catalog = synthetic_catalog(50, patterns=5)
+    assert len(catalog) == 55
+    names = lookup_names(50, 5, count=10)
+    assert all(name in catalog for name in names["explicit"])
+    assert not any(name in catalog for name in names["missing"])
+
+
+def test_suite(tmp_path, capsys):
+    output = tmp_path / "results.json"
+    assert suite.main([*QUICK, "--output", str(output)]) == 0
+    report = json.loads(output.read_text())
+    assert report["metadata"]["sizes"] == [20]
+    assert {"load_catalog", "get_entry.missing", "endpoint.catalog"} <= set(
+        report["results"]["20"]
+    )
+
+    report["results"]["20"]["get_entry.explicit"]["median"] /= 10
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps(report))
+    arguments = ["--output", str(output), "--compare", str(baseline)]
+    assert suite.main([*QUICK, *arguments, "--threshold", "1"]) == 1
+    assert "20/get_entry.explicit" in capsys.readouterr().out
@@ -1,4 +1,38 @@
-from .core import UniversalCatalogDataset, RemoteCatalog
+from .core import (
+    UniversalCatalogDataset,
+    RemoteCatalog,
+    configure_client,
+    get_pool_stats,
+    unix_socket_url,
+    fetch_entries,
+    afetch_entries,
+    PrefetchHooks,
+    configure_cache,
+    configure_resolution,
+    configure_replicas,
+    get_replica_stats,
+    TimingHooks,
+    configure_timing,
+    get_timings,
+    timing_summary,
+)
 
-__all__ = ["UniversalCatalogDataset", "RemoteCatalog"]
+__all__ = [
+    "UniversalCatalogDataset",
+    "RemoteCatalog",
+    "configure_client",
+    "get_pool_stats",
+    "unix_socket_url",
+    "fetch_entries",
+    "afetch_entries",
+    "PrefetchHooks",
+    "configure_cache",
+    "configure_resolution",
+    "configure_replicas",
+    "get_replica_stats",
+    "TimingHooks",
+    "configure_timing",
+    "get_timings",
+    "timing_summary",
+]
 __version__ = "0.1.1"
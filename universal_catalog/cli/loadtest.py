@@ -0,0 +1,290 @@
+from __future__ import annotations
+
+import itertools
+import random
+import threading
+import time
+
+from collections import defaultdict
+from typing import Any, Iterable
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from universal_catalog.core.datasets.session import UNIX_SCHEME, UnixSocketAdapter
+from universal_catalog.core.datasets.utils import ACCEPT, _decode_response
+from universal_catalog.core.encoding import JSON, dumps_json
+
+REQUEST_KINDS = ("dataset", "catalog", "miss")
+DEFAULT_MIX = "dataset=8,catalog=1,miss=1"
+DISTRIBUTIONS = ("zipf", "uniform")
+# Exponent of the Zipf distribution, the most requested name is asked for
+# about twice as often as the second one
+ZIPF_EXPONENT = 1.0
+PERCENTILES = (50, 95, 99)
+# Seconds after which a request is counted as failed, so that a stalled server
+# doesn't keep the clients waiting past the end of the run
+DEFAULT_TIMEOUT = 10.0
+
+_MISS_SUFFIX = "__loadtest_missing"
+
+
+def parse_mix(mix: str) -> dict[str, float]:
+    """Parse a request mix like ``dataset=8,catalog=1,miss=1`` into the
+    weight of each kind of request.
+
+    Raises:
+        ValueError: When a kind is unknown, a weight is not a positive number
+            or every weight is zero.
+    """
+    weights = {}
+    for part in filter(None, (part.strip() for part in mix.split(","))):
+        kind, _, weight = part.partition("=")
+        kind = kind.strip()
+        if kind not in REQUEST_KINDS:
+            raise ValueError(
+                f"Unknown request kind '{kind}', expected one of "
+                f"{', '.join(REQUEST_KINDS)}"
+            )
+        try:
+            weights[kind] = float(weight)
+        except ValueError:
+            raise ValueError(f"Invalid weight '{weight}' for '{kind}'") from None
+        if weights[kind] < 0:
+            raise ValueError(f"Invalid weight '{weight}' for '{kind}'")
+    if not any(weights.values()):
+        raise ValueError("At least one request kind must have a positive weight")
+    return weights
+
+
+def served_names(url: str, session: requests.Session | None = None) -> list[str]:
+    """Return the names of the explicit entries served at ``url``, dataset
+    factory patterns left out."""
+    session = session or _session(1)
+    response = session.post(
+        f"{url.rstrip('/')}/catalog/", headers={"Accept": ACCEPT}, timeout=60
+    )
+    response.raise_for_status()
+    return [name for name in _decode_response(response) if "{" not in name]
+
+
+def name_weights(names: list[str], distribution: str) -> list[float]:
+    """Return the popularity of each of ``names``: the same for all of them,
+    or following a Zipf distribution in a shuffled order, like the few hot
+    datasets of a real catalog."""
+    if distribution not in DISTRIBUTIONS:
+        raise ValueError(
+            f"Unknown distribution '{distribution}', expected one of "
+            f"{', '.join(DISTRIBUTIONS)}"
+        )
+    if distribution == "uniform":
+        return [1.0] * len(names)
+    ranks = list(range(1, len(names) + 1))
+    random.Random(0).shuffle(ranks)
+    return [1 / rank**ZIPF_EXPONENT for rank in ranks]
+
+
+class LoadTestReport:
+    """Latencies and statuses of the requests sent by ``run_loadtest``."""
+
+    def __init__(self, concurrency: int) -> None:
+        self.concurrency = concurrency
+        self.duration = 0.0
+        self.latencies: dict[str, list[float]] = defaultdict(list)
+        self.statuses: dict[str, dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self.bytes_received = 0
+
+    @property
+    def requests(self) -> int:
+        return sum(len(latencies) for latencies in self.latencies.values())
+
+    @property
+    def throughput(self) -> float:
+        return self.requests / self.duration if self.duration else 0.0
+
+    def percentiles(self, kind: str | None = None) -> dict[str, float]:
+        """Return the latency percentiles of ``kind`` requests, or of all of
+        them, in seconds."""
+        if kind is None:
+            latencies = sorted(itertools.chain(*self.latencies.values()))
+        else:
+            latencies = sorted(self.latencies.get(kind, ()))
+        if not latencies:
+            return {f"p{percentile}": 0.0 for percentile in PERCENTILES}
+        return {
+            f"p{percentile}": latencies[
+                min(len(latencies) - 1, len(latencies) * percentile // 100)
+            ]
+            for percentile in PERCENTILES
+        }
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "concurrency": self.concurrency,
+            "duration": self.duration,
+            "requests": self.requests,
+            "throughput": self.throughput,
+            "bytes_received": self.bytes_received,
+            "latency": self.percentiles(),
+            "kinds": {
+                kind: {
+                    "requests": len(latencies),
+                    "statuses": dict(self.statuses[kind]),
+                    "latency": self.percentiles(kind),
+                }
+                for kind, latencies in self.latencies.items()
+            },
+        }
+
+    def summary(self) -> str:
+        def milliseconds(percentiles: dict[str, float]) -> str:
+            return " ".join(
+                f"{name} {seconds * 1000:8.2f}ms"
+                for name, seconds in percentiles.items()
+            )
+
+        lines = [
+            f"{self.requests} requests in {self.duration:.2f}s from "
+            f"{self.concurrency} clients: {self.throughput:.1f} requests/s, "
+            f"{self.bytes_received / 1024 / 1024:.1f} MiB received",
+            f"{'all':<8} {milliseconds(self.percentiles())}",
+        ]
+        for kind in sorted(self.latencies):
+            statuses = ", ".join(
+                f"{status}: {count}"
+                for status, count in sorted(self.statuses[kind].items())
+            )
+            lines.append(
+                f"{kind:<8} {milliseconds(self.percentiles(kind))}  ({statuses})"
+            )
+        return "\n".join(lines)
+
+
+def run_loadtest(
+    url: str,
+    names: Iterable[str],
+    concurrency: int = 8,
+    duration: float = 10.0,
+    total: int | None = None,
+    mix: dict[str, float] | None = None,
+    distribution: str = "zipf",
+    seed: int | None = None,
+    timeout: float = DEFAULT_TIMEOUT,
+) -> LoadTestReport:
+    """Send requests to the server at ``url`` from ``concurrency`` threads,
+    for ``duration`` seconds or until ``total`` requests were sent.
+
+    Args:
+        url: Base url of the server.
+        names: Names requested from ``/dataset/``, repeated names being asked
+            for more often. Misses ask for these names with a suffix.
+        concurrency: Number of clients sending requests at the same time,
+            each waiting for its response before sending the next request.
+        duration: Seconds during which requests are sent.
+        total: Number of requests sent, overriding ``duration``.
+        mix: Weight of each kind of request, ``dataset``, ``catalog`` and
+            ``miss``, see ``parse_mix``.
+        distribution: Popularity of distinct names, ``zipf`` or ``uniform``.
+        seed: Seed of the random choices, for reproducible runs.
+        timeout: Seconds to wait for a connection and for each response,
+            requests timing out being counted with a ``ConnectTimeout`` or
+            ``ReadTimeout`` status.
+
+    Returns: LoadTestReport
+
+    Raises:
+        ValueError: When there is no name to request, or the distribution is
+            unknown.
+    """
+    url = url.rstrip("/")
+    counts: dict[str, int] = defaultdict(int)
+    for name in names:
+        counts[name] += 1
+    distinct = list(counts)
+    if not distinct:
+        raise ValueError("No dataset names to request")
+    popularity = name_weights(distinct, distribution)
+    cum_weights = list(
+        itertools.accumulate(
+            count * weight for count, weight in zip(counts.values(), popularity)
+        )
+    )
+    mix = mix or parse_mix(DEFAULT_MIX)
+    kinds = [kind for kind in REQUEST_KINDS if mix.get(kind)]
+    kind_weights = [mix[kind] for kind in kinds]
+
+    session = _session(concurrency)
+    headers = {"Accept": ACCEPT}
+    post_headers = {**headers, "Content-Type": JSON}
+
+    report = LoadTestReport(concurrency)
+    lock = threading.Lock()
+    sent = itertools.count()
+    master = random.Random(seed)
+    seeds = [master.random() for _ in range(concurrency)]
+    start = time.perf_counter()
+    deadline = start + duration
+
+    def client(client_seed: float) -> None:
+        rng = random.Random(client_seed)
+        latencies: dict[str, list[float]] = defaultdict(list)
+        statuses: dict[str, dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        received = 0
+        while True:
+            if total is not None:
+                if next(sent) >= total:
+                    break
+            elif time.perf_counter() >= deadline:
+                break
+            kind = rng.choices(kinds, kind_weights)[0]
+            request_start = time.perf_counter()
+            try:
+                if kind == "catalog":
+                    response = session.post(
+                        f"{url}/catalog/", headers=headers, timeout=timeout
+                    )
+                else:
+                    name = rng.choices(distinct, cum_weights=cum_weights)[0]
+                    if kind == "miss":
+                        name += _MISS_SUFFIX
+                    response = session.post(
+                        f"{url}/dataset/",
+                        data=dumps_json({"name": name}),
+                        headers=post_headers,
+                        timeout=timeout,
+                    )
+                status = str(response.status_code)
+                received += len(response.content)
+            except requests.RequestException as exc:
+                status = type(exc).__name__
+            latencies[kind].append(time.perf_counter() - request_start)
+            statuses[kind][status] += 1
+        with lock:
+            for kind, values in latencies.items():
+                report.latencies[kind].extend(values)
+                for status, count in statuses[kind].items():
+                    report.statuses[kind][status] += count
+            report.bytes_received += received
+
+    threads = [
+        threading.Thread(target=client, args=(client_seed,), daemon=True)
+        for client_seed in seeds
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    report.duration = time.perf_counter() - start
+    session.close()
+    return report
+
+
+def _session(concurrency: int) -> requests.Session:
+    """Return a session keeping up to ``concurrency`` connections alive to the
+    server, over TCP or a Unix domain socket."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=concurrency)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.mount(f"{UNIX_SCHEME}://", UnixSocketAdapter(pool_maxsize=concurrency))
+    return session
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import json
 import shutil
 
 import click
@@ -8,6 +9,16 @@ import sys
 
 import universal_catalog
 from universal_catalog import __version__ as version
+from universal_catalog.cli.loadtest import (
+    DEFAULT_MIX,
+    DEFAULT_TIMEOUT,
+    DISTRIBUTIONS,
+    parse_mix,
+    run_loadtest,
+    served_names,
+)
+from universal_catalog.core import CatalogValidator, load_catalog, write_snapshot
+from universal_catalog.core.universal_catalog import snapshot_file
 from pathlib import Path
 import yaml
 from kedro.framework.cli.utils import KedroCliError
@@ -45,6 +56,103 @@ def init(server_name: str, output_dir: str) -> None:
     _create_catalog(str(cookiecutter_dir), cookiecutter_args)
 
 
+@cli.command("compile")
+@click.argument(
+    "conf_source", type=click.Path(exists=True, file_okay=False, path_type=Path)
+)
+@click.option("--env", "-e", "environment", default="base")
+@click.option("--output", "-o", "output", type=click.Path(path_type=Path))
+@click.option("--workers", "-w", "workers", type=int)
+def compile_catalog(
+    conf_source: Path, environment: str, output: Path | None, workers: int | None
+) -> None:
+    """Validates a catalog and compiles it to a snapshot the server loads
+    without parsing nor validating it again."""
+    config_path = {"path": conf_source}
+    try:
+        catalog = load_catalog(
+            config_path,
+            environment,
+            validator=CatalogValidator(workers=workers),
+            use_snapshot=False,
+        )
+    except Exception as exc:
+        raise KedroCliError(f"Failed to compile the catalog: {exc}") from exc
+    path = write_snapshot(catalog, output or snapshot_file(config_path, environment))
+    click.secho(catalog.startup_summary())
+    click.secho(f"\nCompiled the catalog version {catalog.version} to {path}")
+
+
+@cli.command("loadtest")
+@click.argument("url")
+@click.option("--concurrency", "-c", type=click.IntRange(min=1), default=8)
+@click.option("--duration", "-d", type=click.FloatRange(min=0), default=10.0)
+@click.option("--requests", "-n", "total", type=click.IntRange(min=1))
+@click.option("--mix", "-m", default=DEFAULT_MIX, show_default=True)
+@click.option("--distribution", type=click.Choice(DISTRIBUTIONS))
+@click.option(
+    "--names-file", type=click.Path(exists=True, dir_okay=False, path_type=Path)
+)
+@click.option("--seed", type=int)
+@click.option(
+    "--timeout",
+    type=click.FloatRange(min=0, min_open=True),
+    default=DEFAULT_TIMEOUT,
+    show_default=True,
+)
+@click.option("--output", "-o", type=click.Path(dir_okay=False, path_type=Path))
+def loadtest(
+    url: str,
+    concurrency: int,
+    duration: float,
+    total: int | None,
+    mix: str,
+    distribution: str | None,
+    names_file: Path | None,
+    seed: int | None,
+    timeout: float,
+    output: Path | None,
+) -> None:
+    """Sends requests to the catalog server at URL and reports its throughput
+    and latency percentiles.
+
+    Names are taken from the catalog served at URL and requested following a
+    Zipf distribution, or replayed from NAMES_FILE, one name per line, with
+    the frequencies they have in it. Misses ask for names that don't exist.
+    """
+    try:
+        weights = parse_mix(mix)
+    except ValueError as exc:
+        raise click.BadParameter(str(exc), param_hint="'--mix'") from exc
+    if names_file is not None:
+        names = [line.strip() for line in names_file.read_text().splitlines()]
+        names = [name for name in names if name]
+    else:
+        try:
+            names = served_names(url)
+        except Exception as exc:
+            raise KedroCliError(
+                f"Failed to fetch the catalog from {url}: {exc}"
+            ) from exc
+    try:
+        report = run_loadtest(
+            url,
+            names,
+            concurrency=concurrency,
+            duration=duration,
+            total=total,
+            mix=weights,
+            distribution=distribution or ("uniform" if names_file else "zipf"),
+            seed=seed,
+            timeout=timeout,
+        )
+    except ValueError as exc:
+        raise KedroCliError(str(exc)) from exc
+    click.echo(report.summary())
+    if output is not None:
+        output.write_text(json.dumps(report.to_dict(), indent=2) + "\n")
+
+
 def _get_prompts(cookiecutter_dir: Path, server_name: str | None) -> Any:
     prompts_yml = cookiecutter_dir / "prompts.yml"
     if not prompts_yml.is_file():
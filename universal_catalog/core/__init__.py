@@ -1,15 +1,63 @@
 from .datasets.universal_catalog_dataset import UniversalCatalogDataset
-from .datasets.datasets import Datasets
+from .datasets.datasets import Datasets, DatasetNames
 from .datasets.remote_catalog import RemoteCatalog
+from .datasets.session import configure_client, get_pool_stats, unix_socket_url
+from .datasets.prefetch import afetch_entries, fetch_entries, prefetch_datasets
+from .datasets.cache import configure_cache
+from .datasets.resolution import configure_resolution
+from .datasets.replicas import configure_replicas, get_replica_stats
+from .datasets.timing import configure_timing, get_timings, timing_summary
 from .universal_catalog import UniversalCatalog, load_catalog
+from .reload import SNAPSHOT_ENV, CatalogReloader, SnapshotReloader
+from .snapshot import write_snapshot
+from .metrics import PROMETHEUS, MetricsMiddleware, configure_metrics, render_metrics
+from .validation import CatalogValidator
 
-from .serving import load_server_settings
+from .serving import (
+    load_server_settings,
+    etag_response,
+    catalog_response,
+    encoded_response,
+    cache_control_header,
+    remove_stale_socket,
+)
+from .hooks import PrefetchHooks, TimingHooks
 
 __all__ = [
     "UniversalCatalogDataset",
     "UniversalCatalog",
     "load_catalog",
+    "CatalogReloader",
+    "SnapshotReloader",
+    "SNAPSHOT_ENV",
+    "write_snapshot",
+    "PROMETHEUS",
+    "MetricsMiddleware",
+    "render_metrics",
+    "configure_metrics",
+    "CatalogValidator",
     "Datasets",
+    "DatasetNames",
     "RemoteCatalog",
     "load_server_settings",
+    "etag_response",
+    "catalog_response",
+    "encoded_response",
+    "cache_control_header",
+    "remove_stale_socket",
+    "configure_client",
+    "get_pool_stats",
+    "unix_socket_url",
+    "fetch_entries",
+    "prefetch_datasets",
+    "afetch_entries",
+    "PrefetchHooks",
+    "configure_cache",
+    "configure_resolution",
+    "configure_replicas",
+    "get_replica_stats",
+    "TimingHooks",
+    "configure_timing",
+    "get_timings",
+    "timing_summary",
 ]
@@ -0,0 +1,317 @@
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from contextlib import closing
+from pathlib import Path
+from typing import Any, Iterable, Sequence
+
+from kedro.io.core import DatasetError
+
+from . import replicas
+from .replicas import replica_key, replica_urls
+from .utils import _decode_response
+
+ENTRY = "entry"
+CATALOG = "catalog"
+
+VERSION_HEADER = "X-Catalog-Version"
+
+# Seconds during which requests are pinned to the catalog version the server
+# last announced. A caching proxy answers pinned URLs from its cache however
+# old they are, so pins must lapse for clients to ever see a reload: the next
+# unpinned request is answered by the server, or by a proxy for no longer than
+# the short ``http_cache.max_age`` of the server, whose default this matches
+PIN_TTL = 5.0
+
+DEFAULT_CACHE_SETTINGS: dict[str, Any] = {
+    "path": None,
+    "ttl": 3600.0,
+    "max_bytes": 64 * 1024 * 1024,
+}
+
+_lock = threading.Lock()
+_cache: EntryCache | None = None
+# Catalog version of each server, as ``url -> (version, checked_at)``
+_versions: dict[str, tuple[str | None, float]] = {}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    url TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    version TEXT,
+    fetched_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    PRIMARY KEY (url, kind, name)
+)
+"""
+
+
+def default_cache_path() -> Path:
+    cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "universal_catalog" / "entries.sqlite"
+
+
+class EntryCache:
+    """``EntryCache`` persists resolved catalog entries on disk in a SQLite
+    database keyed by server url and dataset name, so that they can be reused
+    across Kedro sessions.
+
+    Entries younger than ``ttl`` seconds are served as is. Older entries are
+    kept if the server still reports the catalog version they were fetched
+    with. The least recently used entries are evicted once the payloads take
+    more than ``max_bytes``.
+    """
+
+    def __init__(
+        self,
+        path: str | Path | None = None,
+        ttl: float = DEFAULT_CACHE_SETTINGS["ttl"],
+        max_bytes: int = DEFAULT_CACHE_SETTINGS["max_bytes"],
+    ):
+        self._path = Path(path) if path else default_cache_path()
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        with closing(self._connect()) as conn, conn:
+            conn.execute(_SCHEMA)
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def _connect(self) -> sqlite3.Connection:
+        # One short-lived connection per call keeps the cache safe to use
+        # from threads and forked worker processes alike.
+        return sqlite3.connect(self._path, timeout=30)
+
+    def get(
+        self, url: str, kind: str, names: Iterable[str]
+    ) -> dict[str, tuple[Any, str | None, float]]:
+        """Return ``name -> (payload, version, fetched_at)`` for the cached names."""
+        names = list(names)
+        found: dict[str, tuple[Any, str | None, float]] = {}
+        with closing(self._connect()) as conn, conn:
+            for start in range(0, len(names), 500):
+                batch = names[start : start + 500]
+                rows = conn.execute(
+                    "SELECT name, payload, version, fetched_at FROM entries "
+                    f"WHERE url = ? AND kind = ? AND name IN ({','.join('?' * len(batch))})",
+                    (url, kind, *batch),
+                ).fetchall()
+                for name, payload, version, fetched_at in rows:
+                    found[name] = (json.loads(payload), version, fetched_at)
+            if found:
+                conn.executemany(
+                    "UPDATE entries SET accessed_at = ? "
+                    "WHERE url = ? AND kind = ? AND name = ?",
+                    [(time.time(), url, kind, name) for name in found],
+                )
+        return found
+
+    def put(
+        self, url: str, kind: str, payloads: dict[str, Any], version: str | None
+    ) -> None:
+        now = time.time()
+        rows = []
+        for name, payload in payloads.items():
+            data = json.dumps(payload)
+            rows.append((url, kind, name, data, len(data), version, now, now))
+        with closing(self._connect()) as conn, conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows
+            )
+            self._evict(conn)
+
+    def revalidate(self, url: str, version: str) -> None:
+        """Mark every entry of ``url`` fetched with ``version`` as fresh."""
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "UPDATE entries SET fetched_at = ? WHERE url = ? AND version = ?",
+                (time.time(), url, version),
+            )
+
+    def clear(self) -> None:
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM entries")
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        (total,) = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()
+        if total <= self.max_bytes:
+            return
+        excess = total - self.max_bytes
+        rows = conn.execute(
+            "SELECT url, kind, name, size FROM entries ORDER BY accessed_at"
+        )
+        evicted = []
+        for url, kind, name, size in rows:
+            if excess <= 0:
+                break
+            evicted.append((url, kind, name))
+            excess -= size
+        conn.executemany(
+            "DELETE FROM entries WHERE url = ? AND kind = ? AND name = ?", evicted
+        )
+
+
+def configure_cache(enabled: bool = True, **settings: Any) -> None:
+    """Enable, disable or reconfigure the on-disk cache of resolved entries.
+
+    The cache is disabled by default. Enable it from a Kedro project's
+    ``settings.py`` to reuse entries across sessions.
+
+    Args:
+        enabled: Whether to use the cache.
+        **settings: Any of the keys in ``DEFAULT_CACHE_SETTINGS``.
+            path: Location of the SQLite database, defaults to
+                ``~/.cache/universal_catalog/entries.sqlite``.
+            ttl: Seconds during which an entry is used without asking the server.
+            max_bytes: Size of the cached payloads above which the least
+                recently used entries are evicted.
+
+    Raises:
+        ValueError: When an unknown setting is provided.
+    """
+    global _cache
+    unknown = set(settings) - set(DEFAULT_CACHE_SETTINGS)
+    if unknown:
+        raise ValueError(
+            f"Unknown cache settings: {', '.join(sorted(unknown))}. "
+            f"Valid settings are: {', '.join(DEFAULT_CACHE_SETTINGS)}"
+        )
+    with _lock:
+        _versions.clear()
+        _cache = (
+            EntryCache(**{**DEFAULT_CACHE_SETTINGS, **settings}) if enabled else None
+        )
+
+
+def get_cache() -> EntryCache | None:
+    """Return the configured ``EntryCache``, or ``None`` when it is disabled."""
+    return _cache
+
+
+def lookup(url: str | Sequence[str], kind: str, names: Iterable[str]) -> dict[str, Any]:
+    """Return the cached payloads of ``names`` that are still valid.
+
+    Entries older than the TTL are revalidated against the catalog version of
+    the server, with at most one request per server per TTL.
+    """
+    cache = _cache
+    names = list(names)
+    if cache is None:
+        return {}
+    key = _key(url)
+    now = time.time()
+    valid = {}
+    stale = {}
+    for name, (payload, version, fetched_at) in cache.get(key, kind, names).items():
+        if now - fetched_at < cache.ttl:
+            valid[name] = payload
+        else:
+            stale[name] = (payload, version)
+
+    if len(valid) < len(names):
+        # Resolve the version now, so that entries fetched after this call are
+        # never recorded against a newer version than the one they came from.
+        server_version = _server_version(url, cache.ttl)
+        if stale and server_version is not None:
+            revalidated = False
+            for name, (payload, version) in stale.items():
+                if version == server_version:
+                    valid[name] = payload
+                    revalidated = True
+            if revalidated:
+                cache.revalidate(key, server_version)
+    return valid
+
+
+def snapshot(
+    url: str | Sequence[str], kind: str, name: str
+) -> tuple[Any, str | None] | None:
+    """Return the cached payload of ``name`` and the catalog version it was
+    fetched with, however old it is, or ``None`` when it is not cached."""
+    cache = _cache
+    if cache is None:
+        return None
+    found = cache.get(_key(url), kind, [name]).get(name)
+    if found is None:
+        return None
+    payload, version, _ = found
+    return payload, version
+
+
+def store(
+    url: str | Sequence[str],
+    kind: str,
+    payloads: dict[str, Any],
+    version: str | None = None,
+) -> None:
+    """Persist freshly fetched payloads, when the cache is enabled.
+
+    Payloads are recorded against ``version``, or against the current catalog
+    version of the server when it is not provided.
+    """
+    cache = _cache
+    if cache is None or not payloads:
+        return
+    if version is None:
+        version = _server_version(url, cache.ttl)
+    cache.put(_key(url), kind, payloads, version)
+
+
+def known_version(url: str | Sequence[str], max_age: float = PIN_TTL) -> str | None:
+    """Return the catalog version the server at ``url`` announced in the last
+    ``max_age`` seconds, without asking it, or ``None`` when there is none."""
+    version, checked_at = _versions.get(_key(url), (None, 0.0))
+    if time.time() - checked_at >= max_age:
+        return None
+    return version
+
+
+def observe_version(
+    url: str | Sequence[str], response: Any, pinned: str | None = None
+) -> str | None:
+    """Remember the catalog version ``response`` was served from, sent by the
+    server in the ``X-Catalog-Version`` header, and return it.
+
+    Responses to a request pinned to version ``pinned`` that carry that same
+    version may come from a caching proxy, however old, so they don't confirm
+    that it is still the version of the server.
+    """
+    version = response.headers.get(VERSION_HEADER)
+    if version and version != pinned:
+        _versions[_key(url)] = (version, time.time())
+    return version
+
+
+def _key(url: str | Sequence[str]) -> str:
+    return replica_key(url).rstrip("/")
+
+
+def _server_version(url: str | Sequence[str], ttl: float) -> str | None:
+    key = _key(url)
+    version, checked_at = _versions.get(key, (None, 0.0))
+    if time.time() - checked_at < ttl:
+        return version
+    try:
+        response = replicas.request(
+            [replica.rstrip("/") for replica in replica_urls(url)],
+            "/version/",
+            None,
+            method="GET",
+        )
+        version = _decode_response(response)
+        version = version.get("version")
+    except (DatasetError, ValueError, AttributeError):
+        # Servers without a version endpoint can't revalidate entries
+        version = None
+    _versions[key] = (version, time.time())
+    return version
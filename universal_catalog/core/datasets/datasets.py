@@ -1,5 +1,11 @@
 from pydantic import BaseModel
 
+from typing import List
+
 
 class Datasets(BaseModel):
     name: str
+
+
+class DatasetNames(BaseModel):
+    names: List[str]
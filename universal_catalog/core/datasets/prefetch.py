@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+
+from collections import defaultdict
+from functools import partial
+from typing import Any, Iterable, Sequence
+
+from kedro.io import DataCatalog
+from kedro.io.core import DatasetError
+
+from . import cache, replicas, resolution, timing
+from .replicas import replica_key
+from .session import get_executor
+from .universal_catalog_dataset import UniversalCatalogDataset
+from .utils import _decode_response
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 500
+
+
+def fetch_entries(
+    url: str | Sequence[str],
+    names: Iterable[str],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> dict[str, dict[str, Any] | None]:
+    """Resolve many entries from a Universal Catalog server with the
+    ``/datasets/`` endpoint, using one request per ``batch_size`` names.
+    Batches are sent concurrently by the threads of the client, see
+    ``get_executor``. Entries already resolved in the process or kept in the
+    on-disk cache are not asked for.
+
+    Args:
+        url: Base url of the server, or a list of its replicas.
+        names: Names of the entries to resolve.
+        batch_size: Maximum number of names sent in a single request.
+
+    Returns: dict[str, dict[str, Any] | None]
+        Mapping of each name to its entry, or to `None` when the server does
+        not know the name.
+    """
+    names = list(dict.fromkeys(names))
+    entries: dict[str, dict[str, Any] | None] = {}
+    key = replica_key(url)
+    for name in names:
+        config = resolution.peek(key, name)
+        if config is not None:
+            entries[name] = config
+    missing = [name for name in names if name not in entries]
+    if missing:
+        entries.update(cache.lookup(url, cache.ENTRY, missing))
+    batches = _batches([name for name in missing if name not in entries], batch_size)
+    if len(batches) == 1:
+        entries.update(_fetch_batch(url, batches[0]))
+    else:
+        for fetched in get_executor().map(partial(_fetch_batch, url), batches):
+            entries.update(fetched)
+    return entries
+
+
+async def afetch_entries(
+    url: str | Sequence[str],
+    names: Iterable[str],
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> dict[str, dict[str, Any] | None]:
+    """Asyncio version of ``fetch_entries``, run in the default executor of the
+    event loop so that the loop isn't blocked."""
+    # Not in the client's executor, whose threads send the batches
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        None, partial(fetch_entries, url, list(names), batch_size)
+    )
+
+
+def _batches(names: list[str], batch_size: int) -> list[list[str]]:
+    return [
+        names[start : start + batch_size] for start in range(0, len(names), batch_size)
+    ]
+
+
+def _fetch_batch(
+    url: str | Sequence[str], names: list[str]
+) -> dict[str, dict[str, Any] | None]:
+    response = replicas.request(url, "/datasets/", {"names": names})
+    fetched = _decode_response(response)
+    found = {name: config for name, config in fetched.items() if config is not None}
+    cache.store(url, cache.ENTRY, found)
+    resolution.prime(
+        replica_key(url), {name: config for name, config in found.items() if config}
+    )
+    return fetched
+
+
+def prefetch_datasets(
+    catalog: DataCatalog, batch_size: int = DEFAULT_BATCH_SIZE
+) -> int:
+    """Materialize every ``UniversalCatalogDataset`` in ``catalog`` that has not
+    been resolved yet, with one batched request per server.
+
+    Failures are logged and the affected datasets are left to resolve
+    themselves lazily on first use, as they would without prefetching.
+
+    Returns: int
+        Number of datasets materialized.
+    """
+    pending: dict[str, list[UniversalCatalogDataset]] = defaultdict(list)
+    for dataset in getattr(catalog, "_datasets", {}).values():
+        if isinstance(dataset, UniversalCatalogDataset) and not dataset._dataset:
+            pending[dataset._base_url].append(dataset)
+
+    materialized = 0
+    for url, datasets in pending.items():
+        try:
+            entries = fetch_entries(
+                datasets[0]._replicas, (ds._source_name for ds in datasets), batch_size
+            )
+        except DatasetError as exc:
+            logger.warning("Failed to prefetch datasets from '%s': %s", url, exc)
+            continue
+        for dataset in datasets:
+            config = entries.get(dataset._source_name)
+            if config is None:
+                logger.warning(
+                    "Dataset '%s' was not found on '%s'", dataset._source_name, url
+                )
+                continue
+            timing.record_source(dataset._source_name, "prefetch")
+            dataset._set_config(config)
+            materialized += 1
+    return materialized
@@ -1,11 +1,27 @@
 from __future__ import annotations
 
+import copy
+import re
+import threading
+
 from kedro.io import DataCatalog
-from kedro.io.core import DatasetError
+from kedro.io.core import (
+    AbstractDataset,
+    DatasetAlreadyExistsError,
+    DatasetError,
+    Version,
+)
+from kedro.io.data_catalog import _resolve_credentials
 
 from typing import Any
+from urllib.parse import urlencode
+
+from . import cache, replicas
+from .utils import _decode_response, _route_missing
+from ..encoding import loads_json
+from ..filters import FILTER_KEYS, entry_selected
 
-from .utils import _execute_request
+NDJSON = "application/x-ndjson"
 
 
 class RemoteCatalog(DataCatalog):
@@ -14,10 +30,40 @@ class RemoteCatalog(DataCatalog):
     and merge it with the DataCatalog from your project.
     If a dataset is present in both the remote catalog and the project catalog
     the project catalog entry is kept.
+
+    Only part of the remote catalog can be fetched by adding any of
+    ``prefix``, ``glob`` or ``namespace`` to the ``remote_catalog`` entry of
+    the credentials, see ``UniversalCatalog.select``.
+
+    When the on-disk cache is enabled, see ``configure_cache``, the fetched
+    catalog is kept as a snapshot and later sessions only download the entries
+    that changed since, applying them to that snapshot.
+
+    With ``lazy: true`` in the ``remote_catalog`` entry, remote entries are
+    kept as config and their dataset is only instantiated when it is first
+    used, so that sessions only pay for the datasets their pipelines touch.
+    Every remote entry is still listed by ``list()`` and found by ``in``.
     """
 
-    def __init__(self):
-        super().__init__()
+    def __init__(
+        self,
+        datasets: dict[str, AbstractDataset] | None = None,
+        feed_dict: dict[str, Any] | None = None,
+        dataset_patterns: dict[str, dict[str, Any]] | None = None,
+        load_versions: dict[str, str] | None = None,
+        save_version: str | None = None,
+        default_pattern: dict[str, dict[str, Any]] | None = None,
+        lazy_datasets: _LazyDatasets | None = None,
+    ):
+        self._lazy_datasets = lazy_datasets or _LazyDatasets()
+        super().__init__(
+            datasets=datasets,
+            feed_dict=feed_dict,
+            dataset_patterns=dataset_patterns,
+            load_versions=load_versions,
+            save_version=save_version,
+            default_pattern=default_pattern,
+        )
 
     @classmethod
     def from_config(
@@ -34,7 +80,246 @@ class RemoteCatalog(DataCatalog):
         if "url" not in credentials["remote_catalog"].keys():
             raise DatasetError("`url` must be provided in `remote_catalog` entry.")
         url = credentials["remote_catalog"]["url"]
-        url = url + "/catalog/"
-        cfg = _execute_request(url, None).json()
-        cfg.update(catalog or {})
-        return DataCatalog.from_config(cfg, credentials, load_versions, save_version)
+        filters = {
+            key: credentials["remote_catalog"][key]
+            for key in FILTER_KEYS
+            if credentials["remote_catalog"].get(key) is not None
+        }
+        cache_name = urlencode(sorted(filters.items()))
+        cfg = cache.lookup(url, cache.CATALOG, [cache_name]).get(cache_name)
+        if cfg is None:
+            cfg = _sync_catalog(url, filters, cache_name)
+        if not credentials["remote_catalog"].get("lazy", False):
+            cfg.update(catalog or {})
+            return DataCatalog.from_config(
+                cfg, credentials, load_versions, save_version
+            )
+        return cls._lazy_from_config(
+            cfg, catalog or {}, credentials, load_versions or {}, save_version
+        )
+
+    @classmethod
+    def _lazy_from_config(
+        cls,
+        remote: dict[str, dict[str, Any]],
+        catalog: dict[str, dict[str, Any]],
+        credentials: dict[str, dict[str, Any]],
+        load_versions: dict[str, str],
+        save_version: str | None,
+    ) -> RemoteCatalog:
+        lazy = {
+            name: config
+            for name, config in remote.items()
+            if not cls._is_pattern(name) and name not in catalog
+        }
+        # Patterns are already resolved lazily by ``DataCatalog``
+        eager = {name: config for name, config in remote.items() if name not in lazy}
+        eager.update(catalog)
+        base = DataCatalog.from_config(
+            eager,
+            credentials,
+            {key: value for key, value in load_versions.items() if key not in lazy},
+            save_version,
+        )
+        return cls(
+            datasets=base._datasets,
+            dataset_patterns=base._dataset_patterns,
+            load_versions=load_versions,
+            save_version=base._save_version,
+            default_pattern=base._default_pattern,
+            lazy_datasets=_LazyDatasets(
+                lazy, credentials, load_versions, base._save_version
+            ),
+        )
+
+    def _get_dataset(
+        self,
+        dataset_name: str,
+        version: Version | None = None,
+        suggest: bool = True,
+    ) -> AbstractDataset:
+        if dataset_name not in self._datasets and dataset_name in self._lazy_datasets:
+            # Threads using the dataset for the first time at once must only add
+            # it once
+            with self._lazy_datasets._lock:
+                if dataset_name not in self._datasets:
+                    super().add(dataset_name, self._lazy_datasets.get(dataset_name))
+        return super()._get_dataset(dataset_name, version, suggest)
+
+    def __contains__(self, dataset_name: str) -> bool:
+        return dataset_name in self._lazy_datasets or super().__contains__(dataset_name)
+
+    def add(
+        self, dataset_name: str, dataset: AbstractDataset, replace: bool = False
+    ) -> None:
+        if (
+            not replace
+            and dataset_name not in self._datasets
+            and dataset_name in self._lazy_datasets
+        ):
+            raise DatasetAlreadyExistsError(
+                f"Dataset '{dataset_name}' has already been registered"
+            )
+        super().add(dataset_name, dataset, replace)
+
+    def list(self, regex_search: str | None = None) -> list[str]:
+        names = [*self._datasets]
+        names.extend(name for name in self._lazy_datasets if name not in self._datasets)
+        if regex_search is None:
+            return names
+        if not regex_search.strip():
+            self._logger.warning("The empty string will not match any data sets")
+            return []
+        try:
+            pattern = re.compile(regex_search, flags=re.IGNORECASE)
+        except re.error as exc:
+            raise SyntaxError(
+                f"Invalid regular expression provided: '{regex_search}'"
+            ) from exc
+        return [name for name in names if pattern.search(name)]
+
+    def shallow_copy(
+        self, extra_dataset_patterns: dict[str, dict[str, Any]] | None = None
+    ) -> DataCatalog:
+        copied = super().shallow_copy(extra_dataset_patterns)
+        return RemoteCatalog(
+            datasets=copied._datasets,
+            dataset_patterns=copied._dataset_patterns,
+            load_versions=copied._load_versions,
+            save_version=copied._save_version,
+            default_pattern=copied._default_pattern,
+            lazy_datasets=self._lazy_datasets,
+        )
+
+
+class _LazyDatasets:
+    """Configs of the datasets not instantiated yet, shared by a
+    ``RemoteCatalog`` and its shallow copies so that each dataset is only
+    instantiated once."""
+
+    def __init__(
+        self,
+        configs: dict[str, dict[str, Any]] | None = None,
+        credentials: dict[str, dict[str, Any]] | None = None,
+        load_versions: dict[str, str] | None = None,
+        save_version: str | None = None,
+    ):
+        self._configs = configs or {}
+        self._credentials = copy.deepcopy(credentials) or {}
+        self._load_versions = load_versions or {}
+        self._save_version = save_version
+        self._datasets: dict[str, AbstractDataset] = {}
+        # Reentrant, ``RemoteCatalog`` holds it while calling ``get``
+        self._lock = threading.RLock()
+
+    def __contains__(self, dataset_name: str) -> bool:
+        return dataset_name in self._configs
+
+    def __iter__(self):
+        return iter(self._configs)
+
+    def __len__(self) -> int:
+        return len(self._configs)
+
+    def __getstate__(self) -> dict[str, Any]:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+
+    def get(self, dataset_name: str) -> AbstractDataset:
+        with self._lock:
+            if dataset_name not in self._datasets:
+                self._datasets[dataset_name] = AbstractDataset.from_config(
+                    dataset_name,
+                    _resolve_credentials(
+                        self._configs[dataset_name], self._credentials
+                    ),
+                    self._load_versions.get(dataset_name),
+                    self._save_version,
+                )
+            return self._datasets[dataset_name]
+
+
+def _sync_catalog(
+    url: str | list[str], filters: dict[str, str], cache_name: str
+) -> dict:
+    """Bring the cached snapshot of the remote catalog up to date, downloading
+    the whole catalog only when there is no snapshot or no way to tell what
+    changed since it was taken."""
+    snapshot = cache.snapshot(url, cache.CATALOG, cache_name)
+    if snapshot is not None and snapshot[1] is not None:
+        cfg, version = snapshot
+        try:
+            response = replicas.request(
+                url,
+                "/catalog/changes/",
+                None,
+                method="GET",
+                params={"since": version, **filters},
+            )
+            changes = _decode_response(response)
+        except (DatasetError, ValueError):
+            # Servers that predate delta sync only send the whole catalog
+            changes = None
+        if changes is not None:
+            cfg = _apply_changes(cfg, changes)
+            cache.store(url, cache.CATALOG, {cache_name: cfg}, changes["version"])
+            return cfg
+    cfg = _fetch_catalog(url, filters)
+    cache.store(url, cache.CATALOG, {cache_name: cfg})
+    return cfg
+
+
+def _apply_changes(cfg: dict[str, Any], changes: dict[str, Any]) -> dict[str, Any]:
+    if changes["full"]:
+        return changes["changed"]
+    for name in changes["removed"]:
+        cfg.pop(name, None)
+    cfg.update(changes["changed"])
+    return cfg
+
+
+def _fetch_catalog(url: str | list[str], filters: dict[str, str]) -> dict[str, Any]:
+    """Fetch the entries of the remote catalog passing ``filters``, streamed
+    one per line so that large catalogs are never held twice in memory."""
+    version = cache.known_version(url)
+    options = dict(headers={"Accept": NDJSON}, stream=True)
+    try:
+        # Pinned to the catalog version the server just announced, so that
+        # caching proxies can answer it
+        response = replicas.request(
+            url,
+            "/catalog/",
+            None,
+            method="GET",
+            params={**filters, "version": version} if version else filters or None,
+            **options,
+        )
+    except DatasetError as exc:
+        if not _route_missing(exc):
+            raise
+        # Servers that predate ``GET /catalog/``
+        version = None
+        response = replicas.request(
+            url, "/catalog/", None, params=filters or None, **options
+        )
+    cache.observe_version(url, response, version)
+    if not response.headers.get("content-type", "").startswith(NDJSON):
+        # Servers that predate filtering send the whole catalog as JSON, it is
+        # filtered like newer servers do
+        cfg = _decode_response(response)
+        return {
+            name: entry
+            for name, entry in cfg.items()
+            if entry_selected(name, **filters)
+        }
+    cfg = {}
+    for line in response.iter_lines():
+        if line:
+            entry = loads_json(line)
+            cfg[entry["name"]] = entry["config"]
+    return cfg
@@ -0,0 +1,313 @@
+from __future__ import annotations
+
+import logging
+import os
+import random
+import threading
+import time
+
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Sequence
+
+import requests
+from kedro.io.core import DatasetError
+
+from .utils import _execute_request
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REPLICA_SETTINGS: dict[str, Any] = {
+    "eject_after": 3,
+    "eject_seconds": 30.0,
+    "hedge": False,
+    "hedge_quantile": 0.95,
+    "hedge_initial_delay": 0.5,
+    "hedge_min_delay": 0.01,
+}
+
+# Latencies kept per replica set to estimate the hedging deadline
+_LATENCY_WINDOW = 200
+_MIN_LATENCY_SAMPLES = 20
+# Weight of the latest latency in the moving average of each replica
+_EWMA_ALPHA = 0.3
+
+_lock = threading.Lock()
+_settings: dict[str, Any] = dict(DEFAULT_REPLICA_SETTINGS)
+_health: dict[str, _ReplicaHealth] = {}
+_latencies: dict[str, deque] = {}
+_executor: ThreadPoolExecutor | None = None
+_executor_pid: int | None = None
+
+
+class _ReplicaHealth:
+    def __init__(self) -> None:
+        self.latency: float | None = None
+        self.failures = 0
+        self.ejected_until = 0.0
+        self.requests = 0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "latency": self.latency,
+            "failures": self.failures,
+            "ejected": self.ejected_until > time.monotonic(),
+            "requests": self.requests,
+        }
+
+
+def replica_urls(url: str | Sequence[str]) -> list[str]:
+    """Return the replicas of a ``url`` setting, a single url or a list."""
+    if isinstance(url, str):
+        return [url]
+    urls = list(url)
+    if not urls:
+        raise DatasetError("At least one server url must be provided.")
+    return urls
+
+
+def replica_key(url: str | Sequence[str]) -> str:
+    """Return a string identifying the servers of a ``url`` setting, the url
+    itself for a single server, used to key cached entries."""
+    urls = replica_urls(url)
+    if len(urls) == 1:
+        return urls[0]
+    return ",".join(sorted(replica.rstrip("/") for replica in urls))
+
+
+def configure_replicas(**settings: Any) -> None:
+    """Update how requests are spread over the replicas of a server.
+
+    Args:
+        **settings: Any of the keys in ``DEFAULT_REPLICA_SETTINGS``.
+            eject_after: Consecutive failures after which a replica is no
+                longer sent requests.
+            eject_seconds: Seconds during which an ejected replica is skipped,
+                it is tried again afterwards.
+            hedge: Whether to send a second request to another replica when
+                the first one is slower than usual.
+            hedge_quantile: Quantile of the recent latencies after which the
+                second request is sent.
+            hedge_initial_delay: Seconds after which the second request is sent
+                until enough latencies were observed.
+            hedge_min_delay: Minimum seconds before the second request is sent.
+
+    Raises:
+        ValueError: When an unknown setting is provided.
+    """
+    unknown = set(settings) - set(DEFAULT_REPLICA_SETTINGS)
+    if unknown:
+        raise ValueError(
+            f"Unknown replica settings: {', '.join(sorted(unknown))}. "
+            f"Valid settings are: {', '.join(DEFAULT_REPLICA_SETTINGS)}"
+        )
+    with _lock:
+        _settings.update(settings)
+
+
+def reset_replicas() -> None:
+    """Restore the default replica settings and forget their health."""
+    with _lock:
+        _settings.clear()
+        _settings.update(DEFAULT_REPLICA_SETTINGS)
+        _health.clear()
+        _latencies.clear()
+
+
+def get_replica_stats() -> dict[str, dict[str, Any]]:
+    """Return, for each replica used so far, the moving average of its
+    latency, its consecutive failures, whether it is ejected and the number
+    of requests sent to it."""
+    with _lock:
+        return {url: health.to_dict() for url, health in _health.items()}
+
+
+def request(
+    url: str | Sequence[str],
+    path: str,
+    json_obj: dict[str, Any] | None,
+    **kwargs: Any,
+) -> requests.Response:
+    """Send a request to one of the replicas of ``url``, see
+    ``_execute_request`` for the arguments.
+
+    The replica is chosen among the healthy ones, preferring the faster of two
+    picked at random. Connection errors and server errors are retried on the
+    other replicas, and when hedging is enabled a second replica is asked too
+    if the first one is slower than usual, the first answer winning.
+
+    Raises:
+        DatasetError: When no replica answers successfully.
+    """
+    urls = replica_urls(url)
+    if len(urls) == 1:
+        return _execute_request(urls[0] + path, json_obj, **kwargs)
+    key = replica_key(urls)
+    replicas = _order(urls)
+    if _settings["hedge"]:
+        return _hedged(key, replicas, path, json_obj, kwargs)
+    error = None
+    for replica in replicas:
+        try:
+            return _attempt(key, replica, path, json_obj, kwargs)
+        except DatasetError as exc:
+            if not _retryable(exc):
+                raise
+            error = exc
+    raise error
+
+
+def _order(urls: list[str]) -> list[str]:
+    """Order replicas by preference: the faster of two healthy replicas picked
+    at random, the other healthy replicas by latency, then ejected ones."""
+    now = time.monotonic()
+    with _lock:
+        health = {url: _health.setdefault(url, _ReplicaHealth()) for url in urls}
+        healthy = [url for url in urls if health[url].ejected_until <= now]
+        ejected = [url for url in urls if url not in healthy]
+
+    def latency(url: str) -> float:
+        # Replicas never measured are tried first
+        return health[url].latency or 0.0
+
+    if len(healthy) > 1:
+        first = min(random.sample(healthy, 2), key=latency)
+        healthy.remove(first)
+        healthy = [first, *sorted(healthy, key=latency)]
+    return healthy + sorted(ejected, key=lambda url: health[url].ejected_until)
+
+
+def _attempt(
+    key: str,
+    replica: str,
+    path: str,
+    json_obj: dict[str, Any] | None,
+    kwargs: dict,
+) -> requests.Response:
+    start = time.monotonic()
+    try:
+        # Failed attempts are not retried on the same replica, the next one is
+        # tried instead
+        response = _execute_request(replica + path, json_obj, retries=False, **kwargs)
+    except DatasetError as exc:
+        if _retryable(exc):
+            _record_failure(replica, exc)
+        raise
+    _record_success(key, replica, time.monotonic() - start)
+    return response
+
+
+def _hedged(
+    key: str,
+    replicas: list[str],
+    path: str,
+    json_obj: dict[str, Any] | None,
+    kwargs: dict,
+) -> requests.Response:
+    executor = _get_executor()
+    remaining = iter(replicas)
+    pending: set[Future] = set()
+
+    def submit() -> bool:
+        replica = next(remaining, None)
+        if replica is None:
+            return False
+        pending.add(executor.submit(_attempt, key, replica, path, json_obj, kwargs))
+        return True
+
+    submit()
+    deadline: float | None = _hedge_delay(key)
+    error = None
+    while pending:
+        done, pending = wait(pending, timeout=deadline, return_when=FIRST_COMPLETED)
+        if not done:
+            # The first replica is slow, ask another one too
+            submit()
+            deadline = None
+            continue
+        for future in done:
+            try:
+                response = future.result()
+            except DatasetError as exc:
+                if not _retryable(exc):
+                    _discard(pending)
+                    raise
+                error = exc
+                submit()
+                continue
+            _discard(pending)
+            return response
+    raise error
+
+
+def _discard(futures: set[Future]) -> None:
+    """Close the responses of the requests that lost the race."""
+
+    def close(future: Future) -> None:
+        if future.exception() is None:
+            future.result().close()
+
+    for future in futures:
+        future.add_done_callback(close)
+
+
+def _hedge_delay(key: str) -> float:
+    with _lock:
+        samples = sorted(_latencies.get(key, ()))
+    if len(samples) < _MIN_LATENCY_SAMPLES:
+        return _settings["hedge_initial_delay"]
+    index = min(len(samples) - 1, int(len(samples) * _settings["hedge_quantile"]))
+    return max(samples[index], _settings["hedge_min_delay"])
+
+
+def _record_success(key: str, replica: str, seconds: float) -> None:
+    with _lock:
+        _latencies.setdefault(key, deque(maxlen=_LATENCY_WINDOW)).append(seconds)
+        health = _health.setdefault(replica, _ReplicaHealth())
+        health.requests += 1
+        health.failures = 0
+        health.ejected_until = 0.0
+        if health.latency is None:
+            health.latency = seconds
+        else:
+            health.latency += _EWMA_ALPHA * (seconds - health.latency)
+
+
+def _record_failure(replica: str, error: Exception) -> None:
+    with _lock:
+        health = _health.setdefault(replica, _ReplicaHealth())
+        health.requests += 1
+        health.failures += 1
+        if health.failures < _settings["eject_after"]:
+            return
+        health.ejected_until = time.monotonic() + _settings["eject_seconds"]
+    logger.warning(
+        "Ejecting replica '%s' for %ss after %s consecutive failures: %s",
+        replica,
+        _settings["eject_seconds"],
+        health.failures,
+        error,
+    )
+
+
+def _retryable(error: DatasetError) -> bool:
+    """Whether another replica may answer the request that failed with
+    ``error``: connection errors and server errors are, other answers like
+    a ``404 Not Found`` would be the same everywhere."""
+    cause = error.__cause__
+    if isinstance(cause, requests.exceptions.HTTPError):
+        status = cause.response.status_code if cause.response is not None else 500
+        return status >= 500 or status == 429
+    return isinstance(cause, OSError)
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor, _executor_pid
+    pid = os.getpid()
+    if _executor is not None and _executor_pid == pid:
+        return _executor
+    with _lock:
+        if _executor is None or _executor_pid != pid:
+            _executor = ThreadPoolExecutor(thread_name_prefix="replica-request")
+            _executor_pid = pid
+        return _executor
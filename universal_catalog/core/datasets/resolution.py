@@ -0,0 +1,235 @@
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+
+from concurrent.futures import Future
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RESOLUTION_SETTINGS: dict[str, Any] = {
+    "ttl": 300.0,
+    "stale_ttl": 3600.0,
+}
+
+_lock = threading.Lock()
+_cache: ResolutionCache | None = None
+_cache_pid: int | None = None
+_settings: dict[str, Any] = dict(DEFAULT_RESOLUTION_SETTINGS)
+_enabled = True
+
+
+class ResolutionCache:
+    """``ResolutionCache`` keeps the entries resolved by every
+    ``UniversalCatalogDataset`` of the process, keyed by server url and source
+    name.
+
+    Concurrent resolutions of the same entry share a single request: the first
+    caller fetches the entry while the others wait for its result. Entries
+    younger than ``ttl`` seconds are used as is. For ``stale_ttl`` seconds
+    more, they are still used but refreshed in a background thread, so that
+    callers never wait on a refresh. Older entries are fetched again.
+
+    Args:
+        ttl: Seconds during which an entry is used as is.
+        stale_ttl: Seconds after ``ttl`` during which an entry is used while
+            it is refreshed in the background.
+    """
+
+    def __init__(
+        self,
+        ttl: float = DEFAULT_RESOLUTION_SETTINGS["ttl"],
+        stale_ttl: float = DEFAULT_RESOLUTION_SETTINGS["stale_ttl"],
+    ):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        # ``(url, name) -> (entry, fetched_at)``
+        self._entries: dict[tuple[str, str], tuple[Any, float]] = {}
+        self._inflight: dict[tuple[str, str], Future] = {}
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "stale": 0, "misses": 0, "coalesced": 0}
+
+    def resolve(
+        self,
+        url: str,
+        name: str,
+        fetch: Callable[[], Any],
+        on_shared: Callable[[], None] | None = None,
+    ) -> Any:
+        """Return the entry ``name`` of the server at ``url``, calling
+        ``fetch`` to resolve it when it isn't cached or is too old.
+        ``on_shared`` is called when the caller waits on the resolution
+        started by another one instead.
+
+        Raises:
+            Exception: Whatever ``fetch`` raised, to every caller waiting for
+                that resolution.
+        """
+        key = (url.rstrip("/"), name)
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                entry, fetched_at = cached
+                age = time.monotonic() - fetched_at
+                if age < self.ttl:
+                    self.stats["hits"] += 1
+                    return entry
+                if age < self.ttl + self.stale_ttl:
+                    self.stats["stale"] += 1
+                    if key not in self._inflight:
+                        self._start_refresh(key, fetch)
+                    return entry
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                self.stats["misses"] += 1
+                future = self._inflight[key] = Future()
+            else:
+                self.stats["coalesced"] += 1
+        if leader:
+            self._fetch(key, fetch, future)
+        elif on_shared is not None:
+            on_shared()
+        return future.result()
+
+    def peek(self, url: str, name: str) -> Any | None:
+        """Return the cached entry ``name`` of the server at ``url``, fresh or
+        stale, without ever fetching it."""
+        with self._lock:
+            cached = self._entries.get((url.rstrip("/"), name))
+        if cached is None:
+            return None
+        entry, fetched_at = cached
+        if time.monotonic() - fetched_at >= self.ttl + self.stale_ttl:
+            return None
+        return entry
+
+    def prime(self, url: str, entries: dict[str, Any]) -> None:
+        """Cache ``entries`` resolved by other means, e.g. a batch request."""
+        now = time.monotonic()
+        url = url.rstrip("/")
+        with self._lock:
+            for name, entry in entries.items():
+                self._entries[(url, name)] = (entry, now)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _start_refresh(self, key: tuple[str, str], fetch: Callable[[], Any]) -> None:
+        # Called with the lock held
+        future = self._inflight[key] = Future()
+        thread = threading.Thread(
+            target=self._fetch,
+            args=(key, fetch, future, True),
+            name=f"resolution-refresh-{key[1]}",
+            daemon=True,
+        )
+        thread.start()
+
+    def _fetch(
+        self,
+        key: tuple[str, str],
+        fetch: Callable[[], Any],
+        future: Future,
+        background: bool = False,
+    ) -> None:
+        try:
+            entry = fetch()
+        except BaseException as exc:
+            if background:
+                logger.warning(
+                    "Failed to refresh '%s' from '%s', keeping the cached entry: %s",
+                    key[1],
+                    key[0],
+                    exc,
+                )
+            with self._lock:
+                del self._inflight[key]
+            future.set_exception(exc)
+            return
+        with self._lock:
+            self._entries[key] = (entry, time.monotonic())
+            del self._inflight[key]
+        future.set_result(entry)
+
+
+def configure_resolution(enabled: bool = True, **settings: Any) -> None:
+    """Enable, disable or reconfigure the process-wide cache of resolved
+    entries, see ``ResolutionCache``. It is enabled by default.
+
+    Args:
+        enabled: Whether to share resolved entries between datasets.
+        **settings: Any of the keys in ``DEFAULT_RESOLUTION_SETTINGS``.
+            ttl: Seconds during which an entry is used as is.
+            stale_ttl: Seconds after ``ttl`` during which an entry is used
+                while it is refreshed in the background.
+
+    Raises:
+        ValueError: When an unknown setting is provided.
+    """
+    global _cache, _enabled
+    unknown = set(settings) - set(DEFAULT_RESOLUTION_SETTINGS)
+    if unknown:
+        raise ValueError(
+            f"Unknown resolution settings: {', '.join(sorted(unknown))}. "
+            f"Valid settings are: {', '.join(DEFAULT_RESOLUTION_SETTINGS)}"
+        )
+    with _lock:
+        _settings.clear()
+        _settings.update({**DEFAULT_RESOLUTION_SETTINGS, **settings})
+        _enabled = enabled
+        _cache = None
+
+
+def get_resolution_cache() -> ResolutionCache | None:
+    """Return the process-wide ``ResolutionCache``, or ``None`` when it is
+    disabled.
+
+    A new cache is built in forked processes, so that they never wait on a
+    resolution started by their parent.
+    """
+    global _cache, _cache_pid
+    if not _enabled:
+        return None
+    pid = os.getpid()
+    if _cache is not None and _cache_pid == pid:
+        return _cache
+    with _lock:
+        if _cache is None or _cache_pid != pid:
+            _cache = ResolutionCache(**_settings)
+            _cache_pid = pid
+        return _cache
+
+
+def resolve(
+    url: str,
+    name: str,
+    fetch: Callable[[], Any],
+    on_shared: Callable[[], None] | None = None,
+) -> Any:
+    """Resolve an entry through the process-wide cache, or with ``fetch``
+    alone when the cache is disabled."""
+    cache = get_resolution_cache()
+    if cache is None:
+        return fetch()
+    return cache.resolve(url, name, fetch, on_shared)
+
+
+def peek(url: str, name: str) -> Any | None:
+    """Return an entry of the process-wide cache, when it is enabled and holds
+    it."""
+    cache = get_resolution_cache()
+    if cache is None:
+        return None
+    return cache.peek(url, name)
+
+
+def prime(url: str, entries: dict[str, Any]) -> None:
+    """Add entries to the process-wide cache, when it is enabled."""
+    cache = get_resolution_cache()
+    if cache is not None and entries:
+        cache.prime(url, entries)
@@ -0,0 +1,294 @@
+from __future__ import annotations
+
+import os
+import socket
+import threading
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from urllib.parse import quote, unquote, urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.connectionpool import HTTPConnectionPool
+from urllib3.util.retry import Retry
+
+# Servers listening on a Unix domain socket are reached with urls like
+# ``http+unix://%2Frun%2Fcatalog.sock/``, the path of the socket being
+# percent-encoded in place of the host
+UNIX_SCHEME = "http+unix"
+
+DEFAULT_CLIENT_SETTINGS: dict[str, Any] = {
+    "pool_connections": 10,
+    "pool_maxsize": 32,
+    "connect_timeout": 3.05,
+    "read_timeout": 30.0,
+    "max_retries": 3,
+    "backoff_factor": 0.25,
+    "backoff_jitter": 0.25,
+    "status_forcelist": (429, 502, 503, 504),
+}
+
+_lock = threading.Lock()
+_settings: dict[str, Any] = dict(DEFAULT_CLIENT_SETTINGS)
+# Pooled sessions, by whether they retry failed requests
+_sessions: dict[bool, requests.Session] = {}
+_session_pid: int | None = None
+_executor: ThreadPoolExecutor | None = None
+_executor_pid: int | None = None
+
+
+def configure_client(**settings: Any) -> None:
+    """Update the settings of the process-wide HTTP client.
+
+    The pooled session is rebuilt lazily on the next request, so this can be
+    called at any time, e.g. from a Kedro project's ``settings.py``.
+
+    Args:
+        **settings: Any of the keys in ``DEFAULT_CLIENT_SETTINGS``.
+            pool_connections: Number of per-host connection pools to cache.
+            pool_maxsize: Maximum number of keep-alive connections per host.
+            connect_timeout: Seconds to wait for a connection to be established.
+            read_timeout: Seconds to wait for the server to send a response.
+            max_retries: Number of retries on connection errors and on the
+                status codes in ``status_forcelist``. Requests to one of
+                several replicas are not retried, they fail over to the next
+                replica instead.
+            backoff_factor: Base of the exponential backoff between retries.
+            backoff_jitter: Maximum random jitter added to each backoff.
+            status_forcelist: HTTP status codes that trigger a retry.
+
+    Raises:
+        ValueError: When an unknown setting is provided.
+    """
+    unknown = set(settings) - set(DEFAULT_CLIENT_SETTINGS)
+    if unknown:
+        raise ValueError(
+            f"Unknown client settings: {', '.join(sorted(unknown))}. "
+            f"Valid settings are: {', '.join(DEFAULT_CLIENT_SETTINGS)}"
+        )
+    with _lock:
+        _settings.update(settings)
+        _close_session()
+        _close_executor()
+
+
+def reset_client() -> None:
+    """Restore the default client settings and drop the pooled session."""
+    with _lock:
+        _settings.clear()
+        _settings.update(DEFAULT_CLIENT_SETTINGS)
+        _close_session()
+        _close_executor()
+
+
+def get_client_settings() -> dict[str, Any]:
+    """Return a copy of the current client settings."""
+    return dict(_settings)
+
+
+def get_session(retries: bool = True) -> requests.Session:
+    """Return the process-wide pooled ``requests.Session``.
+
+    A new session is built when none exists yet or when the current process
+    is a fork of the one that built it, so that worker processes never share
+    sockets with their parent.
+
+    Args:
+        retries: Whether the session retries failed requests. Requests to one
+            of several replicas don't, the next replica is tried instead.
+    """
+    global _session_pid
+    pid = os.getpid()
+    session = _sessions.get(retries) if _session_pid == pid else None
+    if session is not None:
+        return session
+    with _lock:
+        if _session_pid != pid:
+            _sessions.clear()
+            _session_pid = pid
+        session = _sessions.get(retries)
+        if session is None:
+            session = _sessions[retries] = _build_session(_settings, retries)
+        return session
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Return the process-wide threads sending concurrent requests, as many
+    as the keep-alive connections of a pool so that each reuses one.
+
+    Like the session, the threads are started again in a forked process.
+    """
+    global _executor, _executor_pid
+    pid = os.getpid()
+    if _executor is not None and _executor_pid == pid:
+        return _executor
+    with _lock:
+        if _executor is None or _executor_pid != pid:
+            _executor = ThreadPoolExecutor(
+                max_workers=_settings["pool_maxsize"],
+                thread_name_prefix="universal-catalog",
+            )
+            _executor_pid = pid
+        return _executor
+
+
+def get_timeout() -> tuple[float, float]:
+    """Return the ``(connect, read)`` timeout used for every request."""
+    return _settings["connect_timeout"], _settings["read_timeout"]
+
+
+def get_pool_stats() -> dict[str, Any]:
+    """Return statistics about the connection pools of the shared session.
+
+    Returns: dict[str, Any]
+        The current client settings under ``settings`` and, under ``pools``,
+        one entry per host with the number of connections opened, requests
+        made and idle keep-alive connections available for reuse.
+    """
+    pools: dict[str, dict[str, int]] = {}
+    sessions = list(_sessions.values()) if _session_pid == os.getpid() else []
+    for session in sessions:
+        for host, pool in _connection_pools(session):
+            stats = pools.setdefault(
+                host,
+                {"num_connections": 0, "num_requests": 0, "idle_connections": 0},
+            )
+            stats["num_connections"] += pool.num_connections
+            stats["num_requests"] += pool.num_requests
+            stats["idle_connections"] += sum(
+                conn is not None for conn in list(pool.pool.queue)
+            )
+            stats["maxsize"] = pool.pool.maxsize
+    return {"settings": get_client_settings(), "pools": pools}
+
+
+def _build_session(settings: dict[str, Any], retries: bool = True) -> requests.Session:
+    if retries:
+        retry = Retry(
+            total=settings["max_retries"],
+            backoff_factor=settings["backoff_factor"],
+            backoff_jitter=settings["backoff_jitter"],
+            status_forcelist=settings["status_forcelist"],
+            # Resolution requests are read-only, so they are safe to retry
+            allowed_methods=frozenset({"GET", "POST"}),
+            raise_on_status=False,
+        )
+    else:
+        retry = Retry(0, read=False)
+    adapter = HTTPAdapter(
+        pool_connections=settings["pool_connections"],
+        pool_maxsize=settings["pool_maxsize"],
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.mount(
+        f"{UNIX_SCHEME}://",
+        UnixSocketAdapter(pool_maxsize=settings["pool_maxsize"], max_retries=retry),
+    )
+    return session
+
+
+def unix_socket_url(path: str | os.PathLike) -> str:
+    """Return the url of a server listening on the Unix domain socket at
+    ``path``."""
+    return f"{UNIX_SCHEME}://{quote(os.fspath(path), safe='')}"
+
+
+def _connection_pools(session: requests.Session) -> list[tuple[str, Any]]:
+    """Return the connection pools of ``session`` along with the server each
+    one connects to."""
+    pools = []
+    for adapter in set(session.adapters.values()):
+        if isinstance(adapter, UnixSocketAdapter):
+            with adapter._lock:
+                pools.extend(adapter._pools.items())
+        elif isinstance(adapter, HTTPAdapter):
+            for key in adapter.poolmanager.pools.keys():
+                pool = adapter.poolmanager.pools.get(key)
+                if pool is None:  # pragma: no cover
+                    continue
+                pools.append((f"{pool.scheme}://{pool.host}:{pool.port}", pool))
+    return pools
+
+
+class _UnixConnection(HTTPConnection):
+    def __init__(self, *args: Any, socket_path: str, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._socket_path = socket_path
+
+    def _new_conn(self) -> socket.socket:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if isinstance(self.timeout, (int, float)):
+            sock.settimeout(self.timeout)
+        try:
+            sock.connect(self._socket_path)
+        except OSError:
+            sock.close()
+            raise
+        return sock
+
+
+class _UnixConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _UnixConnection
+
+
+class UnixSocketAdapter(HTTPAdapter):
+    """``UnixSocketAdapter`` sends the requests of ``http+unix://`` urls over
+    the Unix domain socket named by their percent-encoded host, so that
+    clients running on the same host as the server skip the TCP stack.
+
+    Connections are kept alive and pooled per socket, like those of
+    ``HTTPAdapter`` are per host.
+    """
+
+    def __init__(self, pool_maxsize: int = 10, **kwargs: Any) -> None:
+        super().__init__(pool_maxsize=pool_maxsize, **kwargs)
+        self._pool_maxsize = pool_maxsize
+        self._pools: dict[str, _UnixConnectionPool] = {}
+        self._lock = threading.Lock()
+
+    def get_connection_with_tls_context(
+        self, request: requests.PreparedRequest, verify: Any, proxies=None, cert=None
+    ) -> _UnixConnectionPool:
+        return self.get_connection(request.url, proxies)
+
+    def get_connection(self, url: str, proxies=None) -> _UnixConnectionPool:
+        socket_path = unquote(urlsplit(url).netloc)
+        with self._lock:
+            pool = self._pools.get(socket_path)
+            if pool is None:
+                pool = self._pools[socket_path] = _UnixConnectionPool(
+                    "localhost",
+                    maxsize=self._pool_maxsize,
+                    socket_path=socket_path,
+                )
+        return pool
+
+    def close(self) -> None:
+        with self._lock:
+            for pool in self._pools.values():
+                pool.close()
+            self._pools.clear()
+        super().close()
+
+
+def _close_session() -> None:
+    global _session_pid
+    if _session_pid == os.getpid():
+        for session in _sessions.values():
+            session.close()
+    _sessions.clear()
+    _session_pid = None
+
+
+def _close_executor() -> None:
+    global _executor, _executor_pid
+    if _executor is not None and _executor_pid == os.getpid():
+        # Requests already sent are left to finish
+        _executor.shutdown(wait=False)
+    _executor = None
+    _executor_pid = None
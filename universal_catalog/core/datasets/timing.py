@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+logger = logging.getLogger(__name__)
+
+# Resolving the entry, building the dataset from it, and using the dataset
+PHASES = ("fetch", "from_config", "load", "save")
+# Where resolved entries came from: the server, the on-disk cache, the
+# process-wide resolution cache, the fetch of another dataset waited on, or a
+# batched request of ``prefetch_datasets``
+SOURCES = ("server", "disk", "memory", "shared", "prefetch")
+
+_lock = threading.Lock()
+_enabled = False
+_timings: dict[str, DatasetTiming] = {}
+
+
+class DatasetTiming:
+    """Time spent in each phase by the ``UniversalCatalogDataset`` of a remote
+    entry, along with the bytes received for it and where its entry came
+    from."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.durations = dict.fromkeys(PHASES, 0.0)
+        self.calls = dict.fromkeys(PHASES, 0)
+        self.sources = dict.fromkeys(SOURCES, 0)
+        self.bytes_received = 0
+
+    @property
+    def total(self) -> float:
+        return sum(self.durations.values())
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "total": self.total,
+            "durations": dict(self.durations),
+            "calls": dict(self.calls),
+            "sources": {name: count for name, count in self.sources.items() if count},
+            "bytes_received": self.bytes_received,
+        }
+
+
+class TimingEvent:
+    """Details of a phase filled in while it runs."""
+
+    __slots__ = ("source", "bytes_received")
+
+    def __init__(self, source: str | None = None) -> None:
+        self.source = source
+        self.bytes_received = 0
+
+
+def configure_timing(enabled: bool = True) -> None:
+    """Enable or disable the timing of the phases of every
+    ``UniversalCatalogDataset``: fetching its entry, building the dataset with
+    ``AbstractDataset.from_config``, and loading or saving data. It is
+    disabled by default.
+
+    Each phase is logged at ``DEBUG`` level by this module's logger, with the
+    ``dataset``, ``phase``, ``duration``, ``source`` and ``bytes_received``
+    attributes set on the log record, and accumulated per dataset, see
+    ``get_timings`` and ``timing_summary``.
+    """
+    global _enabled
+    _enabled = enabled
+
+
+def timing_enabled() -> bool:
+    return _enabled
+
+
+@contextmanager
+def timed(
+    name: str, phase: str, source: str | None = None
+) -> Iterator[TimingEvent | None]:
+    """Time the ``phase`` of dataset ``name`` when timing is enabled, yielding
+    the event to fill in, or ``None`` when timing is disabled."""
+    if not _enabled:
+        yield None
+        return
+    event = TimingEvent(source)
+    start = time.perf_counter()
+    try:
+        yield event
+    finally:
+        record(name, phase, time.perf_counter() - start, event)
+
+
+def record(
+    name: str, phase: str, duration: float, event: TimingEvent | None = None
+) -> None:
+    """Add a phase of dataset ``name`` to its timings, and log it."""
+    event = event or TimingEvent()
+    with _lock:
+        timing = _timings.get(name)
+        if timing is None:
+            timing = _timings[name] = DatasetTiming(name)
+        timing.durations[phase] += duration
+        timing.calls[phase] += 1
+        if event.source is not None:
+            timing.sources[event.source] += 1
+        timing.bytes_received += event.bytes_received
+    logger.debug(
+        "Dataset '%s' %s took %.6fs",
+        name,
+        phase,
+        duration,
+        extra={
+            "dataset": name,
+            "phase": phase,
+            "duration": duration,
+            "source": event.source,
+            "bytes_received": event.bytes_received,
+        },
+    )
+
+
+def record_source(name: str, source: str) -> None:
+    """Count an entry of dataset ``name`` resolved outside of its ``fetch``
+    phase, e.g. by a batched request."""
+    if not _enabled:
+        return
+    with _lock:
+        timing = _timings.get(name)
+        if timing is None:
+            timing = _timings[name] = DatasetTiming(name)
+        timing.sources[source] += 1
+
+
+def get_timings() -> dict[str, dict[str, Any]]:
+    """Return the timings recorded for each dataset, by source name."""
+    with _lock:
+        return {name: timing.to_dict() for name, timing in _timings.items()}
+
+
+def reset_timings() -> None:
+    """Forget the recorded timings, e.g. at the start of a run."""
+    with _lock:
+        _timings.clear()
+
+
+def timing_summary(limit: int = 10) -> str:
+    """Describe the ``limit`` remote datasets that took the longest, with the
+    time spent in each phase."""
+    with _lock:
+        timings = sorted(_timings.values(), key=lambda t: t.total, reverse=True)
+    if not timings:
+        return "No remote dataset was timed"
+    lines = [
+        f"Slowest remote datasets ({min(limit, len(timings))} of {len(timings)}):",
+        f"{'dataset':<40} {'total':>9} "
+        + " ".join(f"{phase:>11}" for phase in PHASES)
+        + f" {'received':>10}  sources",
+    ]
+    for timing in timings[:limit]:
+        sources = ", ".join(
+            f"{source} {count}" for source, count in timing.sources.items() if count
+        )
+        lines.append(
+            f"{timing.name:<40} {timing.total:>8.3f}s "
+            + " ".join(f"{timing.durations[phase]:>10.3f}s" for phase in PHASES)
+            + f" {_format_size(timing.bytes_received):>10}  {sources or '-'}"
+        )
+    return "\n".join(lines)
+
+
+def _format_size(size: int) -> str:
+    if size < 1024:
+        return f"{size} B"
+    if size < 1024 * 1024:
+        return f"{size / 1024:.1f} KiB"
+    return f"{size / 1024 / 1024:.1f} MiB"
@@ -1,13 +1,16 @@
 from __future__ import annotations
 
 from typing import Any
+from urllib.parse import quote
 
 import requests
 from kedro.io.core import AbstractDataset, DatasetError
 
 import json
 
-from .utils import _execute_request
+from . import cache, replicas, resolution, timing
+from .replicas import replica_key, replica_urls
+from .utils import _decode_response, _route_missing
 
 
 class UniversalCatalogDataset(AbstractDataset):
@@ -41,26 +44,96 @@ class UniversalCatalogDataset(AbstractDataset):
 
     """
 
-    def __init__(self, url: str, source_name: str):
-        self._url = f"{url}/dataset/"
+    def __init__(self, url: str | list[str], source_name: str):
+        self._replicas = replica_urls(url)
+        self._base_url = replica_key(url)
         self._source_name = source_name
         self._dataset = None
+        self._config: dict[str, Any] | None = None
+
+    def __getstate__(self) -> dict[str, Any]:
+        # Only the resolved entry is pickled, e.g. for ``ParallelRunner``
+        # workers, which rebuild the dataset from it without asking the server
+        # again. The dataset itself may hold clients or connections that can't
+        # be shared with another process.
+        state = self.__dict__.copy()
+        state["_dataset"] = None
+        if state["_config"] is None:
+            state["_config"] = resolution.peek(self._base_url, self._source_name)
+        return state
 
     def _materialize(self):
         if not self._dataset:
-            request_body = dict(name=self._source_name)
-            _config: dict[str, Any] = _execute_request(self._url, request_body).json()
+            self._set_config(self._resolve())
+
+    def _resolve(self) -> dict[str, Any]:
+        """Return the entry of the dataset, resolving it when needed."""
+        if self._config is not None:
+            return self._config
+        # Until ``_fetch`` is called, the entry comes from the resolution cache,
+        # or from the fetch of another dataset when waiting on it
+        with timing.timed(self._source_name, "fetch", "memory") as event:
+
+            def shared():
+                if event is not None:
+                    event.source = "shared"
+
+            return resolution.resolve(
+                self._base_url, self._source_name, lambda: self._fetch(event), shared
+            )
+
+    def _fetch(self, event: timing.TimingEvent | None = None) -> dict[str, Any]:
+        cached = cache.lookup(self._replicas, cache.ENTRY, [self._source_name])
+        if self._source_name in cached:
+            if event is not None:
+                event.source = "disk"
+            return cached[self._source_name]
+        pinned = cache.known_version(self._replicas)
+        response = self._request_entry(pinned)
+        version = cache.observe_version(self._replicas, response, pinned)
+        if event is not None:
+            event.source = "server"
+            event.bytes_received += len(response.content)
+        _config: dict[str, Any] = _decode_response(response)
+        cache.store(self._replicas, cache.ENTRY, {self._source_name: _config}, version)
+        return _config
+
+    def _request_entry(self, version: str | None = None) -> requests.Response:
+        """Ask for the entry with a ``GET`` that caching proxies can answer,
+        pinned to ``version``, the catalog version the server announced last,
+        so that cached answers are never older than that version."""
+        try:
+            return replicas.request(
+                self._replicas,
+                f"/dataset/{quote(self._source_name, safe='')}",
+                None,
+                method="GET",
+                params={"version": version} if version else None,
+            )
+        except DatasetError as exc:
+            if not _route_missing(exc):
+                raise
+        # Servers that predate ``GET /dataset/{name}``
+        request_body = dict(name=self._source_name)
+        return replicas.request(self._replicas, "/dataset/", request_body)
+
+    def _set_config(self, config: dict[str, Any]) -> None:
+        """Build the underlying dataset from an already resolved entry."""
+        self._config = config
+        with timing.timed(self._source_name, "from_config"):
             self._dataset = AbstractDataset.from_config(
-                name=self._source_name, config=_config
+                name=self._source_name, config=config
             )
 
     def _load(self):
         self._materialize()
-        return self._dataset.load()
+        with timing.timed(self._source_name, "load"):
+            return self._dataset.load()
 
     def _save(self, data):
         self._materialize()
-        self._dataset.save(data)
+        with timing.timed(self._source_name, "save"):
+            self._dataset.save(data)
 
     def _describe(self):
         self._materialize()
@@ -1,14 +1,43 @@
 from __future__ import annotations
 
 import requests
-import json
+
+from typing import Any
 
 from kedro.io.core import DatasetError
 
+from .session import get_session, get_timeout
+from ..encoding import (
+    JSON,
+    MSGPACK,
+    available_media_types,
+    dumps_json,
+    loads_json,
+    loads_msgpack,
+)
+
+# Binary encodings are preferred when the server supports them
+ACCEPT = ", ".join(available_media_types())
+
 
-def _execute_request(url: str, json_obj: dict[str, str] | None) -> requests.Response:
+def _execute_request(
+    url: str,
+    json_obj: dict[str, Any] | None,
+    method: str = "POST",
+    params: dict[str, Any] | None = None,
+    headers: dict[str, str] | None = None,
+    stream: bool = False,
+    retries: bool = True,
+) -> requests.Response:
+    headers = {"Accept": ACCEPT, **(headers or {})}
+    session = get_session(retries)
+    options = dict(params=params, headers=headers, stream=stream, timeout=get_timeout())
     try:
-        response = requests.post(url, data=json.dumps(json_obj))
+        if method == "GET":
+            response = session.get(url, **options)
+        else:
+            headers["Content-Type"] = JSON
+            response = session.post(url, data=dumps_json(json_obj), **options)
         response.raise_for_status()
     except requests.exceptions.HTTPError as exc:
         raise DatasetError("Failed to fetch data", exc) from exc
@@ -16,3 +45,33 @@ def _execute_request(url: str, json_obj: dict[str, str] | None) -> requests.Resp
         raise DatasetError("Failed to connect to the remote server", exc) from exc
 
     return response
+
+
+def _route_missing(error: DatasetError) -> bool:
+    """Whether ``error`` is the answer of a server that predates the route
+    it was asked for, rather than of the route itself."""
+    cause = error.__cause__
+    if not isinstance(cause, requests.exceptions.HTTPError):
+        return False
+    response = cause.response
+    if response is None or response.status_code not in (404, 405):
+        return False
+    if response.status_code == 405:
+        return True
+    try:
+        # Unknown routes get the default answer of the framework, unknown
+        # datasets get the name in the detail
+        return loads_json(response.content) == {"detail": "Not Found"}
+    except ValueError:
+        return False
+
+
+def _decode_response(response: requests.Response) -> Any:
+    """Deserialize a JSON or MessagePack response body.
+
+    Raises:
+        ValueError: When the body can't be deserialized.
+    """
+    if response.headers.get("content-type", "").startswith(MSGPACK):
+        return loads_msgpack(response.content)
+    return loads_json(response.content)
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import zlib
+
+from typing import Any, Iterable, Iterator
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+
+
+def dumps_json(obj: Any) -> bytes:
+    """Serialize ``obj`` to JSON bytes, with ``orjson`` when it is installed.
+    Mapping keys that aren't strings, e.g. the column numbers of
+    ``load_args``, are serialized like ``json.dumps`` does."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(  # pragma: no cover
+        obj, default=str, ensure_ascii=False, separators=(",", ":")
+    ).encode()
+
+
+def loads_json(data: bytes | str) -> Any:
+    """Deserialize JSON bytes, with ``orjson`` when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)  # pragma: no cover
+
+
+def content_hash(obj: Any) -> str:
+    """Return a stable hash of a JSON-like object, independent of key order."""
+    payload = json.dumps(obj, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+
+def dumps_msgpack(obj: Any) -> bytes:
+    """Serialize ``obj`` to MessagePack, requires ``msgpack``."""
+    return msgpack.packb(obj, default=str)
+
+
+def loads_msgpack(data: bytes) -> Any:
+    """Deserialize MessagePack bytes, requires ``msgpack``."""
+    return msgpack.unpackb(data)
+
+
+def available_media_types() -> tuple[str, ...]:
+    """Media types catalog payloads can be encoded to, preferred first."""
+    return (MSGPACK, JSON) if msgpack is not None else (JSON,)
+
+
+def available_encodings() -> tuple[str, ...]:
+    """Content encodings payloads can be compressed with, preferred first."""
+    return ("zstd", "gzip") if zstandard is not None else ("gzip",)
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    """Compress ``data`` with the content encoding ``encoding``."""
+    if encoding == "zstd":
+        return zstandard.ZstdCompressor().compress(data)
+    return gzip.compress(data, compresslevel=6, mtime=0)
+
+
+def compress_stream(chunks: Iterable[bytes], encoding: str) -> Iterator[bytes]:
+    """Compress a stream of ``chunks`` with the content encoding ``encoding``."""
+    if encoding == "zstd":
+        compressor = zstandard.ZstdCompressor().compressobj()
+    else:
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
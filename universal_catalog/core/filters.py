@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import re
+
+from fnmatch import fnmatchcase
+from typing import Any
+
+from kedro.io.data_catalog import DataCatalog
+
+FILTER_KEYS = ("prefix", "glob", "namespace")
+
+_WILDCARDS = re.compile(r"[*?\[]")
+
+
+def catalog_filters(
+    prefix: str | None = None, glob: str | None = None, namespace: str | None = None
+) -> dict[str, str]:
+    """Return the filters that are set, as sent in a ``/catalog/`` query."""
+    filters = {"prefix": prefix, "glob": glob, "namespace": namespace}
+    return {key: value for key, value in filters.items() if value is not None}
+
+
+def name_matches(
+    name: str,
+    prefix: str | None = None,
+    glob: str | None = None,
+    namespace: str | None = None,
+) -> bool:
+    """Whether ``name`` passes every filter that is set.
+
+    Args:
+        name: A catalog entry name.
+        prefix: Names must start with ``prefix``.
+        glob: Names must match the ``fnmatch`` style pattern ``glob``.
+        namespace: Names must belong to the Kedro namespace ``namespace``,
+            e.g. ``france`` for ``france.companies``.
+    """
+    if prefix is not None and not name.startswith(prefix):
+        return False
+    if namespace is not None and not name.startswith(f"{namespace}."):
+        return False
+    if glob is not None and not fnmatchcase(name, glob):
+        return False
+    return True
+
+
+def literal_prefix(
+    prefix: str | None = None, glob: str | None = None, namespace: str | None = None
+) -> str:
+    """Return the longest prefix every matching name must start with."""
+    candidates = [
+        prefix or "",
+        f"{namespace}." if namespace is not None else "",
+        _WILDCARDS.split(glob, 1)[0] if glob is not None else "",
+    ]
+    return max(candidates, key=len)
+
+
+def pattern_may_match(pattern: str, **filters: Any) -> bool:
+    """Whether the dataset factory ``pattern`` may resolve names passing
+    ``filters``, judging from its literal prefix."""
+    pattern_prefix = pattern.split("{", 1)[0]
+    required = literal_prefix(**filters)
+    return pattern_prefix.startswith(required) or required.startswith(pattern_prefix)
+
+
+def entry_selected(name: str, **filters: Any) -> bool:
+    """Whether the catalog entry ``name``, a dataset or a dataset factory
+    pattern, is selected by ``filters``."""
+    if DataCatalog._is_pattern(name):
+        return pattern_may_match(name, **filters)
+    return name_matches(name, **filters)
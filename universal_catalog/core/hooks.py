@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import logging
+
+from kedro.framework.hooks import hook_impl
+from kedro.io import DataCatalog
+
+from .datasets.prefetch import DEFAULT_BATCH_SIZE, prefetch_datasets
+from .datasets.timing import configure_timing, reset_timings, timing_summary
+
+logger = logging.getLogger(__name__)
+
+
+class PrefetchHooks:
+    """Kedro hooks that resolve every ``UniversalCatalogDataset`` in the
+    catalog with batched requests as soon as the catalog is created, instead
+    of one request per dataset the first time each one is used.
+
+    Register them in your project's ``settings.py``:
+
+    .. code-block:: python
+
+        from universal_catalog import PrefetchHooks
+
+        HOOKS = (PrefetchHooks(),)
+    """
+
+    def __init__(self, batch_size: int = DEFAULT_BATCH_SIZE):
+        self._batch_size = batch_size
+
+    @hook_impl
+    def after_catalog_created(self, catalog: DataCatalog) -> None:
+        prefetch_datasets(catalog, self._batch_size)
+
+
+class TimingHooks:
+    """Kedro hooks that time every ``UniversalCatalogDataset`` of a run, and
+    log a summary of the slowest ones when the run ends, with the time spent
+    fetching their entry, building the dataset and loading or saving data.
+
+    Register them in your project's ``settings.py``:
+
+    .. code-block:: python
+
+        from universal_catalog import TimingHooks
+
+        HOOKS = (TimingHooks(),)
+
+    Args:
+        limit: Number of datasets in the summary.
+    """
+
+    def __init__(self, limit: int = 10):
+        self._limit = limit
+
+    @hook_impl
+    def after_context_created(self) -> None:
+        # Before the catalog is created, so that prefetching is timed too
+        configure_timing(True)
+        reset_timings()
+
+    @hook_impl
+    def after_pipeline_run(self) -> None:
+        logger.info(timing_summary(self._limit))
+
+    @hook_impl
+    def on_pipeline_error(self) -> None:
+        logger.info(timing_summary(self._limit))
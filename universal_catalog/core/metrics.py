@@ -0,0 +1,339 @@
+"""Metrics of the catalog server, exposed in the Prometheus text format.
+
+Metrics are kept in process, without any dependency, and updating one only
+costs a dictionary lookup and a lock, so they can stay on in production. With
+several workers each process keeps its own metrics, and a scrape only reports
+the worker that answered it.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+
+from bisect import bisect_left
+from typing import Any, Iterable, Iterator
+
+PROMETHEUS = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+SIZE_BUCKETS = (64, 256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+LOAD_BUCKETS = (0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Iterable[str] = ()
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: dict[tuple[str, ...], Any] = {}
+        self._lock = threading.Lock()
+        _metrics.append(self)
+
+    def labels(self, *values: str) -> Any:
+        """Return the child of this metric with label ``values``, created the
+        first time it is asked for."""
+        value = self._values.get(values)
+        if value is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(
+                    f"'{self.name}' expects labels {', '.join(self.labelnames)}"
+                )
+            with self._lock:
+                value = self._values.setdefault(values, self._child())
+        return value
+
+    def reset(self) -> None:
+        # Children are zeroed rather than dropped, callers may hold them
+        for child in list(self._values.values()):
+            child.reset()
+
+    def collect(self, extra_labels: str = "") -> Iterator[str]:
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} {self.kind}"
+        for values, child in list(self._values.items()):
+            labels = _format_labels(self.labelnames, values, extra_labels)
+            yield from child.collect(self.name, labels)
+
+    def _child(self) -> Any:
+        raise NotImplementedError
+
+
+class _Value:
+    __slots__ = ("value", "_lock")
+
+    def __init__(self) -> None:
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def reset(self) -> None:
+        self.value = 0.0
+
+    def collect(self, name: str, labels: str) -> Iterator[str]:
+        yield f"{name}{_braces(labels)} {_format_number(self.value)}"
+
+
+class Counter(_Metric):
+    """Number of events, only ever increasing."""
+
+    kind = "counter"
+
+    def _child(self) -> _Value:
+        return _Value()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+
+class Gauge(_Metric):
+    """Value that goes up and down."""
+
+    kind = "gauge"
+
+    def _child(self) -> _Value:
+        return _Value()
+
+    def set(self, value: float) -> None:
+        self.labels().set(value)
+
+
+class _Buckets:
+    __slots__ = ("bounds", "counts", "sum", "_lock")
+
+    def __init__(self, bounds: tuple[float, ...]) -> None:
+        self.bounds = bounds
+        # The last count is for observations above every bound
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    def reset(self) -> None:
+        with self._lock:
+            self.counts = [0] * len(self.counts)
+            self.sum = 0.0
+
+    def collect(self, name: str, labels: str) -> Iterator[str]:
+        with self._lock:
+            counts, total = list(self.counts), self.sum
+        separator = "," if labels else ""
+        cumulative = 0
+        for bound, count in zip((*self.bounds, "+Inf"), counts):
+            cumulative += count
+            if bound != "+Inf":
+                bound = _format_number(float(bound))
+            yield f'{name}_bucket{{{labels}{separator}le="{bound}"}} {cumulative}'
+        yield f"{name}_sum{_braces(labels)} {_format_number(total)}"
+        yield f"{name}_count{_braces(labels)} {cumulative}"
+
+
+class Histogram(_Metric):
+    """Distribution of observed values, counted in cumulative ``buckets``."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = LATENCY_BUCKETS,
+    ) -> None:
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _child(self) -> _Buckets:
+        return _Buckets(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+
+_metrics: list[_Metric] = []
+_enabled = True
+
+REQUESTS = Counter(
+    "universal_catalog_requests_total",
+    "Requests handled, by endpoint and status code.",
+    ("method", "endpoint", "status"),
+)
+REQUEST_DURATION = Histogram(
+    "universal_catalog_request_duration_seconds",
+    "Time spent handling requests, by endpoint.",
+    ("method", "endpoint"),
+)
+RESPONSE_SIZE = Histogram(
+    "universal_catalog_response_size_bytes",
+    "Size of the response bodies sent, after compression, by endpoint.",
+    ("method", "endpoint"),
+    buckets=SIZE_BUCKETS,
+)
+LOOKUPS = Counter(
+    "universal_catalog_lookups_total",
+    "Catalog lookups, by whether the name is an explicit entry, resolves from "
+    "a dataset factory pattern or is not found.",
+    ("result",),
+)
+RESOLUTION_CACHE = Counter(
+    "universal_catalog_resolution_cache_total",
+    "Lookups of names that are not explicit entries, by whether their "
+    "resolution was cached.",
+    ("result",),
+)
+SUGGESTION_DURATION = Histogram(
+    "universal_catalog_suggestion_duration_seconds",
+    "Time spent suggesting names similar to the ones not found.",
+)
+CATALOG_ENTRIES = Gauge(
+    "universal_catalog_entries",
+    "Entries of the catalog in service, dataset factory patterns included.",
+)
+CATALOG_LOAD_DURATION = Gauge(
+    "universal_catalog_load_duration_seconds",
+    "Time spent loading the catalog in service, by phase.",
+    ("phase",),
+)
+RELOADS = Counter(
+    "universal_catalog_reloads_total",
+    "Catalog reloads, by whether the new catalog was put in service.",
+    ("result",),
+)
+RELOAD_DURATION = Histogram(
+    "universal_catalog_reload_duration_seconds",
+    "Time spent reloading the catalog.",
+    buckets=LOAD_BUCKETS,
+)
+
+
+def configure_metrics(enabled: bool = True) -> None:
+    """Enable or disable the catalog lookup metrics, counted on every lookup.
+    They are enabled by default; servers that don't expose their metrics turn
+    them off so that lookups don't pay for them."""
+    global _enabled
+    _enabled = enabled
+
+
+def metrics_enabled() -> bool:
+    return _enabled
+
+
+def observe_catalog(catalog: Any) -> None:
+    """Record the size and the load timings of the catalog put in service."""
+    CATALOG_ENTRIES.set(len(catalog.get_catalog() or {}))
+    for phase, duration in catalog.load_timings.items():
+        CATALOG_LOAD_DURATION.labels(phase).set(duration)
+
+
+def render_metrics(labels: dict[str, str] | None = None) -> str:
+    """Return every metric in the Prometheus text format, with ``labels``
+    added to all of them."""
+    extra_labels = ",".join(
+        f'{name}="{_escape(value)}"' for name, value in (labels or {}).items()
+    )
+    lines = []
+    for metric in _metrics:
+        lines.extend(metric.collect(extra_labels))
+    return "\n".join(lines) + "\n"
+
+
+def reset_metrics() -> None:
+    """Forget every recorded value."""
+    for metric in _metrics:
+        metric.reset()
+
+
+class MetricsMiddleware:
+    """ASGI middleware counting requests and timing them by endpoint, and
+    measuring the size of their responses.
+
+    Endpoints are named after the path of the route that handled the request,
+    requests matching no route are counted as ``other``.
+    """
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+
+    async def __call__(self, scope: dict, receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+        size = 0
+
+        async def send_counted(message: dict) -> None:
+            nonlocal status, size
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_counted)
+        finally:
+            # The router sets the matched route in the scope
+            endpoint = getattr(scope.get("route"), "path", "other")
+            method = scope["method"]
+            REQUESTS.labels(method, endpoint, str(status)).inc()
+            REQUEST_DURATION.labels(method, endpoint).observe(
+                time.perf_counter() - start
+            )
+            RESPONSE_SIZE.labels(method, endpoint).observe(size)
+
+
+def _format_labels(
+    names: tuple[str, ...], values: tuple[str, ...], extra_labels: str
+) -> str:
+    labels = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra_labels:
+        labels.append(extra_labels)
+    return ",".join(labels)
+
+
+def _braces(labels: str) -> str:
+    return f"{{{labels}}}" if labels else ""
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_number(value: float) -> str:
+    if value == int(value) and abs(value) < 1e15:
+        return str(int(value))
+    return repr(value)
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import Any, Iterable
+
+from kedro.io.core import DatasetError
+from parse import Result, compile as compile_pattern
+
+
+class PatternIndex:
+    """``PatternIndex`` matches dataset names against dataset factory patterns
+    with the same precedence as ``DataCatalog._match_pattern``, without trying
+    every pattern on every lookup.
+
+    Patterns are grouped by their literal prefix, the text before their first
+    placeholder, and compiled the first time a name is parsed against them. A
+    name is only parsed against the patterns whose prefix it starts with, in
+    the order the patterns were given.
+
+    Args:
+        patterns: Dataset factory patterns, sorted by precedence.
+        buckets: Positions of the patterns by lowercase prefix, as returned by
+            ``buckets``, when they were already computed, e.g. by the process
+            that wrote a catalog snapshot.
+    """
+
+    def __init__(
+        self, patterns: Iterable[str], buckets: dict[str, list[int]] | None = None
+    ):
+        self._patterns = list(patterns)
+        self._parsers: list[Any] = [None] * len(self._patterns)
+        if buckets is None:
+            buckets = defaultdict(list)
+            for position, pattern in enumerate(self._patterns):
+                prefix = pattern.split("{", 1)[0]
+                # ``parse`` ignores case, non ASCII prefixes are kept out of the
+                # index as ``str.lower`` does not fold them the same way
+                buckets[prefix.lower() if prefix.isascii() else ""].append(position)
+        self._buckets = dict(buckets)
+        self._prefix_lengths = sorted({len(prefix) for prefix in self._buckets})
+
+    def __len__(self) -> int:
+        return len(self._patterns)
+
+    @property
+    def buckets(self) -> dict[str, list[int]]:
+        return self._buckets
+
+    def match(self, dataset_name: str) -> tuple[str, Result] | None:
+        """Return the first pattern matching ``dataset_name`` along with the
+        parsed placeholders, or ``None`` when no pattern matches."""
+        for position in self._candidates(dataset_name):
+            result = self._parser(position).parse(dataset_name)
+            if result:
+                return self._patterns[position], result
+        return None
+
+    def _parser(self, position: int) -> Any:
+        parser = self._parsers[position]
+        if parser is None:
+            # Compiling is idempotent, threads racing here are harmless
+            parser = self._parsers[position] = compile_pattern(self._patterns[position])
+        return parser
+
+    def _candidates(self, dataset_name: str) -> Iterable[int]:
+        if not dataset_name.isascii():
+            return range(len(self._patterns))
+        lowered = dataset_name.lower()
+        candidates = []
+        for length in self._prefix_lengths:
+            if length > len(lowered):
+                break
+            candidates.extend(self._buckets.get(lowered[:length], ()))
+        return sorted(candidates)
+
+
+def resolve_config(config: Any, pattern: str, result: Result) -> Any:
+    """Fill the placeholders of a factory ``config`` with the values parsed from
+    a dataset name, like ``DataCatalog._resolve_config`` but without parsing
+    the name again for every value and without mutating ``config``."""
+    if isinstance(config, dict):
+        return {
+            key: resolve_config(value, pattern, result) for key, value in config.items()
+        }
+    if isinstance(config, (list, tuple)):
+        return [resolve_config(value, pattern, result) for value in config]
+    if isinstance(config, str) and "}" in config:
+        try:
+            return config.format_map(result.named)
+        except KeyError as exc:
+            raise DatasetError(
+                f"Unable to resolve '{config}' from the pattern '{pattern}'. Keys used in the configuration "
+                f"should be present in the dataset factory pattern."
+            ) from exc
+    return config
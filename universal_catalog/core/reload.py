@@ -0,0 +1,225 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+
+from collections import OrderedDict
+from pathlib import Path
+
+from .metrics import RELOAD_DURATION, RELOADS, observe_catalog
+from .snapshot import write_snapshot
+from .universal_catalog import UniversalCatalog, catalog_file, load_catalog
+from .validation import CatalogValidator
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HISTORY_SIZE = 32
+
+# Set by the primary process of a multi-worker server to the path of the
+# catalog snapshot its workers serve
+SNAPSHOT_ENV = "UNIVERSAL_CATALOG_SNAPSHOT"
+
+
+class CatalogReloader:
+    """``CatalogReloader`` holds the ``UniversalCatalog`` served by the server
+    and swaps in a new one whenever ``catalog.yml`` changes.
+
+    The current catalog is a single reference, replaced only once the new one
+    is fully loaded and indexed, so readers never wait on a reload and always
+    see one complete snapshot. Only the entries that changed are validated
+    again, and a catalog that fails to load is logged and ignored, leaving the
+    previous one in service.
+
+    The content hashes of the entries of the last ``history_size`` catalogs
+    are kept, so that clients can ask for the changes made since the version
+    they hold, see ``changes_json``.
+
+    With a ``snapshot_path``, every catalog put in service is also written to
+    that snapshot, which the workers of a multi-worker server serve through a
+    ``SnapshotReloader``.
+
+    Example:
+    ::
+
+        >>> reloader = CatalogReloader(CONFIG_LOCATION, interval=2)
+        >>> reloader.start()
+        >>> catalog = reloader.catalog
+
+    Args:
+        config_path: Same as for ``load_catalog``.
+        environment: Same as for ``load_catalog``.
+        interval: Seconds between two checks of the catalog file.
+        validator: Validator used for every load, see ``CatalogValidator``.
+        history_size: Number of catalog versions remembered.
+        snapshot_path: Snapshot the catalogs are written to.
+    """
+
+    def __init__(
+        self,
+        config_path: dict[str, Path],
+        environment: str = "base",
+        interval: float = 2.0,
+        validator: CatalogValidator | None = None,
+        history_size: int = DEFAULT_HISTORY_SIZE,
+        snapshot_path: str | Path | None = None,
+    ):
+        self._config_path = config_path
+        self._environment = environment
+        self._validator = validator
+        self.snapshot_path = Path(snapshot_path) if snapshot_path else None
+        self._path = self._watched_path()
+        self._interval = interval
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._signature = self._file_signature()
+        self._catalog = self._load(previous=None)
+        observe_catalog(self._catalog)
+        self._history_size = history_size
+        # Entry hashes of each known version, ``version -> {name: hash}``
+        self._history: OrderedDict[str, dict[str, str]] = OrderedDict()
+        self._remember(self._catalog)
+        self.last_reload_duration: float | None = None
+        self.last_error: Exception | None = None
+
+    @property
+    def catalog(self) -> UniversalCatalog:
+        """The catalog currently in service."""
+        return self._catalog
+
+    def reload(self) -> bool:
+        """Load the catalog again and swap it in.
+
+        Returns: bool
+            Whether the new catalog is now in service.
+        """
+        with self._lock:
+            signature = self._file_signature()
+            start = time.perf_counter()
+            try:
+                catalog = self._load(previous=self._catalog)
+            except Exception as exc:
+                self.last_error = exc
+                RELOADS.labels("failure").inc()
+                logger.error(
+                    "Failed to reload the catalog, keeping the current one: %s", exc
+                )
+                return False
+            finally:
+                self._signature = signature
+            self._catalog = catalog
+            self._remember(catalog)
+            self.last_error = None
+            self.last_reload_duration = time.perf_counter() - start
+            observe_catalog(catalog)
+            RELOADS.labels("success").inc()
+            RELOAD_DURATION.observe(self.last_reload_duration)
+            logger.info(
+                "Reloaded the catalog in %.3fs, version %s",
+                self.last_reload_duration,
+                catalog.version,
+            )
+            return True
+
+    def changes_json(self, since: str, **filters: str | None) -> bytes:
+        """Serialize the changes made to the catalog in service since version
+        ``since``, or the whole catalog when that version is not remembered.
+        See ``UniversalCatalog.changes_json``."""
+        catalog = self._catalog
+        return catalog.changes_json(since, self._history.get(since), **filters)
+
+    def check(self) -> bool:
+        """Reload the catalog if its file changed since the last load.
+
+        Returns: bool
+            Whether a new catalog is now in service.
+        """
+        if self._file_signature() == self._signature:
+            return False
+        return self.reload()
+
+    def start(self) -> None:
+        """Watch the catalog file from a background thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._watch, name="catalog-reloader", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop watching the catalog file."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self._interval):
+            self.check()
+
+    def _watched_path(self) -> Path:
+        return catalog_file(self._config_path, self._environment)
+
+    def _load(self, previous: UniversalCatalog | None) -> UniversalCatalog:
+        catalog = load_catalog(
+            self._config_path,
+            self._environment,
+            previous=previous,
+            validator=self._validator,
+        )
+        if self.snapshot_path is not None:
+            write_snapshot(catalog, self.snapshot_path)
+        return catalog
+
+    def _remember(self, catalog: UniversalCatalog) -> None:
+        self._history[catalog.version] = catalog._entry_versions
+        self._history.move_to_end(catalog.version)
+        while len(self._history) > self._history_size:
+            self._history.popitem(last=False)
+
+    def _file_signature(self) -> tuple[int, int] | None:
+        try:
+            stat = self._path.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+
+class SnapshotReloader(CatalogReloader):
+    """``SnapshotReloader`` serves the catalog snapshot written by the
+    ``CatalogReloader`` of the primary process of a multi-worker server, and
+    maps the new snapshot whenever the primary writes one.
+
+    Workers neither parse nor validate the catalog, and share the pages of the
+    snapshot instead of each holding a copy, see
+    ``UniversalCatalog.from_snapshot``. They remember the versions they served
+    since they started.
+
+    Args:
+        snapshot_path: Snapshot written by the primary process.
+        interval: Seconds between two checks of the snapshot.
+        history_size: Number of catalog versions remembered.
+    """
+
+    def __init__(
+        self,
+        snapshot_path: str | Path,
+        interval: float = 2.0,
+        history_size: int = DEFAULT_HISTORY_SIZE,
+    ):
+        # Workers have no catalog file of their own, they watch the snapshot
+        super().__init__(
+            {},
+            interval=interval,
+            history_size=history_size,
+            snapshot_path=snapshot_path,
+        )
+
+    def _watched_path(self) -> Path:
+        return self.snapshot_path
+
+    def _load(self, previous: UniversalCatalog | None) -> UniversalCatalog:
+        return UniversalCatalog.from_snapshot(self.snapshot_path)
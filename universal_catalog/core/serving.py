@@ -1,8 +1,50 @@
+from __future__ import annotations
+
+import os
+import socket
+import stat
+
 from pathlib import Path
 from omegaconf import OmegaConf
+from fastapi import Request, Response
+from fastapi.responses import StreamingResponse
 
 from typing import Any, Dict
 
+from .encoding import (
+    JSON,
+    MSGPACK,
+    available_encodings,
+    available_media_types,
+    compress,
+    compress_stream,
+    content_hash,
+    dumps_json,
+    dumps_msgpack,
+    loads_json,
+)
+from .filters import catalog_filters
+from .universal_catalog import UniversalCatalog, _LRUCache
+
+NDJSON = "application/x-ndjson"
+
+# Responses differ with the negotiated media type and content encoding
+VARY = "Accept, Accept-Encoding"
+
+# Smaller payloads are sent uncompressed, compressing them saves nothing
+MIN_COMPRESSED_SIZE = 512
+
+# Responses of URLs pinned to the catalog version they were served from never
+# change, shared caches may keep them for as long as they like
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+# Seconds during which shared caches may serve unpinned ``GET`` responses
+DEFAULT_MAX_AGE = 5
+
+_ENCODED_CACHE_SIZE = 256
+# Encoded bodies of tagged responses, ``"etag|media type|encoding" -> bytes``
+_encoded = _LRUCache(_ENCODED_CACHE_SIZE)
+
 
 def load_server_settings(
     config_path: Dict[str, Path], environment: str = "base"
@@ -10,3 +52,258 @@ def load_server_settings(
     server_settings_path = config_path.get("path") / f"{environment}/serving.yml"
     _server_settings = OmegaConf.load(server_settings_path)
     return OmegaConf.to_object(_server_settings)
+
+
+def remove_stale_socket(path: str | os.PathLike) -> None:
+    """Remove the Unix domain socket at ``path`` left behind by a server that
+    is no longer running, so that a new one can listen on it.
+
+    Raises:
+        OSError: When a server still listens on ``path``, or ``path`` is not
+            a socket.
+    """
+    try:
+        mode = os.stat(path).st_mode
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(mode):
+        raise OSError(f"'{os.fspath(path)}' exists and is not a socket")
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(os.fspath(path))
+        except ConnectionRefusedError:
+            os.remove(path)
+            return
+    raise OSError(f"A server is already listening on '{os.fspath(path)}'")
+
+
+def cache_control_header(
+    catalog_version: str, version: str | None, max_age: int = DEFAULT_MAX_AGE
+) -> str:
+    """``Cache-Control`` header of a cacheable ``GET`` response.
+
+    Args:
+        catalog_version: Version of the catalog the response is built from.
+        version: Catalog version the request URL is pinned to, if any.
+        max_age: Seconds during which responses of unpinned URLs are fresh.
+
+    Returns: str
+        ``IMMUTABLE`` when the URL is pinned to ``catalog_version``, a short
+        ``max-age`` for unpinned URLs, and ``no-cache`` for URLs pinned to
+        another version, whose response is not the one they name.
+    """
+    if version is None:
+        return f"public, max-age={max_age}"
+    if version == catalog_version:
+        return IMMUTABLE
+    return "no-cache"
+
+
+def etag_response(
+    request: Request,
+    etag: str,
+    content: Any,
+    catalog_version: str | None = None,
+    media_type: str | None = None,
+    cache_control: str = "no-cache",
+) -> Response:
+    """Build a response tagged with ``etag``, or an empty ``304 Not Modified``
+    when the request's ``If-None-Match`` header already holds that tag.
+
+    Args:
+        request: The incoming request.
+        etag: Content hash of the response, sent quoted in the ``ETag`` header.
+        content: Body of the response. ``str`` and ``bytes`` are sent as is,
+            anything else is encoded as JSON. Passing pre-serialized bytes
+            avoids encoding the same payload on every request.
+        catalog_version: Version of the served catalog, sent in the
+            ``X-Catalog-Version`` header.
+        media_type: Media type of ``str`` and ``bytes`` contents.
+        cache_control: ``Cache-Control`` header of the response, see
+            ``cache_control_header``.
+
+    Returns: Response
+    """
+    if not isinstance(content, (str, bytes)):
+        content = dumps_json(content)
+        media_type = JSON
+    response_type, encoding = _representation(request, content, media_type)
+    # Each representation of the content gets its own tag
+    suffixes = [response_type == MSGPACK and "msgpack", encoding]
+    tag = f'"{"-".join([etag, *filter(None, suffixes)])}"'
+    headers = {"ETag": tag, "Cache-Control": cache_control, "Vary": VARY}
+    if catalog_version is not None:
+        headers["X-Catalog-Version"] = catalog_version
+    if _etag_matches(request.headers.get("if-none-match"), tag):
+        return Response(status_code=304, headers=headers)
+    return encoded_response(
+        request, content, media_type=media_type, headers=headers, cache_key=tag
+    )
+
+
+def encoded_response(
+    request: Request,
+    content: str | bytes,
+    media_type: str | None = JSON,
+    headers: dict[str, str] | None = None,
+    cache_key: str | None = None,
+) -> Response:
+    """Build a response with ``content`` encoded as the client asked for.
+
+    JSON contents are sent as MessagePack to clients accepting
+    ``application/msgpack``, when ``msgpack`` is installed, and contents of at
+    least ``MIN_COMPRESSED_SIZE`` bytes are compressed with the preferred
+    encoding of the ``Accept-Encoding`` header, ``zstd`` when ``zstandard`` is
+    installed or ``gzip``.
+
+    Args:
+        request: The incoming request.
+        content: Body of the response.
+        media_type: Media type of ``content``.
+        headers: Extra headers of the response.
+        cache_key: Key identifying ``content``, its encoded bodies are then
+            kept so that they are only encoded once.
+
+    Returns: Response
+    """
+    headers = {**(headers or {}), "Vary": VARY}
+    response_type, encoding = _representation(request, content, media_type)
+    key = f"{cache_key}|{response_type}|{encoding}"
+    body = _encoded.get(key) if cache_key is not None else None
+    if body is None:
+        body = content.encode() if isinstance(content, str) else content
+        if response_type != media_type:
+            body = dumps_msgpack(loads_json(body))
+        if encoding is not None:
+            body = compress(body, encoding)
+        if cache_key is not None:
+            _encoded.put(key, body)
+    if encoding is not None:
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type=response_type, headers=headers)
+
+
+def negotiate_media_type(request: Request, media_type: str | None) -> str | None:
+    """Media type a JSON ``media_type`` content should be sent as, given the
+    ``Accept`` header of ``request``."""
+    if media_type != JSON:
+        return media_type
+    accepted = _quality_values(request.headers.get("accept"))
+    default = accepted.get("*/*", 0.0)
+    for candidate in available_media_types():
+        if candidate == JSON:
+            break
+        quality = accepted.get(candidate, 0.0)
+        if quality > 0 and quality >= accepted.get(JSON, default):
+            return candidate
+    return media_type
+
+
+def negotiate_encoding(request: Request) -> str | None:
+    """Preferred content encoding of the ``Accept-Encoding`` header of
+    ``request``, or ``None`` when the content must be sent as is."""
+    accepted = _quality_values(request.headers.get("accept-encoding"))
+    best, best_quality = None, 0.0
+    for encoding in available_encodings():
+        quality = accepted.get(encoding, accepted.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def catalog_response(
+    request: Request,
+    catalog: UniversalCatalog,
+    prefix: str | None = None,
+    glob: str | None = None,
+    namespace: str | None = None,
+    cursor: str | None = None,
+    limit: int | None = None,
+    cache_control: str = "no-cache",
+) -> Response:
+    """Build the response of the ``/catalog/`` endpoint.
+
+    Without filters nor ``limit`` the whole pre-serialized catalog is sent.
+    Otherwise only the selected entries are, see ``UniversalCatalog.select``,
+    and the cursor of the next page, if any, is sent in the ``X-Next-Cursor``
+    header. Clients accepting ``application/x-ndjson`` get the entries
+    streamed one per line instead of a single JSON object. Responses carry
+    the ``cache_control`` header, see ``cache_control_header``.
+    """
+    filters = catalog_filters(prefix, glob, namespace)
+    ndjson = NDJSON in request.headers.get("accept", "")
+    if not filters and limit is None and cursor is None and not ndjson:
+        return etag_response(
+            request,
+            catalog.version,
+            catalog.catalog_json(),
+            catalog_version=catalog.version,
+            media_type="application/json",
+            cache_control=cache_control,
+        )
+
+    names, next_cursor = catalog.select(cursor=cursor, limit=limit, **filters)
+    headers = {"X-Catalog-Version": catalog.version, "Cache-Control": cache_control}
+    if next_cursor is not None:
+        headers["X-Next-Cursor"] = next_cursor
+    if ndjson:
+        chunks = catalog.iter_ndjson(names)
+        encoding = negotiate_encoding(request)
+        if encoding is not None:
+            chunks = compress_stream(chunks, encoding)
+            headers["Content-Encoding"] = encoding
+        headers["Vary"] = VARY
+        return StreamingResponse(chunks, media_type=NDJSON, headers=headers)
+    query = {**filters, "cursor": cursor, "limit": limit}
+    response = etag_response(
+        request,
+        f"{catalog.version}-{content_hash(query)}",
+        catalog.subset_json(names),
+        catalog_version=catalog.version,
+        media_type="application/json",
+        cache_control=cache_control,
+    )
+    response.headers.update(headers)
+    return response
+
+
+def _representation(
+    request: Request, content: str | bytes, media_type: str | None
+) -> tuple[str | None, str | None]:
+    """Media type and content encoding ``content`` is sent with."""
+    encoding = None
+    if len(content) >= MIN_COMPRESSED_SIZE:
+        encoding = negotiate_encoding(request)
+    return negotiate_media_type(request, media_type), encoding
+
+
+def _quality_values(header: str | None) -> dict[str, float]:
+    """Parse an ``Accept`` like header into ``value -> quality``."""
+    values = {}
+    for item in (header or "").split(","):
+        value, _, params = item.partition(";")
+        value = value.strip().lower()
+        if not value:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            key, _, number = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    quality = float(number)
+                except ValueError:
+                    quality = 0.0
+        values[value] = quality
+    return values
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate in ("*", etag):
+            return True
+    return False
@@ -0,0 +1,307 @@
+from __future__ import annotations
+
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import tempfile
+
+from array import array
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Iterator
+
+from .encoding import dumps_json, loads_json
+
+if TYPE_CHECKING:
+    from .universal_catalog import UniversalCatalog
+
+# Bumped whenever the layout below changes, older snapshots are then refused
+SNAPSHOT_FORMAT = 3
+
+_MAGIC = b"UCSNAP"
+# Magic, format and length of the JSON header that follows
+_PREAMBLE = struct.Struct("<6sHQ")
+# Positions in the indexes are unsigned 32 bit integers, in the byte order of
+# the host that wrote the snapshot, so they are mapped without conversion
+_POSITION = "I"
+# Trigrams are three characters, encoded as fixed width records
+_GRAM_ENCODING = "utf-32-le"
+_GRAM_SIZE = 12
+
+
+def source_hash(data: bytes) -> str:
+    """Return the hash of the contents of a catalog file, recorded in the
+    snapshots compiled from it to tell whether they are stale."""
+    return hashlib.sha256(data).hexdigest()[:32]
+
+
+def write_snapshot(catalog: UniversalCatalog, path: str | Path) -> Path:
+    """Write ``catalog`` to a snapshot file that ``CatalogSnapshot`` maps back.
+
+    The file holds a short preamble, a JSON header indexing the entries along
+    with the dataset factory patterns and the hash of the catalog file they
+    were loaded from, then the catalog serialized as JSON, each entry being a
+    slice of it, and its YAML form. The indexes of the catalog follow: the
+    positions of the explicit entries in sorted order, and the trigrams of
+    every name with the positions of the names holding them, which workers
+    map instead of building them again. It is written to a temporary file
+    first and moved in place, so that processes never see a partial snapshot
+    and those still mapping the previous one keep reading it.
+
+    Returns: Path
+        The path of the snapshot.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    body = bytearray(b"{")
+    entries = []
+    for position, (name, entry) in enumerate(catalog._entry_json.items()):
+        if position:
+            body += b","
+        body += dumps_json(name) + b":"
+        entries.append([name, len(body), len(entry), catalog._entry_versions[name]])
+        body += entry
+    body += b"}"
+    config_string = catalog.config_string().encode()
+    sections = [body, config_string, *_index_sections(catalog)]
+    offsets = []
+    offset = 0
+    for section in sections:
+        # Aligned, so that positions are read straight from the mapping
+        padding = -offset % 4
+        offsets.append([offset + padding, len(section)])
+        offset += padding + len(section)
+    header = dumps_json(
+        {
+            "version": catalog.version,
+            "source": catalog.source_hash,
+            "byteorder": sys.byteorder,
+            "entries": entries,
+            "dataset_patterns": catalog._dataset_patterns,
+            "default_pattern": catalog._default_pattern,
+            "pattern_names": list(catalog._pattern_names),
+            "pattern_buckets": catalog._pattern_index.buckets,
+            "catalog": offsets[0],
+            "config_string": offsets[1],
+            "sorted_names": offsets[2],
+            "grams": offsets[3],
+            "posting_bounds": offsets[4],
+            "postings": offsets[5],
+        }
+    )
+    # The sections start on a multiple of 4 bytes from the start of the file
+    header += b" " * (-(_PREAMBLE.size + len(header)) % 4)
+    descriptor, temporary = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}")
+    try:
+        with os.fdopen(descriptor, "wb") as file:
+            file.write(_PREAMBLE.pack(_MAGIC, SNAPSHOT_FORMAT, len(header)))
+            file.write(header)
+            for section, (offset, _) in zip(sections, offsets):
+                file.write(
+                    b"\0" * (offset - file.tell() + _PREAMBLE.size + len(header))
+                )
+                file.write(section)
+        # ``mkstemp`` only lets the owner read the file, servers running as
+        # another user must be able to map it
+        os.chmod(temporary, 0o666 & ~_umask())
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+    return path
+
+
+def _umask() -> int:
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+def _index_sections(catalog: UniversalCatalog) -> list[bytes]:
+    positions = {name: position for position, name in enumerate(catalog._entry_json)}
+    sorted_names = array(_POSITION, (positions[name] for name in catalog._sorted_names))
+    postings = catalog._suggestions.postings
+    grams = sorted(postings, key=lambda gram: gram.encode(_GRAM_ENCODING))
+    bounds = array(_POSITION, [0])
+    flat = array(_POSITION)
+    for gram in grams:
+        flat.extend(postings[gram])
+        bounds.append(len(flat))
+    encoded = b"".join(gram.encode(_GRAM_ENCODING) for gram in grams)
+    return [sorted_names.tobytes(), encoded, bounds.tobytes(), flat.tobytes()]
+
+
+class CatalogSnapshot:
+    """``CatalogSnapshot`` maps a snapshot written by ``write_snapshot`` in
+    memory, read only.
+
+    Only the header is parsed when the snapshot is opened. Entries are read
+    from the mapping when they are requested, and the indexes are used from
+    it as they are, so that every process mapping the same file shares its
+    pages through the OS page cache instead of each holding its own copy of
+    the catalog and building its own indexes.
+
+    Args:
+        path: Path of the snapshot.
+
+    Raises:
+        ValueError: When the file is not a snapshot, or was written in another
+            format.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        with open(self.path, "rb") as file:
+            self._buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._buffer) < _PREAMBLE.size:
+            raise ValueError(f"'{self.path}' is not a catalog snapshot")
+        magic, snapshot_format, header_length = _PREAMBLE.unpack_from(self._buffer)
+        if magic != _MAGIC:
+            raise ValueError(f"'{self.path}' is not a catalog snapshot")
+        if snapshot_format != SNAPSHOT_FORMAT:
+            raise ValueError(
+                f"'{self.path}' was written in snapshot format {snapshot_format}, "
+                f"expected {SNAPSHOT_FORMAT}"
+            )
+        start = _PREAMBLE.size + header_length
+        header = loads_json(self._buffer[_PREAMBLE.size : start])
+        if header["byteorder"] != sys.byteorder:
+            raise ValueError(
+                f"'{self.path}' was written on a {header['byteorder']} endian host"
+            )
+        self._start = start
+        self.version: str = header["version"]
+        self.source_hash: str | None = header["source"]
+        self.dataset_patterns: dict[str, dict[str, Any]] = header["dataset_patterns"]
+        self.default_pattern: dict[str, dict[str, Any]] = header["default_pattern"]
+        self.pattern_names: list[str] = header["pattern_names"]
+        self.pattern_buckets: dict[str, list[int]] = header["pattern_buckets"]
+        offsets = {}
+        self.entry_versions: dict[str, str] = {}
+        for name, offset, length, version in header["entries"]:
+            offsets[name] = (start + offset, length)
+            self.entry_versions[name] = version
+        self.entry_json: Mapping[str, bytes] = _MappedEntries(self._buffer, offsets)
+        self.configs: Mapping[str, dict[str, Any]] = _MappedEntries(
+            self._buffer, offsets, loads_json
+        )
+        offset, length = header["catalog"]
+        self._catalog = (start + offset, length)
+        offset, length = header["config_string"]
+        self._config_string = (start + offset, length)
+        # Names of the entries, in the order of the catalog
+        self.names: list[str] = list(offsets)
+        self.sorted_names: Sequence[str] = _MappedNames(
+            self.names, self._positions(header["sorted_names"])
+        )
+        self.postings: Mapping[str, Sequence[int]] = _MappedPostings(
+            self._buffer,
+            self._section(header["grams"]),
+            self._positions(header["posting_bounds"]),
+            self._positions(header["postings"]),
+        )
+
+    def catalog_json(self) -> bytes:
+        offset, length = self._catalog
+        return self._buffer[offset : offset + length]
+
+    def config_string(self) -> str:
+        offset, length = self._config_string
+        return self._buffer[offset : offset + length].decode()
+
+    def _section(self, section: list[int]) -> tuple[int, int]:
+        offset, length = section
+        return self._start + offset, length
+
+    def _positions(self, section: list[int]) -> memoryview:
+        offset, length = self._section(section)
+        return memoryview(self._buffer)[offset : offset + length].cast(_POSITION)
+
+
+class _MappedEntries(Mapping):
+    """Read only mapping of entry names to their slice of a snapshot, passed
+    through ``decode``."""
+
+    def __init__(
+        self,
+        buffer: mmap.mmap,
+        offsets: dict[str, tuple[int, int]],
+        decode: Callable[[bytes], Any] | None = None,
+    ):
+        self._buffer = buffer
+        self._offsets = offsets
+        self._decode = decode
+
+    def __getitem__(self, name: str) -> Any:
+        offset, length = self._offsets[name]
+        data = self._buffer[offset : offset + length]
+        return data if self._decode is None else self._decode(data)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._offsets
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._offsets)
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+
+class _MappedNames(Sequence):
+    """Names of a snapshot in the order of their ``positions``, e.g. sorted."""
+
+    def __init__(self, names: list[str], positions: memoryview):
+        self._names = names
+        self._positions = positions
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return [self._names[position] for position in self._positions[index]]
+        return self._names[self._positions[index]]
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+
+class _MappedPostings(Mapping):
+    """Read only mapping of trigrams to the positions of the names holding
+    them, found by bisecting the sorted trigram records of a snapshot."""
+
+    def __init__(
+        self,
+        buffer: mmap.mmap,
+        grams: tuple[int, int],
+        bounds: memoryview,
+        postings: memoryview,
+    ):
+        self._buffer = buffer
+        self._grams_offset, length = grams
+        self._count = length // _GRAM_SIZE
+        self._bounds = bounds
+        self._postings = postings
+
+    def _gram(self, index: int) -> bytes:
+        offset = self._grams_offset + index * _GRAM_SIZE
+        return self._buffer[offset : offset + _GRAM_SIZE]
+
+    def __getitem__(self, gram: str) -> memoryview:
+        key = gram.encode(_GRAM_ENCODING)
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._gram(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low == self._count or self._gram(low) != key:
+            raise KeyError(gram)
+        return self._postings[self._bounds[low] : self._bounds[low + 1]]
+
+    def __iter__(self) -> Iterator[str]:
+        for index in range(self._count):
+            yield self._gram(index).decode(_GRAM_ENCODING)
+
+    def __len__(self) -> int:
+        return self._count
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import heapq
+
+from collections import Counter, defaultdict
+from collections.abc import Mapping, Sequence
+from difflib import SequenceMatcher
+from time import perf_counter
+from typing import Iterable
+
+DEFAULT_SUGGESTION_BUDGET = 0.005
+
+
+class SuggestionIndex:
+    """``SuggestionIndex`` finds names similar to a misspelled one, like
+    ``difflib.get_close_matches`` but without scoring every known name.
+
+    Names are indexed by their character trigrams once, at load time. A query
+    only scores, with the same ratio as ``difflib``, the names sharing the most
+    trigrams with it, and stops once its time budget is spent so suggestions
+    never dominate the latency of a request.
+
+    Args:
+        names: Names to suggest from.
+        max_candidates: Number of names sharing the most trigrams with a query
+            that are scored.
+        postings: Positions in ``names`` of the names holding each trigram, as
+            returned by ``postings``, when they were already computed, e.g. by
+            the process that wrote a catalog snapshot.
+    """
+
+    def __init__(
+        self,
+        names: Iterable[str],
+        max_candidates: int = 50,
+        postings: Mapping[str, Sequence[int]] | None = None,
+    ):
+        self._names = names if isinstance(names, Sequence) else list(names)
+        self._max_candidates = max_candidates
+        if postings is None:
+            postings = defaultdict(list)
+            for position, name in enumerate(self._names):
+                for gram in _trigrams(name):
+                    postings[gram].append(position)
+        self._postings = postings
+
+    @property
+    def postings(self) -> Mapping[str, Sequence[int]]:
+        return self._postings
+
+    def suggest(
+        self,
+        word: str,
+        n: int = 3,
+        cutoff: float = 0.6,
+        budget: float = DEFAULT_SUGGESTION_BUDGET,
+    ) -> list[str]:
+        """Return up to ``n`` names whose similarity ratio with ``word`` is at
+        least ``cutoff``, best matches first.
+
+        Args:
+            word: The misspelled name.
+            n: Maximum number of suggestions.
+            cutoff: Minimum ``difflib.SequenceMatcher`` ratio of a suggestion.
+            budget: Seconds after which the best suggestions found so far are
+                returned.
+        """
+        deadline = perf_counter() + budget
+        # Rare trigrams are the most selective, count them first. Trigrams
+        # shared by most names barely change the ranking and are skipped.
+        common = max(len(self._names) // 2, self._max_candidates)
+        postings = sorted(
+            (
+                self._postings[gram]
+                for gram in _trigrams(word)
+                if 0 < len(self._postings.get(gram, ())) <= common
+            ),
+            key=len,
+        )
+        counts: Counter[int] = Counter()
+        for posting in postings:
+            counts.update(posting)
+            if perf_counter() > deadline:
+                break
+
+        scorer = SequenceMatcher()
+        scorer.set_seq2(word)
+        scored = []
+        for position, _ in counts.most_common(self._max_candidates):
+            scorer.set_seq1(self._names[position])
+            if (
+                scorer.real_quick_ratio() >= cutoff
+                and scorer.quick_ratio() >= cutoff
+                and scorer.ratio() >= cutoff
+            ):
+                scored.append((scorer.ratio(), self._names[position]))
+            if perf_counter() > deadline:
+                break
+        return [name for _, name in heapq.nlargest(n, scored)]
+
+
+def _trigrams(name: str) -> set[str]:
+    padded = f"\0\0{name.lower()}\0"
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
@@ -8,25 +8,178 @@ from pathlib import Path
 from kedro.io.data_catalog import DataCatalog
 from kedro.io.core import DatasetNotFoundError
 
-import copy
-import difflib
+import io
+import logging
+import threading
+import time
+
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from typing import Iterator
+
+from .encoding import content_hash, dumps_json
+from .filters import (
+    catalog_filters,
+    entry_selected,
+    literal_prefix,
+    name_matches,
+    pattern_may_match,
+)
+from .metrics import LOOKUPS, RESOLUTION_CACHE, SUGGESTION_DURATION, metrics_enabled
+from .patterns import PatternIndex, resolve_config
+from .snapshot import CatalogSnapshot, source_hash
+from .suggestions import DEFAULT_SUGGESTION_BUDGET, SuggestionIndex
+from .validation import CatalogValidator, ValidationReport
+
+logger = logging.getLogger(__name__)
+
+_UNRESOLVED = object()
+
+DEFAULT_RESOLUTION_CACHE_SIZE = 4096
+
+_CHANGES_CACHE_SIZE = 64
+
+# Metrics updated on every lookup, bound once
+_EXPLICIT_LOOKUPS = LOOKUPS.labels("explicit")
+_PATTERN_LOOKUPS = LOOKUPS.labels("pattern")
+_NOT_FOUND_LOOKUPS = LOOKUPS.labels("not_found")
+_RESOLUTION_CACHE = {
+    "hit": RESOLUTION_CACHE.labels("hit"),
+    "miss": RESOLUTION_CACHE.labels("miss"),
+}
 
 
 def load_catalog(
-    config_path: dict[str, Path], environment: str = "base"
+    config_path: dict[str, Path],
+    environment: str = "base",
+    previous: UniversalCatalog | None = None,
+    validator: CatalogValidator | None = None,
+    use_snapshot: bool = True,
 ) -> UniversalCatalog:
-    catalog_path = config_path.get("path") / f"{environment}/catalog.yml"
-    catalog = OmegaConf.load(catalog_path)
+    """Load ``catalog.yml`` of ``environment``, from the snapshot compiled
+    next to it by ``kedro-catalog compile`` when it is up to date.
+
+    A snapshot compiled from other contents of ``catalog.yml``, or in another
+    format, is ignored and the catalog is parsed and validated again.
+    """
+    start = time.perf_counter()
+    data = catalog_file(config_path, environment).read_bytes()
+    source = source_hash(data)
+    if use_snapshot:
+        universal_catalog = _load_fresh_snapshot(
+            snapshot_file(config_path, environment), source
+        )
+        if universal_catalog is not None:
+            logger.info(universal_catalog.startup_summary())
+            return universal_catalog
+    catalog = OmegaConf.load(io.StringIO(data.decode()))
     catalog = OmegaConf.to_object(catalog)
-    return UniversalCatalog().from_config(catalog)
+    parsed = time.perf_counter()
+    universal_catalog = UniversalCatalog.from_config(
+        catalog, previous=previous, validator=validator
+    )
+    universal_catalog.source_hash = source
+    loaded = time.perf_counter()
+    validation = universal_catalog.validation_report.duration
+    universal_catalog.load_timings = {
+        "parse": parsed - start,
+        "validate": validation,
+        "index": loaded - parsed - validation,
+        "total": loaded - start,
+    }
+    logger.info(universal_catalog.startup_summary())
+    return universal_catalog
+
+
+def catalog_file(config_path: dict[str, Path], environment: str = "base") -> Path:
+    """Return the path of the ``catalog.yml`` read by ``load_catalog``."""
+    return config_path.get("path") / f"{environment}/catalog.yml"
+
+
+def snapshot_file(config_path: dict[str, Path], environment: str = "base") -> Path:
+    """Return the path of the snapshot ``load_catalog`` looks for, compiled
+    from ``catalog.yml`` by ``kedro-catalog compile``."""
+    return config_path.get("path") / f"{environment}/catalog.snapshot"
+
+
+def _load_fresh_snapshot(path: Path, source: str) -> UniversalCatalog | None:
+    if not path.is_file():
+        return None
+    try:
+        universal_catalog = UniversalCatalog.from_snapshot(path)
+    except (OSError, KeyError, ValueError) as exc:
+        # Unreadable, e.g. written by another user, or malformed
+        logger.warning("Ignoring the catalog snapshot: %s", exc)
+        return None
+    if universal_catalog.source_hash != source:
+        logger.info("The catalog snapshot '%s' is stale, ignoring it", path)
+        return None
+    return universal_catalog
 
 
 class UniversalCatalog(DataCatalog):
     def __init__(
-        self, catalog: dict[str, dict[str, Any]] | None = None, **kwargs
+        self,
+        catalog: dict[str, dict[str, Any]] | None = None,
+        resolution_cache_size: int = DEFAULT_RESOLUTION_CACHE_SIZE,
+        suggestion_budget: float = DEFAULT_SUGGESTION_BUDGET,
+        snapshot: CatalogSnapshot | None = None,
+        **kwargs,
     ) -> None:
         super().__init__(**kwargs)
+        self._snapshot = snapshot
+        if snapshot is not None:
+            catalog = snapshot.configs
         self._datasets = catalog
+        # Entries resolved from dataset factory patterns, ``None`` for misses
+        self._resolved = _LRUCache(resolution_cache_size)
+        self._suggestion_budget = suggestion_budget
+        self.validation_report: ValidationReport | None = None
+        self.load_timings: dict[str, float] = {}
+        # Hash of the catalog file this catalog was loaded from, if any
+        self.source_hash: str | None = None
+        if snapshot is not None:
+            self.source_hash = snapshot.source_hash
+            # Hashes and serialized entries were computed when the snapshot
+            # was written, entries are read from it when requested
+            self._version = snapshot.version
+            self._entry_versions = snapshot.entry_versions
+            self._entry_json = snapshot.entry_json
+            # So were the indexes, used from the mapping as they are
+            self._pattern_index = PatternIndex(
+                [*self._dataset_patterns, *self._default_pattern],
+                buckets=snapshot.pattern_buckets,
+            )
+            self._suggestions = SuggestionIndex(
+                snapshot.names, postings=snapshot.postings
+            )
+            self._sorted_names = snapshot.sorted_names
+            self._pattern_names = snapshot.pattern_names
+        else:
+            self._version = content_hash(catalog)
+            self._entry_versions = {
+                name: content_hash(config) for name, config in (catalog or {}).items()
+            }
+            # Responses are serialized once here instead of on every request
+            self._entry_json = {
+                name: dumps_json(config) for name, config in (catalog or {}).items()
+            }
+            self._catalog_json = _join_json(self._entry_json)
+            self._config_string = OmegaConf.to_yaml(OmegaConf.create(self._datasets))
+            self._pattern_index = PatternIndex(
+                [*self._dataset_patterns, *self._default_pattern]
+            )
+            self._suggestions = SuggestionIndex(catalog or {})
+            # Sorted names let filtered and paginated listings start with a
+            # bisect
+            self._sorted_names = sorted(
+                name for name in self._entry_json if not self._is_pattern(name)
+            )
+            self._pattern_names = [
+                name for name in self._entry_json if self._is_pattern(name)
+            ]
+        # Changes since a version are the same for every client asking
+        self._changes = _LRUCache(_CHANGES_CACHE_SIZE)
 
     @classmethod
     def from_config(
@@ -35,19 +188,233 @@ class UniversalCatalog(DataCatalog):
         credentials: dict[str, dict[str, Any]] | None = None,
         load_versions: dict[str, str] | None = None,
         save_version: str | None = None,
+        resolution_cache_size: int = DEFAULT_RESOLUTION_CACHE_SIZE,
+        suggestion_budget: float = DEFAULT_SUGGESTION_BUDGET,
+        previous: UniversalCatalog | None = None,
+        validator: CatalogValidator | None = None,
     ) -> UniversalCatalog:
-        # Verify config by using config to initialize ``DataCatalog``
-        super().from_config(
-            catalog=catalog,
+        """Create a ``UniversalCatalog`` after checking that every entry of
+        ``catalog`` can be used to instantiate its dataset.
+
+        When a ``previous`` catalog is given, only the entries that differ from
+        it are instantiated again, which makes reloading a large catalog after
+        a small change cheap. ``validator`` controls how the entries are
+        validated, see ``CatalogValidator``.
+        """
+        validator = validator or CatalogValidator()
+        report = validator.validate(
+            catalog or {},
             credentials=credentials,
             load_versions=load_versions,
             save_version=save_version,
+            known_hashes=previous._entry_versions.values() if previous else (),
+        )
+        # Patterns are not instantiated, this only sorts them and sets the
+        # catch-all pattern apart
+        data_catalog = DataCatalog.from_config(
+            catalog={
+                name: config
+                for name, config in (catalog or {}).items()
+                if cls._is_pattern(name)
+            },
+            credentials=credentials,
         )
-        return cls(catalog=catalog)
+        universal_catalog = cls(
+            catalog=catalog,
+            dataset_patterns=data_catalog._dataset_patterns,
+            default_pattern=data_catalog._default_pattern,
+            resolution_cache_size=resolution_cache_size,
+            suggestion_budget=suggestion_budget,
+        )
+        universal_catalog.validation_report = report
+        return universal_catalog
+
+    @classmethod
+    def from_snapshot(
+        cls,
+        path: str | Path,
+        resolution_cache_size: int = DEFAULT_RESOLUTION_CACHE_SIZE,
+        suggestion_budget: float = DEFAULT_SUGGESTION_BUDGET,
+    ) -> UniversalCatalog:
+        """Create a ``UniversalCatalog`` from a snapshot written by
+        ``write_snapshot``, without parsing nor validating the catalog again.
+
+        The snapshot is memory-mapped and entries are read from it when they
+        are requested, so that the processes of a multi-worker server share a
+        single copy of the catalog, see ``CatalogSnapshot``.
+        """
+        start = time.perf_counter()
+        snapshot = CatalogSnapshot(path)
+        mapped = time.perf_counter()
+        universal_catalog = cls(
+            snapshot=snapshot,
+            dataset_patterns=snapshot.dataset_patterns,
+            default_pattern=snapshot.default_pattern,
+            resolution_cache_size=resolution_cache_size,
+            suggestion_budget=suggestion_budget,
+        )
+        loaded = time.perf_counter()
+        universal_catalog.load_timings = {
+            "parse": mapped - start,
+            "validate": 0.0,
+            "index": loaded - mapped,
+            "total": loaded - start,
+        }
+        return universal_catalog
+
+    @property
+    def version(self) -> str:
+        """Content hash of the catalog, computed once when it is loaded."""
+        return self._version
+
+    def entry_version(self, dataset_name: str) -> str:
+        """
+        Content hash of a single entry, precomputed for explicit entries and
+        computed from the resolved config for dataset factory matches.
+        Args:
+            dataset_name: str
+                Name of the dataset to hash.
+
+        Returns: str
+            Hash of the entry associated with `dataset_name`.
+
+        """
+        version = self._entry_versions.get(dataset_name)
+        if version is None:
+            # Not counted as a lookup, the entry itself was looked up already
+            dataset_config = self._find_entry(dataset_name, record=False)
+            if dataset_config is None:
+                raise DatasetNotFoundError(
+                    f"Dataset '{dataset_name}' not found in the catalog"
+                )
+            version = content_hash(dataset_config)
+        return version
+
+    def startup_summary(self) -> str:
+        """Describe where the time went while loading the catalog."""
+        lines = [f"Loaded {len(self._datasets or {})} catalog entries"]
+        if self._snapshot is not None:
+            lines[0] += f" from snapshot '{self._snapshot.path}'"
+        if self.load_timings:
+            lines[0] += (
+                " in {total:.3f}s (parse {parse:.3f}s, validate {validate:.3f}s, "
+                "index {index:.3f}s)"
+            ).format(**self.load_timings)
+        if self.validation_report is not None:
+            lines.append(self.validation_report.summary())
+        return "\n".join(lines)
 
     def config_string(self):
-        config = OmegaConf.create(self._datasets)
-        return OmegaConf.to_yaml(config)
+        if self._snapshot is not None:
+            return self._snapshot.config_string()
+        return self._config_string
+
+    def catalog_json(self) -> bytes:
+        """Return the whole catalog serialized as JSON."""
+        if self._snapshot is not None:
+            return self._snapshot.catalog_json()
+        return self._catalog_json
+
+    def entry_json(self, dataset_name: str, suggest: bool = True) -> bytes:
+        """
+        Serialized counterpart of ``get_entry``.
+        Args:
+            dataset_name: str
+                Name of the dataset to search the catalog for.
+            suggest: bool
+                Whether to suggest similarly named objects if `dataset_name` is not
+                found
+
+        Returns: bytes
+            Entry associated with `dataset_name` serialized as JSON.
+
+        """
+        entry = self._entry_json.get(dataset_name)
+        if entry is None:
+            return dumps_json(self.get_entry(dataset_name, suggest))
+        if metrics_enabled():
+            _EXPLICIT_LOOKUPS.inc()
+        return entry
+
+    def entries_json(self, dataset_names: list[str]) -> bytes:
+        """Serialized counterpart of ``get_entries``."""
+        entries = {}
+        for dataset_name in dataset_names:
+            try:
+                entries[dataset_name] = self.entry_json(dataset_name, suggest=False)
+            except DatasetNotFoundError:
+                entries[dataset_name] = b"null"
+        return _join_json(entries)
+
+    def select(
+        self,
+        prefix: str | None = None,
+        glob: str | None = None,
+        namespace: str | None = None,
+        cursor: str | None = None,
+        limit: int | None = None,
+    ) -> tuple[list[str], str | None]:
+        """
+        Select the names of the entries passing the filters, in sorted order.
+        Dataset factory patterns that may resolve matching names are included
+        in the first page.
+        Args:
+            prefix: str
+                Names must start with `prefix`.
+            glob: str
+                Names must match this `fnmatch` style pattern.
+            namespace: str
+                Names must belong to this Kedro namespace.
+            cursor: str
+                Only names sorted after `cursor` are selected.
+            limit: int
+                Maximum number of names selected, patterns excluded.
+
+        Returns: tuple[list[str], str | None]
+            The selected names and the cursor of the next page, or `None` when
+            this is the last page.
+
+        """
+        if limit is not None and limit < 1:
+            raise ValueError("`limit` must be at least 1")
+        filters = {"prefix": prefix, "glob": glob, "namespace": namespace}
+        selected = []
+        if cursor is None:
+            selected = [
+                name
+                for name in self._pattern_names
+                if pattern_may_match(name, **filters)
+            ]
+        start = literal_prefix(**filters)
+        names = self._sorted_names
+        position = bisect_left(names, start)
+        if cursor is not None:
+            position = max(position, bisect_right(names, cursor))
+        count = 0
+        for index in range(position, len(names)):
+            name = names[index]
+            if not name.startswith(start):
+                break
+            if not name_matches(name, **filters):
+                continue
+            if limit is not None and count == limit:
+                return selected, selected[-1]
+            selected.append(name)
+            count += 1
+        return selected, None
+
+    def subset_json(self, dataset_names: list[str]) -> bytes:
+        """Return the entries of ``dataset_names`` serialized as one JSON object."""
+        return _join_json({name: self._entry_json[name] for name in dataset_names})
+
+    def iter_ndjson(self, dataset_names: list[str]) -> Iterator[bytes]:
+        """Yield the entries of ``dataset_names`` as newline delimited JSON,
+        one ``{"name": ..., "config": ...}`` object per line."""
+        for name in dataset_names:
+            yield b'{"name":%b,"config":%b}\n' % (
+                dumps_json(name),
+                self._entry_json[name],
+            )
 
     def get_entry(self, dataset_name: str, suggest: bool = True) -> Dict[str, Any]:
         """
@@ -66,47 +433,197 @@ class UniversalCatalog(DataCatalog):
 
 
         """
-        matched_pattern = self._match_pattern(
-            self._dataset_patterns, dataset_name
-        ) or self._match_pattern(self._default_pattern, dataset_name)
-        if dataset_name not in self._datasets and matched_pattern:  # pragma: no cover
-            # If the dataset is a patterned dataset, materialise it and add it to
-            # the catalog
-            config_copy = copy.deepcopy(
-                self._dataset_patterns.get(matched_pattern)
-                or self._default_pattern.get(matched_pattern)
-                or {}
-            )
-            dataset_config = self._resolve_config(
-                dataset_name, matched_pattern, config_copy
-            )
-            if (
-                self._specificity(matched_pattern) == 0
-                and matched_pattern in self._default_pattern
-            ):
-                self._logger.warning(
-                    "Config from the dataset factory pattern '%s' in the catalog will be used to "
-                    "override the default dataset creation for '%s'",
-                    matched_pattern,
-                    dataset_name,
-                )
+        dataset_config = self._find_entry(dataset_name)
+        if dataset_config is not None:
             return dataset_config
-        if dataset_name not in self._datasets:
-            error_msg = f"Dataset '{dataset_name}' not found in the catalog"
 
-            # Flag to turn on/off fuzzy-matching which can be time consuming and
-            # slow down plugins like `kedro-viz`
-            if suggest:
-                matches = difflib.get_close_matches(dataset_name, self._datasets.keys())
-                if matches:
-                    suggestions = ", ".join(matches)
-                    error_msg += f" - did you mean one of these instead: {suggestions}"
-            raise DatasetNotFoundError(error_msg)
+        record = metrics_enabled()
+        if record:
+            _NOT_FOUND_LOOKUPS.inc()
+        error_msg = f"Dataset '{dataset_name}' not found in the catalog"
+
+        # Flag to turn on/off fuzzy-matching which can be time consuming and
+        # slow down plugins like `kedro-viz`
+        if suggest:
+            start = time.perf_counter()
+            matches = self._suggestions.suggest(
+                dataset_name, budget=self._suggestion_budget
+            )
+            if record:
+                SUGGESTION_DURATION.observe(time.perf_counter() - start)
+            if matches:
+                suggestions = ", ".join(matches)
+                error_msg += f" - did you mean one of these instead: {suggestions}"
+        raise DatasetNotFoundError(error_msg)
+
+    def _find_entry(
+        self, dataset_name: str, record: bool = True
+    ) -> Dict[str, Any] | None:
+        """Return the explicit or resolved entry of ``dataset_name``, or
+        ``None`` when it is not found. Found entries are counted in the lookup
+        metrics when ``record`` is set and metrics are enabled."""
+        record = record and metrics_enabled()
+        if dataset_name in self._datasets:
+            if record:
+                _EXPLICIT_LOOKUPS.inc()
+            return self._datasets[dataset_name]
 
-        dataset_config = self._datasets.get(dataset_name, None)
+        dataset_config = self._resolved.get(dataset_name, _UNRESOLVED)
+        cache = "hit"
+        if dataset_config is _UNRESOLVED:
+            # Misses are cached too, so that repeated lookups of unknown names
+            # don't go through the patterns again
+            dataset_config = self._resolve_pattern(dataset_name)
+            self._resolved.put(dataset_name, dataset_config)
+            cache = "miss"
+        if record:
+            _RESOLUTION_CACHE[cache].inc()
+            if dataset_config is not None:
+                _PATTERN_LOOKUPS.inc()
+        return dataset_config
 
+    def _resolve_pattern(self, dataset_name: str) -> Dict[str, Any] | None:
+        """Resolve the config of ``dataset_name`` from the first dataset factory
+        pattern it matches, or return ``None`` when it matches none."""
+        match = self._pattern_index.match(dataset_name)
+        if match is None:
+            return None
+        matched_pattern, result = match
+        # If the dataset is a patterned dataset, materialise it
+        pattern_config = (
+            self._dataset_patterns.get(matched_pattern)
+            or self._default_pattern.get(matched_pattern)
+            or {}
+        )
+        dataset_config = resolve_config(pattern_config, matched_pattern, result)
+        if (
+            self._specificity(matched_pattern) == 0
+            and matched_pattern in self._default_pattern
+        ):
+            self._logger.warning(
+                "Config from the dataset factory pattern '%s' in the catalog will be used to "
+                "override the default dataset creation for '%s'",
+                matched_pattern,
+                dataset_name,
+            )
         return dataset_config
 
+    def changes_json(
+        self,
+        since: str,
+        since_versions: dict[str, str] | None,
+        prefix: str | None = None,
+        glob: str | None = None,
+        namespace: str | None = None,
+    ) -> bytes:
+        """
+        Serialize the changes made to the catalog since version `since`, as
+        ``{"version", "since", "full", "changed", "removed"}``.
+        Args:
+            since: str
+                Version the changes are computed from.
+            since_versions: dict[str, str] | None
+                Content hash of each entry at version `since`. When it is
+                `None`, because that version is unknown, every entry is sent as
+                changed and `full` is `true`.
+            prefix: str
+                Only send entries whose name starts with `prefix`.
+            glob: str
+                Only send entries whose name matches this `fnmatch` pattern.
+            namespace: str
+                Only send entries belonging to this Kedro namespace.
+
+        Returns: bytes
+            The changed entries and the names of the removed ones, serialized
+            as JSON.
+
+        """
+        filters = catalog_filters(prefix, glob, namespace)
+        key = dumps_json([since, since_versions is None, filters])
+        changes = self._changes.get(key)
+        if changes is not None:
+            return changes
+
+        current = self._entry_versions
+        if since_versions is None:
+            changed = [name for name in current if entry_selected(name, **filters)]
+            removed = []
+        else:
+            changed = [
+                name
+                for name, version in current.items()
+                if since_versions.get(name) != version
+                and entry_selected(name, **filters)
+            ]
+            removed = [
+                name
+                for name in since_versions
+                if name not in current and entry_selected(name, **filters)
+            ]
+        changes = b'{"version":%b,"since":%b,"full":%b,"changed":%b,"removed":%b}' % (
+            dumps_json(self.version),
+            dumps_json(since),
+            dumps_json(since_versions is None),
+            self.subset_json(changed),
+            dumps_json(removed),
+        )
+        self._changes.put(key, changes)
+        return changes
+
+    def get_entries(self, dataset_names: list[str]) -> dict[str, dict[str, Any] | None]:
+        """
+        Resolve several entries at once with ``get_entry``.
+        Args:
+            dataset_names: list[str]
+                Names of the datasets to search the catalog for.
+
+        Returns: dict[str, dict[str, Any] | None]
+            Mapping of each name to its entry, or to `None` when the name is
+            not found in the catalog.
+
+        """
+        entries = {}
+        for dataset_name in dataset_names:
+            try:
+                entries[dataset_name] = self.get_entry(dataset_name, suggest=False)
+            except DatasetNotFoundError:
+                entries[dataset_name] = None
+        return entries
+
     def get_catalog(self) -> dict[str, dict[str, Any]]:
         """Return dictionary of catalog entries."""
         return self._datasets
+
+
+class _LRUCache:
+    """Thread-safe mapping holding at most ``maxsize`` of the most recently
+    used items."""
+
+    def __init__(self, maxsize: int):
+        self._maxsize = maxsize
+        self._data: OrderedDict[str, Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            if key not in self._data:
+                return default
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def put(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self._maxsize:
+                self._data.popitem(last=False)
+
+
+def _join_json(entries: dict[str, bytes]) -> bytes:
+    """Assemble a JSON object from already serialized values."""
+    return b"{%b}" % b",".join(
+        dumps_json(name) + b":" + value for name, value in entries.items()
+    )
@@ -1,41 +1,200 @@
-from fastapi import FastAPI, Response
+import logging
+import os
+
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from fastapi import FastAPI, Query, Request
+from fastapi.responses import JSONResponse, Response
+from kedro.io.core import DatasetNotFoundError
 
 import uvicorn
 
 from universal_catalog.core import (
-    UniversalCatalog,
-    load_catalog,
+    PROMETHEUS,
+    SNAPSHOT_ENV,
+    CatalogReloader,
+    CatalogValidator,
+    SnapshotReloader,
+    MetricsMiddleware,
     Datasets,
+    DatasetNames,
     load_server_settings,
+    catalog_response,
+    encoded_response,
+    etag_response,
+    cache_control_header,
+    render_metrics,
+    configure_metrics,
+    remove_stale_socket,
 )
 
 from settings import CONFIG_LOCATION
 
-app = FastAPI()
+SERVER_SETTINGS = load_server_settings(CONFIG_LOCATION)
+RELOAD_SETTINGS = SERVER_SETTINGS.pop("catalog_reload", {})
+VALIDATION_SETTINGS = SERVER_SETTINGS.pop("catalog_validation", {})
+SNAPSHOT_SETTINGS = SERVER_SETTINGS.pop("catalog_snapshot", {})
+METRICS_SETTINGS = SERVER_SETTINGS.pop("metrics", {})
+HTTP_CACHE_SETTINGS = SERVER_SETTINGS.pop("http_cache", {})
+MAX_AGE = HTTP_CACHE_SETTINGS.get("max_age", 5)
+WORKERS = SERVER_SETTINGS.get("workers") or 1
+
+if os.environ.get(SNAPSHOT_ENV):
+    # Worker of a multi-worker server, serving the snapshot of the catalog
+    # validated by the primary process
+    RELOADER = SnapshotReloader(
+        os.environ[SNAPSHOT_ENV],
+        interval=RELOAD_SETTINGS.get("interval", 2),
+        history_size=RELOAD_SETTINGS.get("history", 32),
+    )
+else:
+    RELOADER = CatalogReloader(
+        CONFIG_LOCATION,
+        interval=RELOAD_SETTINGS.get("interval", 2),
+        history_size=RELOAD_SETTINGS.get("history", 32),
+        validator=CatalogValidator(**VALIDATION_SETTINGS),
+        snapshot_path=(
+            SNAPSHOT_SETTINGS.get("path", ".catalog_cache/catalog.snapshot")
+            if WORKERS > 1
+            else None
+        ),
+    )
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    logging.getLogger("uvicorn.error").info(RELOADER.catalog.startup_summary())
+    if RELOAD_SETTINGS.get("enabled", False):
+        RELOADER.start()
+    yield
+    RELOADER.stop()
+
+
+app = FastAPI(lifespan=lifespan)
+
+
+async def get_metrics():
+    # Each worker keeps its own metrics, tell their series apart
+    labels = {"worker": str(os.getpid())} if os.environ.get(SNAPSHOT_ENV) else None
+    return Response(render_metrics(labels), media_type=PROMETHEUS)
+
 
+configure_metrics(METRICS_SETTINGS.get("enabled", True))
+if METRICS_SETTINGS.get("enabled", True):
+    app.add_middleware(MetricsMiddleware)
+    app.add_api_route("/metrics", get_metrics, include_in_schema=False)
 
-CATALOG: UniversalCatalog = load_catalog(CONFIG_LOCATION)
+
+@app.exception_handler(DatasetNotFoundError)
+async def dataset_not_found(request: Request, exc: DatasetNotFoundError):
+    # The name may be added by the next reload, don't let caches keep the miss
+    return JSONResponse(
+        status_code=404,
+        content={"detail": str(exc)},
+        headers={"Cache-Control": "no-cache"},
+    )
 
 
 @app.get("/")
-async def root():
-    catalog_yml = CATALOG.config_string()
-    return Response(content=catalog_yml)
+async def root(request: Request):
+    catalog = RELOADER.catalog
+    return etag_response(
+        request,
+        catalog.version,
+        catalog.config_string(),
+        catalog_version=catalog.version,
+    )
+
+
+@app.get("/version/")
+async def get_version():
+    return {"version": RELOADER.catalog.version}
 
 
 @app.post("/dataset/")
-async def get_record(dataset_name: Datasets):
-    dataset = CATALOG.get_entry(dataset_name.name)
-    return dataset
+async def get_record(dataset_name: Datasets, request: Request):
+    catalog = RELOADER.catalog
+    dataset = catalog.entry_json(dataset_name.name)
+    return etag_response(
+        request,
+        catalog.entry_version(dataset_name.name),
+        dataset,
+        catalog_version=catalog.version,
+        media_type="application/json",
+    )
+
+
+@app.get("/dataset/{dataset_name:path}")
+async def get_dataset(
+    dataset_name: str, request: Request, version: Optional[str] = None
+):
+    # Cacheable counterpart of ``POST /dataset/``, URLs pinned to the catalog
+    # version they were served from never change
+    catalog = RELOADER.catalog
+    dataset = catalog.entry_json(dataset_name)
+    return etag_response(
+        request,
+        catalog.entry_version(dataset_name),
+        dataset,
+        catalog_version=catalog.version,
+        media_type="application/json",
+        cache_control=cache_control_header(catalog.version, version, MAX_AGE),
+    )
+
+
+@app.post("/datasets/")
+async def get_records(dataset_names: DatasetNames, request: Request):
+    datasets = RELOADER.catalog.entries_json(dataset_names.names)
+    return encoded_response(request, datasets)
+
+
+@app.api_route("/catalog/", methods=["GET", "POST"])
+async def get_catalog(
+    request: Request,
+    prefix: Optional[str] = None,
+    glob: Optional[str] = None,
+    namespace: Optional[str] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(default=None, ge=1),
+    version: Optional[str] = None,
+):
+    catalog = RELOADER.catalog
+    return catalog_response(
+        request,
+        catalog,
+        prefix=prefix,
+        glob=glob,
+        namespace=namespace,
+        cursor=cursor,
+        limit=limit,
+        cache_control=cache_control_header(catalog.version, version, MAX_AGE),
+    )
 
 
-@app.post("/catalog/")
-async def get_catalog():
-    catalog = CATALOG.get_catalog()
-    return catalog
+@app.get("/catalog/changes/")
+async def get_catalog_changes(
+    request: Request,
+    since: str,
+    prefix: Optional[str] = None,
+    glob: Optional[str] = None,
+    namespace: Optional[str] = None,
+):
+    changes = RELOADER.changes_json(
+        since, prefix=prefix, glob=glob, namespace=namespace
+    )
+    return encoded_response(request, changes)
 
 
 if __name__ == "__main__":
-    load_catalog(CONFIG_LOCATION)
-    server_settings = load_server_settings(CONFIG_LOCATION)
-    uvicorn.run(app, **server_settings)
+    if SERVER_SETTINGS.get("uds"):
+        remove_stale_socket(SERVER_SETTINGS["uds"])
+    if WORKERS > 1:
+        # Workers import this module again and map the snapshot written above,
+        # the catalog file is watched from this process
+        os.environ[SNAPSHOT_ENV] = str(RELOADER.snapshot_path.resolve())
+        if RELOAD_SETTINGS.get("enabled", False):
+            RELOADER.start()
+        uvicorn.run("main:app", **SERVER_SETTINGS)
+    else:
+        uvicorn.run(app, **SERVER_SETTINGS)